@@ -0,0 +1,139 @@
+# benchmark_trackers.py
+"""
+İzleyici arka uçlarını kayıtlı algılama akışları üzerinde karşılaştırır.
+
+Akış kaynağı sonuç önbelleğidir (RESULT_CACHE_DIR): her girdide dedektörün
+çalıştığı karelerin algılamaları saklanır. Anahtar karelerde update_tracks(),
+ara karelerde coast() çağrılır – canlı hattaki sırayla, çıkarım olmadan.
+Önbellek yoksa --synthetic ile hareketli kutulardan yapay akış üretilir.
+
+    python benchmark_trackers.py                          # tüm önbellek girdileri
+    python benchmark_trackers.py ../result_cache/<key>
+    python benchmark_trackers.py --synthetic 2000 --frames 300 --backends motion
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import numpy as np
+
+from object_detection.detections import FrameDetections
+from object_tracking.object_tracker import ObjectTracker
+from process_operations.result_cache import CachedResults
+from project_utils.config import RESULT_CACHE_DIR
+
+BACKENDS = ("deepsort", "motion")
+
+
+def cached_stream(directory):
+    """Önbellek girdisi → (ad, [FrameDetections | None] kare başına)."""
+    cached = CachedResults(directory)
+    names = cached.meta.get("class_names") or ["object"]
+    frames = []
+    for f in range(cached.total_frames):
+        if not cached.det_keyframes[f]:
+            frames.append(None)
+            continue
+        a, b = int(cached.det_offsets[f]), int(cached.det_offsets[f + 1])
+        frames.append(FrameDetections(
+            np.array(cached.det_boxes[a:b], dtype=np.float32),
+            np.array(cached.det_conf[a:b], dtype=np.float32),
+            np.array(cached.det_class_ids[a:b], dtype=np.int32),
+            np.zeros(b - a, dtype=np.int8), names,
+        ))
+    return os.path.basename(directory.rstrip(os.sep)), frames
+
+
+def synthetic_stream(objects, frames, seed=0, size=(1920, 1080), miss_rate=0.05):
+    """Sabit hızlı, gürültülü, ara sıra kaybolan ve düşük güvenle görünen kutular."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    wh = rng.uniform(12, 60, (objects, 2))
+    pos = rng.uniform(0, 1, (objects, 2)) * (np.array([w, h]) - wh)
+    vel = rng.normal(0, 2, (objects, 2))
+    base_conf = rng.uniform(0.2, 0.95, objects)         # nesne başına tipik güven
+
+    stream = []
+    for _ in range(frames):
+        pos += vel
+        bounce = (pos < 0) | (pos + wh > [w, h])
+        vel[bounce] *= -1
+        pos = np.clip(pos, 0, [w, h] - wh)
+
+        keep = rng.random(objects) > miss_rate
+        xy = pos[keep] + rng.normal(0, 1, (keep.sum(), 2))
+        boxes = np.concatenate([xy, xy + wh[keep]], axis=1).astype(np.float32)
+        conf = np.clip(base_conf[keep] + rng.normal(0, 0.1, len(boxes)), 0.1, 1.0)
+        conf = conf.astype(np.float32)
+        stream.append(FrameDetections(boxes, conf, np.zeros(len(boxes), np.int32),
+                                      np.zeros(len(boxes), np.int8), ["object"]))
+    return f"synthetic-{objects}x{frames}", stream
+
+
+def run(backend, stream, frame_size):
+    tracker = ObjectTracker(backend=backend)
+    blank = np.zeros((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+
+    outputs = 0
+    app_ids = set()
+    start = time.perf_counter()
+    for detections in stream:
+        if detections is None:
+            objects = tracker.coast()
+        else:
+            objects = tracker.update_tracks(detections, blank)
+        outputs += len(objects)
+        app_ids.update(objects.track_id.tolist())
+    seconds = time.perf_counter() - start
+
+    return {
+        "seconds": seconds,
+        "fps": len(stream) / seconds if seconds > 0 else 0.0,
+        "tracks_per_s": outputs / seconds if seconds > 0 else 0.0,
+        "objects_per_frame": outputs / max(1, len(stream)),
+        "app_ids": len(app_ids),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Compare tracker backends on recorded detection streams."
+    )
+    parser.add_argument("entries", nargs="*",
+                        help=f"result cache entries (default: all under {RESULT_CACHE_DIR})")
+    parser.add_argument("-b", "--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="also run a synthetic stream with N moving objects")
+    parser.add_argument("--frames", type=int, default=300, help="synthetic stream length")
+    parser.add_argument("--frame-size", type=int, nargs=2, default=(1920, 1080),
+                        metavar=("W", "H"), help="frame size passed to the trackers")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    entries = args.entries or sorted(
+        d for d in glob.glob(os.path.join(RESULT_CACHE_DIR, "*"))
+        if os.path.isfile(os.path.join(d, "det_keyframes.npy"))
+    )
+    streams = [cached_stream(d) for d in entries]
+    if args.synthetic:
+        streams.append(synthetic_stream(args.synthetic, args.frames, size=tuple(args.frame_size)))
+    if not streams:
+        print("No recorded detection streams found; use --synthetic N.", file=sys.stderr)
+        return 2
+
+    print(f"{'stream':<36} {'backend':<9} {'frames':>7} {'fps':>9} "
+          f"{'tracks/s':>10} {'obj/frame':>9} {'ids':>6}")
+    for name, stream in streams:
+        for backend in args.backends:
+            r = run(backend, stream, args.frame_size)
+            print(f"{name[:36]:<36} {backend:<9} {len(stream):>7} {r['fps']:>9.1f} "
+                  f"{r['tracks_per_s']:>10.0f} {r['objects_per_frame']:>9.1f} {r['app_ids']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# custom_models/backend.py
+import os
+import threading
+from contextlib import nullcontext
+import torch
+from project_utils.config import DEVICE, CPU_THREADS
+
+
+class ExecutionBackend:
+    """
+    Cihaza göre yürütme ayarlarını tek yerde toplar.
+
+    • CUDA : fp16, contiguous (NCHW) bellek, gerçek CUDA stream'leri
+    • CPU  : fp32, channels_last (NHWC) bellek, stream yok,
+             intra‑op iş parçacığı sayısı süreç başında bir kez ayarlanır
+             (configure_cpu_threads)
+    """
+    def __init__(self, device: str = DEVICE, cpu_threads: int = CPU_THREADS):
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        if device == "cuda" and not torch.cuda.is_available():
+            print("CUDA requested but not available – falling back to CPU.")
+            device = "cpu"
+
+        self.device = device
+        self.is_cuda = device == "cuda"
+
+        if self.is_cuda:
+            self.dtype = torch.half
+            self.memory_format = torch.contiguous_format
+            self.cpu_threads = 0
+            torch.backends.cudnn.benchmark = True
+        else:
+            self.dtype = torch.float32
+            self.memory_format = torch.channels_last
+            self.cpu_threads = cpu_threads or (os.cpu_count() or 1)
+        self.cpu_threads_configured = False
+
+    # ------------------------------------------------------------------ #
+    # Model / tensör hazırlığı
+    # ------------------------------------------------------------------ #
+    def prepare_module(self, module):
+        module = module.to(self.device)
+        if self.is_cuda:
+            return module.half()
+        return module.float().to(memory_format=self.memory_format)
+
+    def empty_input(self, batch: int, height: int, width: int):
+        return torch.empty(
+            (batch, 3, height, width),
+            device=self.device,
+            dtype=self.dtype,
+            memory_format=self.memory_format,
+        )
+
+    @property
+    def predict_kwargs(self):
+        """ultralytics predict() çağrılarına geçirilecek cihaz/precision ayarları."""
+        return {"device": self.device, "half": self.is_cuda}
+
+    # ------------------------------------------------------------------ #
+    # Stream yönetimi (CPU'da hepsi no‑op)
+    # ------------------------------------------------------------------ #
+    def new_stream(self):
+        return torch.cuda.Stream() if self.is_cuda else None
+
+    @staticmethod
+    def stream(stream):
+        return torch.cuda.stream(stream) if stream is not None else nullcontext()
+
+    def wait_stream(self, stream):
+        if stream is not None:
+            torch.cuda.current_stream().wait_stream(stream)
+
+    def synchronize(self):
+        if self.is_cuda:
+            torch.cuda.synchronize()
+
+    def configure_cpu_threads(self, concurrent_models: int = 1):
+        """
+        Süreç başında, modeller yüklenirken BİR KEZ çağrılır. torch.set_num_threads
+        süreç geneli bir ayardır (iş parçacığına özgü değil): aynı anda
+        `concurrent_models` model çalışacaksa süreç bütçesi (cpu_threads)
+        aralarında paylaştırılır → aşırı abonelik olmaz. Sonraki çağrılar
+        yok sayılır; çalışan çıkarımın altında ayar değişmez.
+        """
+        if self.is_cuda or self.cpu_threads_configured:
+            return
+        self.cpu_threads_configured = True
+        torch.set_num_threads(max(1, self.cpu_threads // max(1, concurrent_models)))
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend(cpu_threads: int = None) -> ExecutionBackend:
+    """
+    Süreç genelinde tek ExecutionBackend örneği (model yükleyici iş parçacığı dahil).
+    cpu_threads: sürecin CPU bütçesi – yalnızca örneği kuran ilk çağrıda geçerli.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = (ExecutionBackend() if cpu_threads is None
+                        else ExecutionBackend(cpu_threads=cpu_threads))
+        return _backend
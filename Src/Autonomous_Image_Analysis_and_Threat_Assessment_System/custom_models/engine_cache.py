@@ -0,0 +1,66 @@
+# custom_models/engine_cache.py
+import hashlib
+import os
+from ultralytics import YOLO
+from project_utils.config import ENGINE_CACHE_DIR
+
+# ultralytics export formatı → dosya uzantısı
+ENGINE_EXTENSIONS = {
+    "onnx": ".onnx",
+    "torchscript": ".torchscript",
+}
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EngineCache:
+    """
+    .pt ağırlıklarını sabit giriş şekilli bir çalışma zamanı formatına
+    (ONNX / TorchScript) dışa aktarır ve diskte saklar.
+
+    Anahtar = ağırlık dosyasının SHA‑256'sı + format + (batch, H, W) + precision.
+    Ağırlık değişmediği sürece sonraki açılışlar doğrudan önbellekteki
+    motoru yükler; ultralytics .pt yükleme + fuse adımı atlanır.
+    """
+    def __init__(self, cache_dir: str = ENGINE_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    # ------------------------------------------------------------------ #
+    def engine_path(self, weights_path, fmt, batch, height, width, half):
+        if fmt not in ENGINE_EXTENSIONS:
+            raise ValueError(f"Unsupported engine format: {fmt}")
+
+        stem = os.path.splitext(os.path.basename(weights_path))[0]
+        digest = file_sha256(weights_path)[:16]
+        precision = "fp16" if half else "fp32"
+        name = f"{stem}-{digest}-b{batch}-{height}x{width}-{precision}{ENGINE_EXTENSIONS[fmt]}"
+        return os.path.join(self.cache_dir, name)
+
+    def get_or_export(self, weights_path, fmt, batch, height, width, half=False, device="cpu"):
+        """Önbellekte varsa yolu döndürür, yoksa dışa aktarıp önbelleğe taşır."""
+        path = self.engine_path(weights_path, fmt, batch, height, width, half)
+        if os.path.isfile(path):
+            print(f"Engine cache hit: {path}")
+            return path
+
+        print(f"Exporting {weights_path} → {fmt} (batch={batch}, {height}x{width}) …")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        exported = YOLO(weights_path).export(
+            format=fmt,
+            imgsz=(height, width),
+            batch=batch,
+            half=half,
+            dynamic=False,
+            device=device,
+            verbose=False,
+        )
+        os.replace(exported, path)
+        print(f"Engine cached at {path}")
+        return path
@@ -1,38 +1,75 @@
 # models/model.py
 import sys
-import torch
 from ultralytics import YOLO
-from PyQt5.QtWidgets import QMessageBox
+from custom_models.backend import get_backend
+from custom_models.engine_cache import EngineCache
+from project_utils.config import INFERENCE_ENGINE, BATCH_SIZE
 
 
 class YOLOModel:
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, backend=None,
+                 engine: str = INFERENCE_ENGINE, input_size=None,
+                 exit_on_error: bool = True):
         try:
             if not model_path:
                 raise ValueError("YOLOModel requires a non-empty model_path.")
 
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.backend = backend or get_backend()
+            self.device = self.backend.device
+            self.engine = engine
+            self.fixed_batch = None        # dışa aktarılmış motorlarda sabit batch
             print(f"Device selected: {self.device}")
-            print(f"Loading YOLOv8 model from {model_path} …")
-
-            self.model = YOLO(model_path)
-            self.model.fuse()
-            
-            # MODEL'İ GPU'ya half formatta gönder
-            self.model.model.half().to(self.device)
-
-            self.names = (
-                self.model.model.names
-                if hasattr(self.model.model, "names")
-                else {i: f"class{i}" for i in range(1000)}
-            )
+
+            if engine != "pytorch" and input_size is not None:
+                self._load_engine(model_path, engine, input_size)
+            else:
+                self._load_pytorch(model_path)
 
             print(f"YOLOv8 model '{model_path}' loaded successfully on {self.device}.")
 
         except Exception as e:
+            # Arka plan iş parçacığından çağrıldıysa hatayı çağırana bırak
+            if not exit_on_error:
+                raise
+            # GUI'siz kullanım (headless.py) PyQt5 gerektirmesin
+            from PyQt5.QtWidgets import QMessageBox
             QMessageBox.critical(
                 None,
                 "Model Loading Error",
                 f"Failed to load the YOLOv8 model.\nError: {e}",
             )
             sys.exit(1)
+
+    # ------------------------------------------------------------------ #
+    def _load_pytorch(self, model_path):
+        print(f"Loading YOLOv8 model from {model_path} …")
+        self.engine = "pytorch"
+        self.model = YOLO(model_path)
+        self.model.fuse()
+
+        # GPU → half, CPU → fp32 + channels_last
+        self.model.model = self.backend.prepare_module(self.model.model)
+
+        self.names = (
+            self.model.model.names
+            if hasattr(self.model.model, "names")
+            else {i: f"class{i}" for i in range(1000)}
+        )
+
+    def _load_engine(self, model_path, engine, input_size):
+        """input_size = (width, height) – motor bu şekle sabitlenir."""
+        width, height = input_size
+        try:
+            engine_path = EngineCache().get_or_export(
+                model_path, engine, BATCH_SIZE, height, width,
+                half=self.backend.is_cuda, device=self.backend.device,
+            )
+        except Exception as e:
+            print(f"Engine export failed ({e}) – falling back to PyTorch weights.")
+            self._load_pytorch(model_path)
+            return
+
+        print(f"Loading cached {engine} engine from {engine_path} …")
+        self.model = YOLO(engine_path, task="detect")
+        self.fixed_batch = BATCH_SIZE
+        self.names = self.model.names
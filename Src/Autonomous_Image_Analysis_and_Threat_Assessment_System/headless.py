@@ -0,0 +1,94 @@
+# headless.py
+"""
+GUI'siz toplu analiz: bir ya da birden çok video için detect → track → threat,
+kare başına iz ve tehdit skorları JSONL ya da sütunlu (.npz) dosyaya yazılır.
+
+    python headless.py footage/*.mp4 -o results --format jsonl --workers 2
+    python headless.py flight.mp4 --enemy-zone 800,0,1600,400 --export-video
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from process_operations.batch_analysis import WRITERS, init_worker, analyze_file, output_names
+
+
+def parse_zone(text):
+    try:
+        x1, y1, x2, y2 = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"zone must be x1,y1,x2,y2 – got {text!r}")
+    return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Headless detect → track → threat analysis over video files."
+    )
+    parser.add_argument("videos", nargs="+", help="video files to analyse")
+    parser.add_argument("-o", "--output-dir", default="results",
+                        help="directory for per-video output files (default: results)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default="jsonl",
+                        help="jsonl → one JSON line per frame, npz → columnar arrays")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="parallel worker processes, each loads the models once")
+    parser.add_argument("--export-video", action="store_true",
+                        help="also write an annotated MP4 (boxes, threat labels, zones) per video")
+    parser.add_argument("--friendly-zone", type=parse_zone, action="append", default=[],
+                        metavar="X1,Y1,X2,Y2", help="friendly zone in frame pixels (repeatable)")
+    parser.add_argument("--enemy-zone", type=parse_zone, action="append", default=[],
+                        metavar="X1,Y1,X2,Y2", help="enemy zone in frame pixels (repeatable)")
+    return parser
+
+
+def main(argv=None):
+    warnings.filterwarnings("ignore", category=RuntimeWarning)
+    args = build_parser().parse_args(argv)
+
+    videos = [v for v in args.videos if os.path.isfile(v)]
+    for missing in sorted(set(args.videos) - set(videos)):
+        print(f"Skipping missing file: {missing}", file=sys.stderr)
+    # Aynı dosya iki kez verilmişse bir kez işlenir
+    unique = {}
+    for video in videos:
+        unique.setdefault(os.path.abspath(video), video)
+    videos = list(unique.values())
+    if not videos:
+        return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+    names = output_names(videos)
+
+    workers = max(1, min(args.workers, len(videos)))
+    failed = 0
+
+    # spawn → her işçi kendi CUDA bağlamını kurar
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(workers,),
+    ) as pool:
+        futures = {
+            pool.submit(analyze_file, video, args.output_dir, args.format,
+                        args.friendly_zone, args.enemy_zone, args.export_video,
+                        names[video]): video
+            for video in videos
+        }
+        for future in as_completed(futures):
+            try:
+                video, out_path, frames, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"FAILED {futures[future]}: {e}", file=sys.stderr)
+                continue
+            fps = frames / seconds if seconds > 0 else 0.0
+            print(f"{video}: {frames} frames in {seconds:.1f}s ({fps:.1f} fps) → {out_path}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# object_detection/detections.py
+import numpy as np
+import torch
+
+
+class DetectionBatch:
+    """
+    Bir batch'in tüm algılamaları, sütun düzeninde (columnar).
+
+    boxes      : (N,4) float32  – x1,y1,x2,y2 (piksel)
+    conf       : (N,)  float32
+    class_ids  : (N,)  int32    – birleşik sınıf tablosundaki indeks
+    source     : (N,)  int8     – hangi modelden geldiği (0=insan, 1=araç …)
+    offsets    : (B+1,) int64   – kare i'nin satırları offsets[i]:offsets[i+1]
+
+    Satırlar kare sırasına göre dizilidir; kare görünümleri (FrameDetections)
+    kopya değil, dilimdir.
+    """
+    __slots__ = ("boxes", "conf", "class_ids", "source", "offsets", "class_names")
+
+    def __init__(self, boxes, conf, class_ids, source, offsets, class_names):
+        self.boxes = boxes
+        self.conf = conf
+        self.class_ids = class_ids
+        self.source = source
+        self.offsets = offsets
+        self.class_names = class_names
+
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_results(cls, results_per_model, class_offsets, class_names, threshold):
+        """
+        results_per_model : her model için ultralytics Results listesi
+                            (hepsi aynı B kare için)
+        class_offsets     : model m'nin sınıf id'lerine eklenecek kaydırma
+        Cihazdan host'a batch başına TEK kopya yapılır.
+        """
+        num_frames = len(results_per_model[0]) if results_per_model else 0
+
+        parts = [
+            cls.result_table(result, frame_idx, model_idx)
+            for model_idx, results in enumerate(results_per_model)
+            for frame_idx, result in enumerate(results)
+        ]
+        parts = [p for p in parts if p is not None]
+
+        if not parts:
+            return cls.empty(num_frames, class_names)
+
+        table = torch.cat(parts)
+        return cls.from_table(table[table[:, 4] >= threshold], num_frames,
+                              class_offsets, class_names)
+
+    @classmethod
+    def from_table(cls, table, num_frames, class_offsets, class_names):
+        """
+        table : (N,8) tensor – x1,y1,x2,y2,conf,cls,frame,model (cihazda olabilir)
+        """
+        if table.shape[0] == 0:
+            return cls.empty(num_frames, class_names)
+
+        table = table.cpu().numpy()                      # tek D2H transferi
+
+        frame_idx = table[:, 6].astype(np.int64)
+        order = np.argsort(frame_idx, kind="stable")
+        table = table[order]
+        frame_idx = frame_idx[order]
+
+        source = table[:, 7].astype(np.int8)
+        class_ids = table[:, 5].astype(np.int32) + np.asarray(class_offsets, dtype=np.int32)[source]
+
+        offsets = np.zeros(num_frames + 1, dtype=np.int64)
+        np.cumsum(np.bincount(frame_idx, minlength=num_frames), out=offsets[1:])
+
+        return cls(
+            boxes=np.ascontiguousarray(table[:, :4], dtype=np.float32),
+            conf=np.ascontiguousarray(table[:, 4], dtype=np.float32),
+            class_ids=class_ids,
+            source=source,
+            offsets=offsets,
+            class_names=class_names,
+        )
+
+    @staticmethod
+    def result_table(result, frame_idx, model_idx):
+        """Tek bir ultralytics Results → (n,8) tablo (cihazda), boşsa None."""
+        boxes = getattr(result, "boxes", None)
+        if boxes is None or len(boxes) == 0:
+            return None
+        data = boxes.data[:, :6].float()
+        return torch.cat((
+            data,
+            data.new_full((data.shape[0], 1), frame_idx),
+            data.new_full((data.shape[0], 1), model_idx),
+        ), dim=1)
+
+    @classmethod
+    def empty(cls, num_frames, class_names):
+        return cls(
+            boxes=np.zeros((0, 4), dtype=np.float32),
+            conf=np.zeros(0, dtype=np.float32),
+            class_ids=np.zeros(0, dtype=np.int32),
+            source=np.zeros(0, dtype=np.int8),
+            offsets=np.zeros(num_frames + 1, dtype=np.int64),
+            class_names=class_names,
+        )
+
+    # ------------------------------------------------------------------ #
+    def select(self, keep):
+        """keep : (N,) bool maske → yalnızca seçili satırları içeren yeni batch."""
+        frame_idx = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+        counts = np.bincount(frame_idx[keep], minlength=len(self))
+
+        offsets = np.zeros_like(self.offsets)
+        np.cumsum(counts, out=offsets[1:])
+        return DetectionBatch(
+            self.boxes[keep], self.conf[keep], self.class_ids[keep],
+            self.source[keep], offsets, self.class_names,
+        )
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.frame(i)
+
+    def __getitem__(self, i):
+        return self.frame(i)
+
+    def frame(self, i):
+        a, b = self.offsets[i], self.offsets[i + 1]
+        return FrameDetections(
+            self.boxes[a:b], self.conf[a:b], self.class_ids[a:b],
+            self.source[a:b], self.class_names,
+        )
+
+
+class FrameDetections:
+    """Tek karenin algılamaları – DetectionBatch üzerinde hafif görünüm."""
+    __slots__ = ("boxes", "conf", "class_ids", "source", "class_names")
+
+    def __init__(self, boxes, conf, class_ids, source, class_names):
+        self.boxes = boxes
+        self.conf = conf
+        self.class_ids = class_ids
+        self.source = source
+        self.class_names = class_names
+
+    def __len__(self):
+        return len(self.conf)
+
+    @property
+    def labels(self):
+        names = self.class_names
+        return [names[c] for c in self.class_ids.tolist()]
+
+    def __getitem__(self, i):
+        """Eski sözlük biçimi: {'bbox', 'conf', 'cls'} (UI / hata ayıklama için)."""
+        return {
+            "bbox": self.boxes[i].tolist(),
+            "conf": float(self.conf[i]),
+            "cls":  self.class_names[self.class_ids[i]],
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,86 @@
+# object_detection/inference_runner.py
+from concurrent.futures import ThreadPoolExecutor
+import torch
+
+
+class DualModelRunner:
+    """
+    İnsan ve araç modellerini AYNI ön işlenmiş giriş tensörü üzerinde
+    eşzamanlı çalıştırır.
+
+    • CUDA : her model kendi stream'inde, ayrı bir iş parçacığından başlatılır
+    • CPU  : iki iş parçacığı (torch çekirdekleri GIL'i bırakır)
+    """
+    def __init__(self, *models):
+        if not models:
+            raise ValueError("DualModelRunner requires at least one model.")
+
+        self.models = models
+        self.backend = models[0].backend
+        self.device = self.backend.device
+        self.use_cuda = self.backend.is_cuda
+
+        # Modeller eşzamanlı çalışır → süreç CPU bütçesi aralarında paylaşılır
+        self.backend.configure_cpu_threads(len(models))
+
+        self.streams = [self.backend.new_stream() for _ in models]
+        self.pool = ThreadPoolExecutor(
+            max_workers=len(models),
+            thread_name_prefix="ModelRunner",
+        )
+
+    # ------------------------------------------------------------------ #
+    def run(self, input_tensor):
+        """
+        input_tensor : (B,3,H,W) – modelin dtype'ında, 0‑1 aralığında
+        Dönüş        : her model için ultralytics Results listesi (sırayla)
+        """
+        ready = None
+        if self.use_cuda:
+            # Giriş tensörü mevcut stream'de hazırlanıyor → model stream'leri beklesin
+            ready = torch.cuda.Event()
+            ready.record(torch.cuda.current_stream())
+
+        futures = [
+            self.pool.submit(self._run_one, idx, input_tensor, ready)
+            for idx in range(len(self.models))
+        ]
+        return tuple(f.result() for f in futures)
+
+    def _run_one(self, idx, input_tensor, ready):
+        yolo = self.models[idx]
+        stream = self.streams[idx]
+
+        kwargs = self.backend.predict_kwargs
+        batch_len = input_tensor.shape[0]
+
+        with torch.inference_mode():
+            if stream is None:
+                batch = self._fit_batch(yolo, input_tensor)
+                results = yolo.model.predict(batch, stream=False, verbose=False, **kwargs)
+                return results[:batch_len]
+
+            stream.wait_event(ready)
+            with torch.cuda.stream(stream):
+                batch = self._fit_batch(yolo, input_tensor)
+                results = yolo.model.predict(batch, stream=False, verbose=False, **kwargs)
+            stream.synchronize()
+            return results[:batch_len]
+
+    @staticmethod
+    def _fit_batch(yolo, input_tensor):
+        """Sabit batch'li (dışa aktarılmış) motorlar için eksik batch'i sıfırla doldur."""
+        fixed = yolo.fixed_batch
+        if fixed is None or input_tensor.shape[0] == fixed:
+            return input_tensor
+        if input_tensor.shape[0] > fixed:
+            raise ValueError(
+                f"Batch of {input_tensor.shape[0]} exceeds engine batch size {fixed}."
+            )
+
+        padded = input_tensor.new_zeros((fixed, *input_tensor.shape[1:]))
+        padded[:input_tensor.shape[0]].copy_(input_tensor)
+        return padded
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
@@ -1,53 +1,128 @@
 # object_detection/object_detector.py
+import cv2
+import numpy as np
 import torch
 from custom_models.model import YOLOModel
-from project_utils.config import MODEL_PATH_HUMAN, MODEL_PATH_MILITARY_VEHICLE
+from object_detection.detections import DetectionBatch
+from object_detection.inference_runner import DualModelRunner
+from object_detection.suppression import CrossModelSuppressor
+from object_detection.tiling import TiledInference
+from project_utils.config import (
+    MODEL_PATH_HUMAN, MODEL_PATH_MILITARY_VEHICLE, TILED_INFERENCE, CROSS_MODEL_SUPPRESSION
+)
+
+STRIDE = 32
 
 
 class ObjectDetector:
-    def __init__(self):
-        self.human_detector = YOLOModel(model_path=MODEL_PATH_HUMAN)
+    def __init__(self, input_size=None, progress=None, exit_on_error=True):
+        """
+        input_size : (width, height) – dışa aktarılmış motorların sabit giriş şekli
+        progress   : isteğe bağlı geri çağırma, progress(yüzde, mesaj)
+        """
+        report = progress or (lambda percent, message: None)
+
+        report(5, "Loading person model…")
+        self.human_detector = YOLOModel(
+            model_path=MODEL_PATH_HUMAN, input_size=input_size, exit_on_error=exit_on_error
+        )
         self.human_names = self.human_detector.names
 
-        self.vehicle_detector = YOLOModel(model_path=MODEL_PATH_MILITARY_VEHICLE)
+        report(45, "Loading vehicle model…")
+        self.vehicle_detector = YOLOModel(
+            model_path=MODEL_PATH_MILITARY_VEHICLE, input_size=input_size,
+            exit_on_error=exit_on_error,
+        )
         self.vehicle_names = self.vehicle_detector.names
+        report(85, "Models loaded.")
+
+        # Birleşik sınıf tablosu: önce insan, sonra araç sınıfları
+        self.class_names = (
+            [self.human_names[i] for i in sorted(self.human_names)] +
+            [self.vehicle_names[i] for i in sorted(self.vehicle_names)]
+        )
+        self.class_offsets = (0, len(self.human_names))
+
+        # İki model tek giriş tensörünü paylaşır, eşzamanlı çalışır
+        self.runner = DualModelRunner(self.human_detector, self.vehicle_detector)
+
+        # İki modelin aynı bölgeye verdiği yinelenen kutuları ayıkla
+        self.suppressor = (
+            CrossModelSuppressor(self.class_names) if CROSS_MODEL_SUPPRESSION else None
+        )
+
+        # Küçük / uzak hedefler için isteğe bağlı dilimli çıkarım
+        self.tiler = None
+        if TILED_INFERENCE:
+            if self.human_detector.fixed_batch or self.vehicle_detector.fixed_batch:
+                print("Tiled inference needs dynamic input shapes – disabled for exported engines.")
+            else:
+                self.tiler = TiledInference(self)
 
     # --------------------------------------------------------------------- #
+    def warmup(self, width, height):
+        """
+        Boş bir kare üzerinde tek çıkarım: CUDA çekirdek seçimi, ultralytics
+        predictor kurulumu vb. ilk karede değil burada ödenir.
+        """
+        backend = self.human_detector.backend
+        dummy = backend.empty_input(1, height, width).zero_()
+        self.detect_batch(dummy, threshold=1.0)
+        backend.synchronize()
+
     def detect_objects(self, frames, threshold: float = 0.5):
-        batch_out = []
+        input_tensor = self.prepare_input(frames)
+        return self.detect_batch(input_tensor, threshold)
+
+    def detect_batch(self, input_tensor, threshold: float = 0.5, track_boxes=None,
+                     sessions=None):
+        """
+        track_boxes : (M,4) mevcut iz kutuları – yalnızca "tracks" karo
+                      modunda karoların nereye açılacağını belirler
+        sessions    : [(anahtar, kare sayısı, track_boxes)] – birden çok akışın
+                      karelerinden oluşan batch (SharedDetector); karo modu
+                      kutuları ve batch sayacını grup başına uygular
+        """
+        if self.tiler is not None:
+            batch = self.tiler.detect(input_tensor, threshold, track_boxes, sessions)
+        else:
+            human_res, vehicle_res = self.infer(input_tensor)
+            batch = self.merge_results(human_res, vehicle_res, threshold)
 
-        with torch.inference_mode():
-            human_res   = self.human_detector.model(frames, verbose=False)
-            vehicle_res = self.vehicle_detector.model(frames, verbose=False)
+        if self.suppressor is not None:
+            batch = self.suppressor.apply(batch)
+        return batch
 
-            for hr, vr in zip(human_res, vehicle_res):
-                dets = []
-                dets.extend(self._parse(hr, self.human_names, threshold))
-                dets.extend(self._parse(vr, self.vehicle_names, threshold))
-                batch_out.append(dets)
+    def infer(self, input_tensor):
+        """Her iki modeli tek ön işlenmiş tensör üzerinde eşzamanlı çalıştırır."""
+        return self.runner.run(input_tensor)
 
-        return batch_out
+    def merge_results(self, human_res, vehicle_res, threshold: float):
+        """İki modelin çıktısını tek bir sütunlu DetectionBatch'te birleştirir."""
+        return DetectionBatch.from_results(
+            (human_res, vehicle_res), self.class_offsets, self.class_names, threshold
+        )
 
     # --------------------------------------------------------------------- #
-    @staticmethod
-    def _parse(result, name_map, threshold):
-        out = []
-        boxes = getattr(result, "boxes", None)
-        if not boxes:
-            return out
-
-        for (x1, y1, x2, y2), conf, cid in zip(
-            boxes.xyxy.cpu().numpy(),
-            boxes.conf.cpu().numpy(),
-            boxes.cls.cpu().numpy().astype(int),
-        ):
-            if conf < threshold:
-                continue
-            out.append(
-                {
-                    "bbox": [float(x1), float(y1), float(x2), float(y2)],
-                    "conf": float(conf),
-                    "cls":  name_map.get(int(cid), f"class_{cid}"),
-                }
-            )
-        return out
+    def prepare_input(self, frames):
+        """
+        BGR uint8 kareler → (B,3,H,W) tensör, tek sefer ön işleme.
+        Sağ/alt kenar STRIDE katına sıfırla doldurulur; kutu koordinatları
+        orijinal karedeki gibi kalır.
+        """
+        h, w = frames[0].shape[:2]
+        pad_h = (-h) % STRIDE
+        pad_w = (-w) % STRIDE
+
+        batch = []
+        for frame in frames:
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if pad_h or pad_w:
+                rgb = cv2.copyMakeBorder(rgb, 0, pad_h, 0, pad_w, cv2.BORDER_CONSTANT)
+            batch.append(rgb)
+
+        frames_np = np.stack(batch).transpose(0, 3, 1, 2)
+        backend = self.human_detector.backend
+        tensor = torch.from_numpy(frames_np).to(backend.device)
+        tensor = tensor.to(dtype=backend.dtype, memory_format=backend.memory_format)
+        return tensor.div_(255.0)
@@ -0,0 +1,217 @@
+# object_detection/shared_detector.py
+import itertools
+import threading
+import time
+from collections import deque
+from custom_models.backend import get_backend
+from process_operations.preprocess import BatchStager
+from project_utils.config import (
+    BATCH_SIZE, SHARED_BATCH_WAIT_MS, VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT
+)
+
+
+class _Request:
+    """Bir akışın detect_frames çağrısı; kareleri birden çok batch'e bölünebilir."""
+    __slots__ = ("stream_id", "frames", "threshold", "track_boxes",
+                 "next", "results", "error", "done")
+
+    def __init__(self, stream_id, frames, threshold, track_boxes):
+        self.stream_id = stream_id
+        self.frames = frames
+        self.threshold = threshold
+        self.track_boxes = track_boxes
+        self.next = 0                    # henüz batch'e alınmamış ilk kare
+        self.results = []                # kare sırasıyla FrameDetections
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def remaining(self):
+        return len(self.frames) - self.next
+
+
+class SharedDetector:
+    """
+    Tek ObjectDetector'ı birden çok akış arasında paylaştırır.
+
+    • Her akış kendi StreamDetector istemcisiyle uint8 kareleri gönderir
+      (detect_frames, bloklar)
+    • Tek çıkarım iş parçacığı bekleyen istekleri adil sırayla (round‑robin,
+      akış başına eşit pay) BATCH_SIZE'lık ortak batch'lere paketler ve tek
+      BatchStager ile hazırlar – akış başına pinned halka / cihaz tamponu yok
+    • Sonuçlar kare kare ayrılıp her akışa kendi sırasıyla döner
+    • Karo "tracks" modu her akışın karelerini kendi iz kutularıyla ve kendi
+      batch sayacıyla karolar (sessions)
+    """
+    def __init__(self, detector, batch_size=BATCH_SIZE, wait_ms=SHARED_BATCH_WAIT_MS,
+                 width=VIDEO_FRAME_WIDTH, height=VIDEO_FRAME_HEIGHT):
+        self.detector = detector
+        self.batch_size = batch_size
+        self.wait_s = wait_ms / 1000.0
+        self.stager = BatchStager(get_backend(), batch_size, height, width)
+
+        self.queues = {}                 # stream_id → deque[_Request]
+        self.order = deque()             # round‑robin sırası
+        self.cond = threading.Condition()
+        self.ids = itertools.count()
+        self.stopped = False
+
+        self.thread = threading.Thread(target=self._run, daemon=True, name="SharedInferenceThread")
+        self.thread.start()
+
+    def client(self, name=None):
+        with self.cond:
+            stream_id = next(self.ids)
+            self.queues[stream_id] = deque()
+            self.order.append(stream_id)
+        return StreamDetector(self, stream_id, name)
+
+    def unregister(self, stream_id):
+        with self.cond:
+            pending = self.queues.pop(stream_id, ())
+            if stream_id in self.order:
+                self.order.remove(stream_id)
+        tiler = getattr(self.detector, "tiler", None)
+        if tiler is not None:
+            tiler.forget(stream_id)
+        for req in pending:
+            req.error = RuntimeError("stream closed")
+            req.done.set()
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        self.thread.join(timeout=5)
+
+    # ------------------------------------------------------------------ #
+    def submit(self, stream_id, frames, threshold, track_boxes):
+        if not frames:
+            return []
+        req = _Request(stream_id, frames, threshold, track_boxes)
+        with self.cond:
+            if stream_id not in self.queues:
+                raise RuntimeError("stream closed")
+            self.queues[stream_id].append(req)
+            self.cond.notify_all()
+        req.done.wait()
+        if req.error is not None:
+            raise req.error
+        return req.results
+
+    def _pending(self):
+        return sum(r.remaining for q in self.queues.values() for r in q)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.stopped and self._pending() == 0:
+                    self.cond.wait()
+                if self.stopped:
+                    return
+
+                # Batch dolmadıysa diğer akışların isteklerine kısa süre tanı
+                # (tek kayıtlı akışta beklenecek başka istek yok)
+                deadline = time.monotonic() + self.wait_s
+                while len(self.queues) > 1 and self._pending() < self.batch_size:
+                    left = deadline - time.monotonic()
+                    if left <= 0 or self.stopped:
+                        break
+                    self.cond.wait(left)
+
+                segments = self._pack()
+
+            self._infer(segments)
+
+    def _pack(self):
+        """
+        Adil paketleme: her turda etkin akışlara kalan kapasitenin eşit payı
+        verilir; sıra her batch'te bir kaydırılır ki aynı akış hep önde olmasın.
+        Dönüş: [(istek, başlangıç, bitiş)], hepsi aynı eşikte.
+        """
+        capacity = self.batch_size
+        threshold = None
+        segments = []
+
+        while capacity > 0:
+            active = [sid for sid in self.order if self.queues[sid]]
+            if not active:
+                break
+            share = max(1, capacity // len(active))
+            progressed = False
+            for sid in active:
+                queue = self.queues[sid]
+                req = queue[0]
+                if threshold is None:
+                    threshold = req.threshold
+                if req.threshold != threshold or capacity == 0:
+                    continue
+
+                take = min(req.remaining, share, capacity)
+                segments.append((req, req.next, req.next + take))
+                req.next += take
+                capacity -= take
+                progressed = True
+                if req.remaining == 0:
+                    queue.popleft()
+            if not progressed:
+                break
+
+        self.order.rotate(-1)
+        return segments
+
+    def _infer(self, segments):
+        if not segments:
+            return
+        frames = [frame for req, a, b in segments for frame in req.frames[a:b]]
+        sessions = [(req.stream_id, b - a, req.track_boxes) for req, a, b in segments]
+
+        try:
+            batch = self.detector.detect_batch(
+                self.stager.stage(frames), segments[0][0].threshold, sessions=sessions
+            )
+        except Exception as e:           # hata, batch'teki her isteğe iletilir
+            with self.cond:
+                for req, _, _ in segments:
+                    queue = self.queues.get(req.stream_id)
+                    if queue and req in queue:
+                        queue.remove(req)
+                    req.error = e
+                    req.done.set()
+            return
+
+        frame = 0
+        for req, a, b in segments:
+            req.results.extend(batch.frame(i) for i in range(frame, frame + b - a))
+            frame += b - a
+            if req.remaining == 0 and len(req.results) == len(req.frames):
+                req.done.set()
+
+
+class StreamDetector:
+    """
+    Akışa özel dedektör vekili: kareler (ön işlenmemiş) paylaşılan
+    zamanlayıcıya gider. Asıl dedektörden yalnızca salt okunur sınıf
+    tabloları (READ_ONLY) okunur; tüm çıkarım detect_frames → çıkarım
+    iş parçacığı yolundan geçer.
+    """
+    READ_ONLY = ("class_names", "class_offsets", "human_names", "vehicle_names")
+
+    def __init__(self, shared, stream_id, name=None):
+        self.shared = shared
+        self.stream_id = stream_id
+        self.name = name
+
+    def detect_frames(self, frames, threshold: float = 0.5, track_boxes=None):
+        """frames: BGR uint8 (H,W,3) listesi → kare başına FrameDetections."""
+        return self.shared.submit(self.stream_id, list(frames), threshold, track_boxes)
+
+    def close(self):
+        self.shared.unregister(self.stream_id)
+
+    def __getattr__(self, name):
+        if name in StreamDetector.READ_ONLY:
+            return getattr(self.shared.detector, name)
+        raise AttributeError(
+            f"{type(self).__name__} has no attribute {name!r}; inference goes through detect_frames()"
+        )
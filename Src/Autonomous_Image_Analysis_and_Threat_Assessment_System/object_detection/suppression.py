@@ -0,0 +1,70 @@
+# object_detection/suppression.py
+import numpy as np
+from project_utils.config import (
+    CROSS_MODEL_IOU, CROSS_MODEL_CONF_MARGIN, CROSS_MODEL_PRIORITY, CROSS_MODEL_DEFAULT_PRIORITY
+)
+
+
+def box_iou(a, b):
+    """a:(N,4), b:(M,4) x1,y1,x2,y2 → (N,M) IoU matrisi."""
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(br - tl, 0, None).prod(axis=2)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class CrossModelSuppressor:
+    """
+    İnsan ve araç modellerinin aynı bölgeye verdiği yinelenen kutuları ayıklar
+    (ör. araç üstündeki mürettebat, taret üzerinde sahte 'person').
+
+    Kural: FARKLI modellerden gelen iki kutunun IoU'su eşiği aşıyorsa,
+    sınıf önceliği düşük olan kutu silinir – ancak güveni yüksek öncelikli
+    kutudan `conf_margin` kadar fazlaysa korunur.
+    """
+    def __init__(self, class_names, iou_threshold=CROSS_MODEL_IOU,
+                 conf_margin=CROSS_MODEL_CONF_MARGIN, priority=CROSS_MODEL_PRIORITY,
+                 default_priority=CROSS_MODEL_DEFAULT_PRIORITY):
+        self.iou_threshold = iou_threshold
+        self.conf_margin = conf_margin
+        # Sınıf → öncelik (tabloda yoksa NaN → modelin varsayılanı)
+        self.class_priority = np.array(
+            [priority.get(name, np.nan) for name in class_names], dtype=np.float32
+        )
+        self.default_priority = default_priority
+
+    def _class_priority(self, class_ids, source):
+        prio = self.class_priority[class_ids]
+        fallback = np.asarray(self.default_priority, dtype=np.float32)[source]
+        return np.where(np.isnan(prio), fallback, prio)
+
+    # ------------------------------------------------------------------ #
+    def apply(self, batch):
+        if len(batch.conf) == 0:
+            return batch
+
+        prio = self._class_priority(batch.class_ids, batch.source)
+        keep = np.ones(len(batch.conf), dtype=bool)
+
+        for i in range(len(batch)):
+            a, b = batch.offsets[i], batch.offsets[i + 1]
+            src = batch.source[a:b]
+            if b - a < 2 or src.min() == src.max():
+                continue                               # tek modelden algılama
+
+            iou = box_iou(batch.boxes[a:b], batch.boxes[a:b])
+            conf, p = batch.conf[a:b], prio[a:b]
+
+            # [r, c] = True → r satırı, c kutusu yüzünden bastırılır
+            loses = (
+                (iou >= self.iou_threshold)
+                & (src[:, None] != src[None, :])
+                & (p[:, None] < p[None, :])
+                & (conf[:, None] < conf[None, :] + self.conf_margin)
+            )
+            keep[a:b] = ~loses.any(axis=1)
+
+        return batch if keep.all() else batch.select(keep)
@@ -0,0 +1,191 @@
+# object_detection/tiling.py
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torchvision.ops import batched_nms
+
+from object_detection.detections import DetectionBatch
+from project_utils.config import (
+    TILE_SIZE, TILE_OVERLAP, TILE_UPSCALE, TILE_MODE, TILE_KEYFRAME_INTERVAL,
+    TILE_BATCH, TILE_NMS_IOU,
+)
+
+
+def tile_grid(height, width, tile_h, tile_w, overlap):
+    """Kareyi örten, `overlap` oranında örtüşen pencereler → (T,4) x1,y1,x2,y2."""
+    def starts(size, tile):
+        if size <= tile:
+            return [0]
+        step = max(1, int(tile * (1.0 - overlap)))
+        pos = list(range(0, size - tile, step))
+        pos.append(size - tile)                  # son pencere kenara hizalı
+        return pos
+
+    ys, xs = starts(height, tile_h), starts(width, tile_w)
+    grid = np.array([(x, y, x + tile_w, y + tile_h) for y in ys for x in xs], dtype=np.int64)
+    return grid
+
+
+def tiles_around_boxes(boxes, height, width, tile_h, tile_w):
+    """
+    Her iz kutusunu merkezleyen pencereler; zaten tamamen bir pencerenin
+    içinde kalan kutular için yeni pencere açılmaz (kutu sırasıyla, açgözlü).
+
+    Aday pencereler ve kutu × önceki pencere kapsama matrisi tek seferde
+    hesaplanır. Her tur tüm kutulara birden karar verir: kapsayan önceki
+    adaylardan biri açıldıysa kutu atlanır, hepsi kapalı kaldıysa kendi
+    penceresi açılır. Tur sayısı kapsama zincirinin derinliği kadardır
+    (tipik olarak birkaç tur).
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    centers = (boxes[:, :2] + boxes[:, 2:]) * 0.5
+    half = np.array([tile_w / 2, tile_h / 2], dtype=np.float32)
+    upper = np.array([max(0, width - tile_w), max(0, height - tile_h)])
+    top_left = np.clip(centers - half, 0, upper).astype(np.int64)
+    candidates = np.concatenate([top_left, top_left + (tile_w, tile_h)], axis=1)
+
+    # inside[i, j]: kutu i, önceki kutu j'nin (j < i) aday penceresinin içinde
+    x1, y1, x2, y2 = (boxes[:, k, None] for k in range(4))
+    wx1, wy1, wx2, wy2 = candidates.astype(np.float32).T
+    inside = np.tril((wx1 <= x1) & (wy1 <= y1) & (x2 <= wx2) & (y2 <= wy2), k=-1)
+
+    opened = np.zeros(len(boxes), dtype=bool)
+    decided = np.zeros(len(boxes), dtype=bool)
+    while not decided.all():
+        # açılmış bir pencere kapsıyor → atla; kapsayanların hepsi kapalı → aç
+        covered = (inside & opened).any(axis=1)
+        opens = ~(inside & (opened | ~decided)).any(axis=1)
+        opened |= ~decided & opens
+        decided |= covered | opens
+    return candidates[opened]
+
+
+class TiledInference:
+    """
+    Küçük / uzak hedefler için dilimli çıkarım.
+
+    • Her kare örtüşen karolara bölünür, karolar TILE_UPSCALE ile büyütülür.
+    • Batch'teki TÜM karelerin karoları tek (parçalı) ileri geçişte çalışır.
+    • Tam kare geçişi + karo sonuçları kare/sınıf bazında vektörel NMS
+      ile birleştirilir.
+    • "tracks" modunda tam ızgara yalnızca anahtar batch'lerde
+      (her TILE_KEYFRAME_INTERVAL batch'te bir) kullanılır; aradaki
+      batch'lerde yalnızca mevcut izlerin çevresi karolanır. Batch sayacı
+      ve iz kutuları oturum başınadır: SharedDetector'ın ortak batch'inde
+      her akışın kareleri kendi kutularıyla ve kendi sayacıyla karolanır.
+    """
+    def __init__(self, detector, tile_size=TILE_SIZE, overlap=TILE_OVERLAP,
+                 upscale=TILE_UPSCALE, mode=TILE_MODE,
+                 keyframe_interval=TILE_KEYFRAME_INTERVAL, tile_batch=TILE_BATCH,
+                 nms_iou=TILE_NMS_IOU):
+        if mode not in ("full", "tracks"):
+            raise ValueError(f"Unknown tiling mode: {mode}")
+
+        self.detector = detector
+        self.tile_w, self.tile_h = tile_size
+        self.overlap = overlap
+        self.upscale = upscale
+        self.mode = mode
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.tile_batch = tile_batch
+        self.nms_iou = nms_iou
+        self.batch_counters = {}         # oturum anahtarı → karolanan batch sayısı
+
+    # ------------------------------------------------------------------ #
+    def detect(self, input_tensor, threshold, track_boxes=None, sessions=None):
+        """
+        sessions : [(anahtar, kare sayısı, track_boxes)] – batch'in ardışık kare
+                   grupları; verilmezse tüm batch tek oturumdur (track_boxes)
+        """
+        batch_len, _, height, width = input_tensor.shape
+        det = self.detector
+
+        # 1) Tam kare geçişi (büyük nesneler)
+        full_res = det.infer(input_tensor)
+        parts = [
+            DetectionBatch.result_table(r, f, m)
+            for m, results in enumerate(full_res)
+            for f, r in enumerate(results)
+        ]
+
+        # 2) Karolar
+        frame_of_tile, tile_windows = self._tiles(
+            height, width, sessions or [(None, batch_len, track_boxes)]
+        )
+
+        if len(tile_windows):
+
+            for start in range(0, len(tile_windows), self.tile_batch):
+                chunk_win = tile_windows[start:start + self.tile_batch]
+                chunk_frm = frame_of_tile[start:start + self.tile_batch]
+                tiles = torch.stack([
+                    input_tensor[f, :, y1:y2, x1:x2]
+                    for f, (x1, y1, x2, y2) in zip(chunk_frm, chunk_win)
+                ])
+                if self.upscale != 1:
+                    tiles = F.interpolate(tiles, scale_factor=self.upscale,
+                                          mode="bilinear", align_corners=False)
+
+                tile_res = det.infer(tiles)
+                offsets = input_tensor.new_tensor(chunk_win[:, :2], dtype=torch.float32)
+                frames = input_tensor.new_tensor(chunk_frm, dtype=torch.float32)
+
+                for m, results in enumerate(tile_res):
+                    for t, r in enumerate(results):
+                        table = DetectionBatch.result_table(r, 0, m)
+                        if table is None:
+                            continue
+                        # Karo koordinatı → kare koordinatı
+                        table[:, :4] /= self.upscale
+                        table[:, :4] += offsets[t].repeat(2)
+                        table[:, 6] = frames[t]
+                        parts.append(table)
+
+        parts = [p for p in parts if p is not None]
+        if not parts:
+            return DetectionBatch.empty(batch_len, det.class_names)
+
+        table = torch.cat(parts)
+        table = table[table[:, 4] >= threshold]
+        return DetectionBatch.from_table(
+            self._merge(table), batch_len, det.class_offsets, det.class_names
+        )
+
+    # ------------------------------------------------------------------ #
+    def forget(self, key):
+        """Kapanan oturumun batch sayacını sil (SharedDetector.unregister)."""
+        self.batch_counters.pop(key, None)
+
+    def _tiles(self, height, width, sessions):
+        """Oturum grupları → karo başına (kare indeksi, pencere)."""
+        keyframes = {}
+        for key, _, _ in sessions:
+            if key not in keyframes:             # oturum başına batch'te bir artar
+                count = self.batch_counters.get(key, 0)
+                keyframes[key] = count % self.keyframe_interval == 0
+                self.batch_counters[key] = count + 1
+
+        frame_of_tile, tile_windows, start = [], [], 0
+        for key, count, boxes in sessions:
+            windows = self._windows(height, width, boxes, keyframes[key])
+            frame_of_tile.append(np.repeat(np.arange(start, start + count), len(windows)))
+            tile_windows.append(np.tile(windows, (count, 1)))
+            start += count
+        return np.concatenate(frame_of_tile), np.concatenate(tile_windows)
+
+    def _windows(self, height, width, track_boxes, keyframe):
+        tile_h, tile_w = min(self.tile_h, height), min(self.tile_w, width)
+
+        if self.mode == "full" or keyframe or track_boxes is None:
+            return tile_grid(height, width, tile_h, tile_w, self.overlap)
+        return tiles_around_boxes(track_boxes, height, width, tile_h, tile_w)
+
+    def _merge(self, table):
+        """Karo sınırlarındaki yinelenen kutular: kare+model+sınıf bazında NMS."""
+        if table.shape[0] == 0:
+            return table
+        num_cls = int(table[:, 5].max().item()) + 1
+        num_models = int(table[:, 7].max().item()) + 1
+        group = (table[:, 6] * num_models + table[:, 7]) * num_cls + table[:, 5]
+        keep = batched_nms(table[:, :4], table[:, 4], group.long(), self.nms_iou)
+        return table[keep]
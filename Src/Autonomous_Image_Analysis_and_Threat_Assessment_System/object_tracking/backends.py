@@ -0,0 +1,356 @@
+# object_tracking/backends.py
+"""
+İzleyici arka uçları – ObjectTracker'ın altındaki ham iz kaynağı.
+
+Ortak arayüz (APP‑ID eşleme, etiket kilitleme, TTL belleği ObjectTracker'da kalır):
+
+    update(boxes, conf, frame) → (ids, boxes, conf)
+        boxes : (N,4) x1,y1,x2,y2 algılamalar, conf : (N,)
+        dönüş : onaylı izler – ids (K,) int, boxes (K,4) ltrb,
+                conf (K,) bu karedeki algılama güveni, eşleşmediyse NaN
+    predict(steps) → (ids, boxes, conf)
+        algılamasız kare: onaylı izleri hız bileşeniyle `steps` kare ileri
+        taşı, durum değişmez (anahtar kare planlaması için)
+    advance(steps)
+        sonraki update'ten önce: atlanan `steps` kare için Kalman tahminini
+        kare başına bir kez uygula → hız kare başına öğrenilir
+"""
+import math
+import numpy as np
+import torch
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from deep_sort_realtime.deepsort_tracker import DeepSort
+from project_utils.config import (
+    TRACKER_BACKEND, MAX_AGE, N_INIT, NMS_MAX_OVERLAP, KEYFRAME_SCHEDULING,
+    KEYFRAME_MAX_INTERVAL, MOTION_HIGH_THRESH, MOTION_NEW_TRACK_THRESH, MOTION_MATCH_IOU, MOTION_LOW_MATCH_IOU
+)
+
+
+def keyframes_for(frames):
+    """
+    Kare cinsinden eşik → anahtar kare (update) cinsinden. Anahtar kare
+    planlamasında izleyici yalnızca anahtar karelerde güncellenir; en geniş
+    aralığa (KEYFRAME_MAX_INTERVAL) göre ölçeklenir.
+    """
+    if not KEYFRAME_SCHEDULING:
+        return frames
+    return max(1, math.ceil(frames / KEYFRAME_MAX_INTERVAL))
+
+
+def make_backend(name=TRACKER_BACKEND):
+    if name == "deepsort":
+        return DeepSortBackend()
+    if name == "motion":
+        return MotionBackend()
+    raise ValueError(f"Unknown tracker backend: {name!r} (expected 'deepsort' or 'motion')")
+
+
+def _xyah_to_ltrb(xyah):
+    """(n,4) merkez x, y, en/boy oranı, yükseklik → x1,y1,x2,y2."""
+    w = xyah[:, 2] * xyah[:, 3]
+    h = xyah[:, 3]
+    return np.stack([xyah[:, 0] - w / 2, xyah[:, 1] - h / 2,
+                     xyah[:, 0] + w / 2, xyah[:, 1] + h / 2], axis=1)
+
+
+def _ltrb_to_xyah(ltrb):
+    w = ltrb[:, 2] - ltrb[:, 0]
+    h = ltrb[:, 3] - ltrb[:, 1]
+    return np.stack([ltrb[:, 0] + w / 2, ltrb[:, 1] + h / 2,
+                     w / np.maximum(h, 1e-6), h], axis=1)
+
+
+# ---------------------------------------------------------------------- #
+class DeepSortBackend:
+    """
+    deep_sort_realtime.DeepSort (görünüm özniteliği yok, embedder=None).
+
+    Yaş / kaçırma sayaçları kütüphanede update başınadır (time_since_update
+    > 1 olan iz IoU eşleşmesine alınmaz) → advance() yalnızca Kalman durumunu
+    ilerletir, max_age ve n_init anahtar kareye ölçeklenir.
+    """
+    def __init__(self, max_age=keyframes_for(MAX_AGE), n_init=keyframes_for(N_INIT),
+                 nms_max_overlap=NMS_MAX_OVERLAP):
+        self.tracker = DeepSort(
+            max_age         = max_age,
+            n_init          = n_init,
+            nms_max_overlap = nms_max_overlap,
+            embedder=None
+        )
+
+    def update(self, boxes, conf, frame):
+        ltwh = np.asarray(boxes, dtype=np.float32).copy()
+        ltwh[:, 2:] -= ltwh[:, :2]
+        ds_in = [(box, c, 0) for box, c in zip(ltwh.tolist(), np.asarray(conf).tolist())]
+
+        with torch.no_grad():
+            tracks = self.tracker.update_tracks(ds_in, frame=frame)
+
+        confirmed = [tr for tr in tracks if tr.is_confirmed()]
+        return (
+            np.array([tr.track_id for tr in confirmed]),
+            np.array([tr.to_ltrb() for tr in confirmed], dtype=np.float64).reshape(-1, 4),
+            np.array([np.nan if tr.det_conf is None else tr.det_conf for tr in confirmed],
+                     dtype=np.float64),
+        )
+
+    def advance(self, steps):
+        kf = self.tracker.tracker.kf
+        for tr in self.tracker.tracker.tracks:
+            for _ in range(steps):
+                tr.mean, tr.covariance = kf.predict(tr.mean, tr.covariance)
+
+    def predict(self, steps):
+        confirmed = [tr for tr in self.tracker.tracker.tracks if tr.is_confirmed()]
+        means = np.array([tr.mean for tr in confirmed], dtype=np.float64).reshape(-1, 8)
+        return (
+            np.array([tr.track_id for tr in confirmed]),
+            _xyah_to_ltrb(means[:, :4] + steps * means[:, 4:]),
+            np.array([np.nan if tr.det_conf is None else tr.det_conf for tr in confirmed],
+                     dtype=np.float64),
+        )
+
+
+# ---------------------------------------------------------------------- #
+class BatchKalman:
+    """
+    Deep SORT'un sabit hızlı (x, y, a, h) Kalman modeli – tüm izler için tek
+    seferde: ortalamalar (T,8), kovaryanslar (T,8,8). Gürültü ağırlıkları
+    Deep SORT ile aynıdır.
+    """
+    std_pos = 1.0 / 20
+    std_vel = 1.0 / 160
+
+    def __init__(self):
+        self.F = np.eye(8)
+        self.F[:4, 4:] = np.eye(4)
+
+    def initiate(self, xyah):
+        n = len(xyah)
+        mean = np.concatenate([xyah, np.zeros((n, 4))], axis=1)
+        h = xyah[:, 3]
+        std = np.stack([2 * self.std_pos * h, 2 * self.std_pos * h, np.full(n, 1e-2),
+                        2 * self.std_pos * h, 10 * self.std_vel * h, 10 * self.std_vel * h,
+                        np.full(n, 1e-5), 10 * self.std_vel * h], axis=1)
+        return mean, _diag(np.square(std))
+
+    def predict(self, mean, cov):
+        h = mean[:, 3]
+        n = len(mean)
+        std = np.stack([self.std_pos * h, self.std_pos * h, np.full(n, 1e-2), self.std_pos * h,
+                        self.std_vel * h, self.std_vel * h, np.full(n, 1e-5), self.std_vel * h],
+                       axis=1)
+        mean = mean @ self.F.T
+        cov = self.F @ cov @ self.F.T + _diag(np.square(std))
+        return mean, cov
+
+    def update(self, mean, cov, xyah):
+        h = mean[:, 3]
+        n = len(mean)
+        std = np.stack([self.std_pos * h, self.std_pos * h, np.full(n, 1e-1), self.std_pos * h],
+                       axis=1)
+        S = cov[:, :4, :4] + _diag(np.square(std))          # (n,4,4) yenilik kovaryansı
+        PHt = cov[:, :, :4]                                  # (n,8,4)
+        K = np.linalg.solve(S, PHt.transpose(0, 2, 1)).transpose(0, 2, 1)   # (n,8,4)
+        innovation = xyah - mean[:, :4]
+        mean = mean + np.einsum("nij,nj->ni", K, innovation)
+        cov = cov - K @ S @ K.transpose(0, 2, 1)
+        return mean, cov
+
+
+def _diag(values):
+    out = np.zeros(values.shape + values.shape[-1:])
+    idx = np.arange(values.shape[-1])
+    out[:, idx, idx] = values
+    return out
+
+
+class MotionBackend:
+    """
+    Yalnızca hareket tabanlı, tamamen numpy izleyici (SORT / ByteTrack tarzı).
+
+    • Tüm izler tek BatchKalman çağrısıyla tahmin / düzeltme
+    • İki aşamalı Macar eşleştirmesi (scipy linear_sum_assignment, 1‑IoU):
+      önce yüksek güvenli algılamalar tüm izlerle, sonra düşük güvenliler
+      yalnızca onaylı ve eşleşmemiş izlerle (ByteTrack) – kısa örtülmelerde
+      iz düşmez
+    • Yoğun T×N IoU matrisi kurulmaz: x eksenine göre sıralı tarama ile
+      yalnızca örtüşebilecek çiftler, eşik altı çiftler atılır, Macar
+      algoritması bağlı bileşen başına çalışır (çoğu bileşen tek çift)
+    • Yeni iz yalnızca eşleşmemiş, yeterince güvenli algılamadan; n_init
+      isabetle onaylanır, onaysız iz ilk kaçırmada, onaylı iz max_age
+      kare sonra silinir (Deep SORT ile aynı yaşam döngüsü). advance()
+      atlanan kareleri de kaçırma sayar → max_age kare cinsinden kalır,
+      yalnızca n_init (isabet) anahtar kareye ölçeklenir
+    """
+    def __init__(self, max_age=MAX_AGE, n_init=keyframes_for(N_INIT), high_thresh=MOTION_HIGH_THRESH,
+                 new_track_thresh=MOTION_NEW_TRACK_THRESH, match_iou=MOTION_MATCH_IOU,
+                 low_match_iou=MOTION_LOW_MATCH_IOU):
+        self.max_age = max_age
+        self.n_init = n_init
+        self.high_thresh = high_thresh
+        self.new_track_thresh = new_track_thresh
+        self.match_iou = match_iou
+        self.low_match_iou = low_match_iou
+
+        self.kf = BatchKalman()
+        self.next_id = 1
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros((0, 8))
+        self.cov = np.zeros((0, 8, 8))
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.misses = np.zeros(0, dtype=np.int64)       # son güncellemeden beri kare
+        self.confirmed = np.zeros(0, dtype=bool)
+        self.det_conf = np.zeros(0)
+
+    def update(self, boxes, conf, frame=None):
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        conf = np.asarray(conf, dtype=np.float64).reshape(-1)
+
+        # 1) Tahmin
+        if len(self.ids):
+            self.mean, self.cov = self.kf.predict(self.mean, self.cov)
+        self.misses += 1
+        self.det_conf = np.full(len(self.ids), np.nan)
+
+        # 2) İki aşamalı eşleştirme
+        high = np.flatnonzero(conf >= self.high_thresh)
+        low = np.flatnonzero(conf < self.high_thresh)
+        tracks = np.arange(len(self.ids))
+        pred = _xyah_to_ltrb(self.mean[:, :4])
+
+        m1, tracks_left, high_left = _match(pred, boxes, tracks, high, self.match_iou)
+        second = tracks_left[self.confirmed[tracks_left]]
+        m2, _, _ = _match(pred, boxes, second, low, self.low_match_iou)
+        matches = m1 + m2
+
+        # 3) Düzeltme
+        if matches:
+            t_idx = np.array([t for t, _ in matches])
+            d_idx = np.array([d for _, d in matches])
+            self.mean[t_idx], self.cov[t_idx] = self.kf.update(
+                self.mean[t_idx], self.cov[t_idx], _ltrb_to_xyah(boxes[d_idx])
+            )
+            self.hits[t_idx] += 1
+            self.misses[t_idx] = 0
+            self.det_conf[t_idx] = conf[d_idx]
+            self.confirmed |= self.hits >= self.n_init
+
+        # 4) Silme: onaysız → ilk kaçırmada, onaylı → max_age sonra
+        alive = np.where(self.confirmed, self.misses <= self.max_age, self.misses == 0)
+        self._keep(alive)
+
+        # 5) Yeni izler
+        new = high_left[conf[high_left] >= self.new_track_thresh]
+        if len(new):
+            self._spawn(boxes[new], conf[new])
+
+        sel = self.confirmed
+        return self.ids[sel], _xyah_to_ltrb(self.mean[sel, :4]), self.det_conf[sel]
+
+    def advance(self, steps):
+        for _ in range(steps if len(self.ids) else 0):
+            self.mean, self.cov = self.kf.predict(self.mean, self.cov)
+        self.misses += steps
+
+    def predict(self, steps):
+        sel = self.confirmed
+        mean = self.mean[sel]
+        return self.ids[sel], _xyah_to_ltrb(mean[:, :4] + steps * mean[:, 4:]), self.det_conf[sel]
+
+    # ------------------------------------------------------------------ #
+    def _keep(self, mask):
+        for name in ("ids", "mean", "cov", "hits", "misses", "confirmed", "det_conf"):
+            setattr(self, name, getattr(self, name)[mask])
+
+    def _spawn(self, boxes, conf):
+        n = len(boxes)
+        mean, cov = self.kf.initiate(_ltrb_to_xyah(boxes))
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + n)])
+        self.next_id += n
+        self.mean = np.concatenate([self.mean, mean])
+        self.cov = np.concatenate([self.cov, cov])
+        self.hits = np.concatenate([self.hits, np.ones(n, dtype=np.int64)])
+        self.misses = np.concatenate([self.misses, np.zeros(n, dtype=np.int64)])
+        self.confirmed = np.concatenate([self.confirmed, np.full(n, self.n_init <= 1)])
+        self.det_conf = np.concatenate([self.det_conf, conf])
+
+
+_NO_MATCH = 1e6      # bileşen içi, eşik altı çiftin maliyeti
+
+
+def _candidate_pairs(a, b):
+    """
+    a:(n,4), b:(m,4) → x aralıkları örtüşebilecek (i, j) çiftleri. b, x1'e göre
+    sıralanır; a[i] için b.x1 ∈ [a.x1 − en geniş b, a.x2) aralığı ikili aramayla.
+    """
+    order = np.argsort(b[:, 0], kind="stable")
+    x1 = b[order, 0]
+    max_w = (b[:, 2] - b[:, 0]).max()
+    lo = np.searchsorted(x1, a[:, 0] - max_w, side="left")
+    hi = np.searchsorted(x1, a[:, 2], side="left")
+    counts = np.maximum(hi - lo, 0)
+
+    i = np.repeat(np.arange(len(a)), counts)
+    step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    j = order[np.repeat(lo, counts) + step]
+    return i, j
+
+
+def _pair_iou(a, b):
+    """a, b:(K,4) → (K,) satır satır IoU (box_iou ile aynı tanım)."""
+    wh = np.clip(np.minimum(a[:, 2:], b[:, 2:]) - np.maximum(a[:, :2], b[:, :2]), 0, None)
+    inter = wh[:, 0] * wh[:, 1]
+    union = ((a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1]) +
+             (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]) - inter)
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def _match(pred, boxes, tracks, dets, min_iou):
+    """
+    Eşikli Macar eşleştirmesi (maliyet 1‑IoU, IoU < min_iou çiftler yasak).
+    Dönüş: ([(iz, algılama)], kalan izler, kalan algılamalar) – indeksler tam
+    diziler üzerindedir.
+    """
+    if len(tracks) == 0 or len(dets) == 0:
+        return [], tracks, dets
+
+    a, b = pred[tracks], boxes[dets]
+    i, j = _candidate_pairs(a, b)
+    iou = _pair_iou(a[i], b[j])
+    ok = iou >= min_iou
+    i, j, iou = i[ok], j[ok], iou[ok]
+    if len(i) == 0:
+        return [], tracks, dets
+
+    # İz + algılama düğümleri, eşik üstü çiftler kenar → bağlı bileşenler
+    n = len(tracks)
+    graph = coo_matrix((np.ones(len(i)), (i, n + j)), shape=(n + len(dets),) * 2)
+    _, comp = connected_components(graph, directed=False)
+    edge_comp = comp[i]
+    edges_per_comp = np.bincount(edge_comp)
+
+    single = edges_per_comp[edge_comp] == 1          # tek kenarlı bileşen → doğrudan eşleşme
+    rows, cols = [i[single]], [j[single]]
+
+    # Çok kenarlı bileşenler: kenarları bileşene göre sırala, dilim dilim çöz
+    multi = np.flatnonzero(~single)
+    multi = multi[np.argsort(edge_comp[multi], kind="stable")]
+    bounds = np.flatnonzero(np.diff(edge_comp[multi])) + 1
+    for sel in np.split(multi, bounds) if len(multi) else ():
+        ti, tr = np.unique(i[sel], return_inverse=True)
+        dj, dc = np.unique(j[sel], return_inverse=True)
+        cost = np.full((len(ti), len(dj)), _NO_MATCH)
+        cost[tr, dc] = 1.0 - iou[sel]
+        r, k = linear_sum_assignment(cost)
+        valid = cost[r, k] < _NO_MATCH
+        rows.append(ti[r[valid]])
+        cols.append(dj[k[valid]])
+
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    matches = list(zip(tracks[rows].tolist(), dets[cols].tolist()))
+    return (matches,
+            np.delete(tracks, rows),
+            np.delete(dets, cols))
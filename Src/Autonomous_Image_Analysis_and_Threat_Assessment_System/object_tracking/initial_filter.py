@@ -0,0 +1,43 @@
+# object_tracking/initial_filter.py
+import numpy as np
+
+
+class InitialObjectFilter:
+    """
+    Başlangıç nesne filtresi: ilk `frame_count` karede görülen APP‑ID'ler
+    toplanır, sonrasında yalnızca bu nesneler raporlanır; sahneye sonradan
+    giren nesneler tamamen yok sayılır.
+    """
+    def __init__(self, frame_count=10):
+        self.frame_count = frame_count          # ilk N kare
+        self.start_frame = 0                    # arama (seek) sonrası pencere başı
+        self.object_ids = set()
+        self.id_array = None                    # pencere kapanınca: sıralı ID dizisi
+        self.done = False
+
+    def reset(self, start_frame=0):
+        self.start_frame = start_frame
+        self.object_ids.clear()
+        self.id_array = None
+        self.done = False
+
+    def in_window(self, frame_number):
+        """Kare, ID toplama penceresinde mi?"""
+        return frame_number < self.start_frame + self.frame_count
+
+    def apply(self, frame_number, tracks):
+        """tracks: TrackTable → süzülmüş TrackTable."""
+        # İlk N karede görülen ID’leri topla
+        if not self.done:
+            self.object_ids.update(tracks.track_id.tolist())
+            if not self.in_window(frame_number + 1):
+                self.done = True
+                self.id_array = np.array(sorted(self.object_ids), dtype=np.int64)
+
+        # Yeni nesneleri tamamen yok say
+        if self.done:
+            tracks = tracks.select(np.isin(tracks.track_id, self.id_array))
+        return tracks
+
+    def allows(self, track_id):
+        return not self.done or track_id in self.object_ids
@@ -0,0 +1,89 @@
+# object_tracking/lifecycle.py
+import threading
+from collections import OrderedDict
+from project_utils.config import TRACK_RETENTION_FRAMES, TRACK_STATE_MAX_IDS, TRACK_GC_INTERVAL
+
+
+class TrackLifecycleManager:
+    """
+    APP‑ID yaşam döngüsü: ölü izlerin durumunu tüm bileşenlerden tek yerden
+    emekli eder (ObjectTracker eşlemeleri, ThreatAssessment geçmişleri,
+    GUI object_statuses …).
+
+    • observe(app_ids) her işlenen karede izleyicinin ham çıktısıyla çağrılır
+      (başlangıç filtresinden önce – gizlenen izler de izleyicide yer tutar)
+    • `retention` kare boyunca görünmeyen APP‑ID ölü sayılır. Onaylı bir iz
+      kaçırmalarda da (max_age boyunca) raporlandığından süre kare numarası
+      değil gözlem sayacıyla ölçülür – atlama (seek) sonrası da doğru çalışır
+    • Bellek tavanı: canlı ID sayısı `max_ids`'i aşarsa en uzun süredir
+      görünmeyenler hemen emekli edilir (yaşıyor olsalar bile; izleyici
+      onlara yeni APP‑ID verir)
+    • Son görülme sırası OrderedDict'te tutulur → tarama yalnızca emekli
+      edilenler kadar sürer, tüm sözlük dolaşılmaz
+
+    Bileşenler register(retire) ile kaydolur; retire(app_ids) çağrılır.
+    deferred=True → ID'ler biriktirilir, sahibinin iş parçacığında drain()
+    ile teslim edilir (ör. izleme iş parçacığı gözlemler, GUI durumları
+    Qt ana iş parçacığında silinir).
+    """
+    def __init__(self, retention=TRACK_RETENTION_FRAMES, max_ids=TRACK_STATE_MAX_IDS,
+                 interval=TRACK_GC_INTERVAL):
+        self.retention = retention
+        self.max_ids = max_ids
+        self.interval = max(1, interval)
+
+        self.last_seen = OrderedDict()     # app_id → gözlem sayacı (eskiden yeniye)
+        self.tick = 0
+        self.retired = 0                   # toplam emekli edilen ID (istatistik)
+
+        self.callbacks = []                # hemen çağrılanlar
+        self.deferred = []                 # drain() ile çağrılanlar
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def register(self, retire, deferred=False):
+        (self.deferred if deferred else self.callbacks).append(retire)
+
+    # ------------------------------------------------------------------ #
+    def observe(self, app_ids):
+        self.tick += 1
+        last_seen = self.last_seen
+        for app_id in app_ids:
+            last_seen[app_id] = self.tick
+            last_seen.move_to_end(app_id)
+
+        if self.tick % self.interval == 0 or len(last_seen) > self.max_ids:
+            self.collect()
+
+    def collect(self):
+        """Süresi dolan ve tavanı aşan ID'leri emekli et → emekli ID listesi."""
+        cutoff = self.tick - self.retention
+        last_seen = self.last_seen
+        dead = []
+        while last_seen:
+            app_id, seen = next(iter(last_seen.items()))
+            if seen > cutoff and len(last_seen) <= self.max_ids:
+                break
+            last_seen.popitem(last=False)
+            dead.append(app_id)
+
+        if dead:
+            self.retired += len(dead)
+            for retire in self.callbacks:
+                retire(dead)
+            if self.deferred:
+                with self.lock:
+                    self.pending.update(dead)
+        return dead
+
+    def drain(self):
+        """Bekleyen emeklilikleri ertelenmiş bileşenlere teslim et (sahibinin iş parçacığında)."""
+        if not self.pending:
+            return
+        with self.lock:
+            dead, self.pending = self.pending, set()
+        for retire in self.deferred:
+            retire(dead)
+
+    def __len__(self):
+        return len(self.last_seen)
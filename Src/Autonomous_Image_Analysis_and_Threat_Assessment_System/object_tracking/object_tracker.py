@@ -1,8 +1,11 @@
 # object_tracking/object_tracker.py
 import torch, math
+import numpy as np
 from collections import Counter, deque
-from deep_sort_realtime.deepsort_tracker import DeepSort
-from project_utils.config import MAX_AGE, N_INIT, NMS_MAX_OVERLAP
+from object_detection.suppression import box_iou
+from object_tracking.backends import make_backend
+from object_tracking.track_table import TrackTable
+from project_utils.config import TRACKER_BACKEND
 
 # ------------------------------- AYARLAR ------------------------------------ #
 HISTORY       = 3    # Merkez eşleştirmesi için kaç kare geriye bakılsın?
@@ -10,26 +13,16 @@ MAJORITY_WIN  = 5    # Etiketi sabitlemek için pencere boyu
 KEEP_MISSES   = 5    # Algılama kaybolduktan sonra kaç kare kutu kalsın?
 
 # ----------------------------- Yardımcılar ---------------------------------- #
-def _bbox_center(ltrb):
-    return (ltrb[0] + ltrb[2]) * 0.5, (ltrb[1] + ltrb[3]) * 0.5
-
-def _center_in_box(center, box):
-    cx, cy = center
-    return box[0] <= cx <= box[2] and box[1] <= cy <= box[3]
-
-def _iou(b1, b2):
-    xa, ya = max(b1[0], b2[0]), max(b1[1], b2[1])
-    xb, yb = min(b1[2], b2[2]), min(b1[3], b2[3])
-    inter  = max(0, xb - xa) * max(0, yb - ya)
-    if inter == 0: return 0.0
-    a1 = (b1[2]-b1[0]) * (b1[3]-b1[1])
-    a2 = (b2[2]-b2[0]) * (b2[3]-b2[1])
-    return inter / (a1 + a2 - inter)
+def _centers_in_boxes(centers, boxes):
+    """centers:(K,2), boxes:(H,4) → (K,H) bool – merkez kutunun içinde (sınır dahil)."""
+    cx, cy = centers[:, 0:1], centers[:, 1:2]
+    return ((boxes[None, :, 0] <= cx) & (cx <= boxes[None, :, 2]) &
+            (boxes[None, :, 1] <= cy) & (cy <= boxes[None, :, 3]))
 
 # --------------------------------------------------------------------------- #
 class ObjectTracker:
     """
-    • Deep SORT izleri  
+    • Ham izler değiştirilebilir arka uçtan (Deep SORT | numpy hareket izleyici)  
     • Sınıf bağımsız eşleştirme (YOLO class=0)  
     • Merkez‑içinde kuralı (HISTORY kare)  
     • Algılama kaybolursa TTL=KEEP_MISSES kare daha kutuyu koru
@@ -37,134 +30,213 @@ class ObjectTracker:
     def __init__(self,
                  history:int      = HISTORY,
                  majority:int     = MAJORITY_WIN,
-                 keep_misses:int  = KEEP_MISSES):
+                 keep_misses:int  = KEEP_MISSES,
+                 backend:str      = TRACKER_BACKEND):
 
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        self.tracker = DeepSort(
-            max_age         = MAX_AGE,
-            n_init          = N_INIT,
-            nms_max_overlap = NMS_MAX_OVERLAP,
-            embedder=None
-        )
-
+        self.history      = history
         self.next_app_id  = 1
-        self.deep2app_id  = {}       # deep_id → app_id
-        self.track_meta   = {}       # deep_id → {'labels':Counter,'best':str}
-
-        self.prev_tracks  = deque(maxlen=history)   # merkez eşleştirmesi
-        self.memory       = {}       # app_id → {'bbox', 'cls', 'ttl'}
-
         self.majority_win = majority
         self.keep_misses  = keep_misses
+        self.backend_name = backend
 
-    # ------------------------------------------------------------------ #
-    def update_tracks(self, detections, frame):
+        # Sınıf adı tablosu – TrackTable.label buna indeks; yalnızca büyür,
+        # üretilen tüm tablolar aynı listeyi paylaşır
+        self.labels       = []
+        self.label_index  = {}
+        self.reset()
+
+    def reset(self):
         """
-        detections = [{'bbox':[x1,y1,x2,y2],'conf':0.9,'cls':'Tank'}, ...]
+        İz durumunu sıfırla (ör. videoda atlama sonrası). APP‑ID sayacı
+        sürer; yeni izler eski ID'lerle çakışmaz.
         """
-        # 1) Deep SORT girişini hazırla (class=0)
-        ds_in, det_boxes, det_labels = [], [], []
-        for det in detections:
-            x1,y1,x2,y2 = det['bbox']
-            w, h        = x2 - x1, y2 - y1
-            ds_in.append(([x1, y1, w, h], det['conf'], 0))
-            det_boxes.append([x1, y1, x2, y2])
-            det_labels.append(det['cls'])
-
-        # 2) Deep SORT güncelle
-        with torch.no_grad():
-            tracks = self.tracker.update_tracks(ds_in, frame=frame)
-
-        tracked_objects  = []
-        updated_app_ids  = set()   # bu karede gerçek algılamayla güncellenenler
-
-        # 3) Onaylı izler → APP‑ID çöz, etiket güncelle
-        for tr in tracks:
-            if not tr.is_confirmed():
-                continue
+        self.tracker = make_backend(self.backend_name)
 
-            deep_id = tr.track_id
-            ltrb    = tr.to_ltrb()
-            app_id  = self._resolve_app_id(deep_id, ltrb)
-            label   = self._update_label(deep_id, ltrb, det_boxes, det_labels)
+        self.deep2app_id  = {}       # deep_id → app_id
+        self.track_meta   = {}       # deep_id → {'labels':Counter,'best':str}
 
-            bbox_int = [int(v) for v in ltrb]
-            conf_val = round(tr.det_conf or 0.0, 2)
+        self.prev_tracks  = deque(maxlen=self.history)   # merkez eşleştirmesi: (kutular (n,4), app_id'ler (n,))
+        self.memory       = {}       # app_id → {'bbox', 'label' (kod), 'ttl'}
 
-            tracked_objects.append({
-                'track_id': app_id,
-                'bbox'    : bbox_int,
-                'cls'     : label,
-                'conf'    : conf_val
-            })
-            updated_app_ids.add(app_id)
+        self.coast_steps  = 0        # son algılamalı kareden bu yana atlanan kare
 
-            # Bellekte TTL sıfırla
-            self.memory[app_id] = {'bbox': bbox_int, 'cls': label,
-                                   'ttl': self.keep_misses}
+    # ------------------------------------------------------------------ #
+    def update_tracks(self, detections, frame):
+        """
+        detections = FrameDetections (boxes:(N,4) x1y1x2y2, conf:(N,), labels)
+        Dönüş: TrackTable (onaylı izler + TTL belleğindeki kayıp izler)
+        """
+        # 1–2) Arka ucu güncelle (sınıf bağımsız) → onaylı izler. Önce atlanan
+        # kareler için Kalman kare kare ilerletilir; hız kare başına kalır ve
+        # coast()'un steps × hız tahmini doğru olur
+        if self.coast_steps:
+            self.tracker.advance(self.coast_steps)
+        det_boxes  = detections.boxes
+        det_labels = detections.labels
+        deep_ids, tr_boxes, tr_conf = self.tracker.update(det_boxes, detections.conf, frame)
+        deep_ids = deep_ids.tolist()
+        self.coast_steps = 0
+
+        # 3) Onaylı izler → APP‑ID çöz, etiket güncelle (tüm izler tek seferde)
+        app_ids = np.asarray(self._resolve_app_ids(deep_ids, tr_boxes), dtype=np.int64)
+        codes   = self._update_labels(deep_ids, tr_boxes, det_boxes, det_labels)
+        boxes   = tr_boxes.astype(np.int32)                  # int() gibi sıfıra doğru kırpar
+        confs   = np.round(np.nan_to_num(tr_conf, nan=0.0), 2).astype(np.float32)
+
+        # Bellekte TTL sıfırla
+        for app_id, bbox, code in zip(app_ids.tolist(), boxes.tolist(), codes.tolist()):
+            self.memory[app_id] = {'bbox': bbox, 'label': code, 'ttl': self.keep_misses}
 
         # 4) Güncellenmeyen (algılaması kaçan) izler için TTL düşür
+        updated = set(app_ids.tolist())      # bu karede gerçek algılamayla güncellenenler
+        missing = []
         for app_id in list(self.memory):
-            if app_id in updated_app_ids:
+            if app_id in updated:
                 continue
             self.memory[app_id]['ttl'] -= 1
             if self.memory[app_id]['ttl'] > 0:
-                tracked_objects.append({
-                    'track_id': app_id,
-                    'bbox'    : self.memory[app_id]['bbox'],
-                    'cls'     : self.memory[app_id]['cls'],
-                    'conf'    : 0.0               # bu karede algılama yok
-                })
+                missing.append(app_id)
             else:
                 del self.memory[app_id]          # TTL bitti → sil
 
         # 5) Merkez eşleştirmesi için bu kareyi kaydet
-        frame_tracks = {
-            tr.track_id: {'bbox': tr.to_ltrb(), 'app_id': self.deep2app_id[tr.track_id]}
-            for tr in tracks if tr.is_confirmed()
-        }
-        self.prev_tracks.append(frame_tracks)
+        self.prev_tracks.append((tr_boxes, app_ids))
 
-        return tracked_objects
+        return self._table(app_ids, boxes, confs, codes, missing)
 
     # ------------------------------------------------------------------ #
-    def _resolve_app_id(self, deep_id, ltrb_new):
-        if deep_id in self.deep2app_id:
-            return self.deep2app_id[deep_id]
-
-        center_new = _bbox_center(ltrb_new)
-        for past in reversed(self.prev_tracks):        # en yeni → eski
-            for prev_id, info in past.items():
-                if _center_in_box(center_new, info['bbox']):
-                    self.deep2app_id[deep_id] = info['app_id']
-                    return info['app_id']
-
-        # Yeni APP‑ID
-        self.deep2app_id[deep_id] = self.next_app_id
-        self.next_app_id         += 1
-        return self.deep2app_id[deep_id]
+    def coast(self):
+        """
+        Dedektörün çalışmadığı kare: onaylı izlerin kutularını Kalman hız
+        bileşeniyle ileri taşı. Arka uç durumu (yaş, kaçırma sayacı)
+        değiştirilmez, bellek TTL'leri düşürülmez.
+        """
+        self.coast_steps += 1
+        deep_ids, boxes, confs = self.tracker.predict(self.coast_steps)
+
+        rows, app_ids, codes = [], [], []
+        seen = set()
+        unknown = self._label_code("Unknown")
+        for k, deep_id in enumerate(deep_ids.tolist()):
+            app_id = self.deep2app_id.get(deep_id)
+            if app_id is None or app_id in seen:
+                continue
+            rows.append(k)
+            app_ids.append(app_id)
+            seen.add(app_id)
+            label = self.track_meta.get(deep_id, {}).get('label')
+            codes.append(self._label_code(label) if label else unknown)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        boxes = boxes[rows].astype(np.int32)
+        confs = np.round(np.nan_to_num(confs[rows], nan=0.0), 2).astype(np.float32)
+
+        for app_id, bbox in zip(app_ids.tolist(), boxes.tolist()):
+            if app_id in self.memory:
+                self.memory[app_id]['bbox'] = bbox
+
+        missing = [app_id for app_id in self.memory if app_id not in seen]
+        return self._table(app_ids, boxes, confs, np.asarray(codes, dtype=np.int16), missing)
+
+    def _table(self, app_ids, boxes, confs, codes, missing):
+        """Canlı izler + bellekteki kayıp izler (conf=0) → TrackTable."""
+        if missing:
+            mem = [self.memory[app_id] for app_id in missing]
+            app_ids = np.concatenate([app_ids, np.asarray(missing, dtype=np.int64)])
+            boxes = np.concatenate([boxes, np.array([m['bbox'] for m in mem], dtype=np.int32)])
+            confs = np.concatenate([confs, np.zeros(len(mem), dtype=np.float32)])
+            codes = np.concatenate([codes, np.array([m['label'] for m in mem], dtype=np.int16)])
+        return TrackTable(app_ids, boxes.reshape(-1, 4), confs, codes, self.labels)
+
+    def _label_code(self, name):
+        code = self.label_index.get(name)
+        if code is None:
+            code = self.label_index[name] = len(self.labels)
+            self.labels.append(name)
+        return code
 
     # ------------------------------------------------------------------ #
-    def _update_label(self, deep_id, tr_box, det_boxes, det_labels):
-        meta = self.track_meta.setdefault(deep_id, {'label': None})
-
-        # 1) Etiket zaten kilitlenmişse doğrudan dön
-        if meta['label'] is not None:
-            return meta['label']
-
-        # 2) İlk kez tanışıyoruz → en yüksek IoU’lu algılamayı seç
-        best_lbl, best_iou = None, 0.0
-        for box, lbl in zip(det_boxes, det_labels):
-            iou = _iou(tr_box, box)
-            if iou > best_iou:
-                best_iou, best_lbl = iou, lbl
+    def retire_tracks(self, app_ids):
+        """
+        Ölü APP‑ID'lerin durumunu sil (TrackLifecycleManager, izleme iş
+        parçacığında): deep_id eşlemeleri, etiket kilitleri, TTL belleği ve
+        merkez eşleştirme geçmişi. Geçmişte kalsaydı hâlâ yaşayan (tavan
+        nedeniyle emekli edilen) iz eski APP‑ID'sine geri bağlanırdı.
+        """
+        app_ids = set(app_ids)
+        dead = [d for d, a in self.deep2app_id.items() if a in app_ids]
+        for deep_id in dead:
+            del self.deep2app_id[deep_id]
+            self.track_meta.pop(deep_id, None)
+        for app_id in app_ids:
+            self.memory.pop(app_id, None)
+
+        retired = np.fromiter(app_ids, dtype=np.int64, count=len(app_ids))
+        for k, (boxes, ids) in enumerate(self.prev_tracks):
+            keep = ~np.isin(ids, retired)
+            if not keep.all():
+                self.prev_tracks[k] = (boxes[keep], ids[keep])
 
-        # En azından bir eşleşme bulunduysa kilitle
-        if best_lbl:
-            meta['label'] = best_lbl
-            return best_lbl
+    # ------------------------------------------------------------------ #
+    def active_boxes(self):
+        """Bellekteki (TTL'i dolmamış) tüm izlerin son kutuları → (M,4)."""
+        return np.array([m['bbox'] for m in self.memory.values()],
+                        dtype=np.float32).reshape(-1, 4)
 
-        # Hiç eşleşme yoksa (nadir) 'Unknown' ile kilitle
-        meta['label'] = "Unknown"
-        return "Unknown"
+    # ------------------------------------------------------------------ #
+    def _resolve_app_ids(self, deep_ids, tr_boxes):
+        """
+        Yeni deep_id'ler için APP‑ID: merkezi, son HISTORY karedeki bir izin
+        kutusuna düşüyorsa o izin APP‑ID'si (en yeni kare önce, kare içinde
+        kayıt sırası) – tüm yeni izler × tüm geçmiş kutular tek maske.
+        """
+        new = [i for i, d in enumerate(deep_ids) if d not in self.deep2app_id]
+        if new and self.prev_tracks:
+            past = list(reversed(self.prev_tracks))            # en yeni → eski
+            hist_boxes = np.concatenate([boxes for boxes, _ in past])
+            hist_ids   = np.concatenate([ids for _, ids in past])
+        else:
+            hist_boxes, hist_ids = np.zeros((0, 4)), np.zeros(0, dtype=np.int64)
+
+        if new and len(hist_ids):
+            boxes   = tr_boxes[new]
+            centers = (boxes[:, :2] + boxes[:, 2:]) * 0.5
+            inside  = _centers_in_boxes(centers, hist_boxes)
+            first   = inside.argmax(axis=1)                  # ilk eşleşme
+            matched = inside[np.arange(len(new)), first]
+        else:
+            first = matched = np.zeros(len(new), dtype=bool)
+
+        for k, i in enumerate(new):
+            if matched[k]:
+                self.deep2app_id[deep_ids[i]] = int(hist_ids[first[k]])
+            else:                                            # yeni APP‑ID
+                self.deep2app_id[deep_ids[i]] = self.next_app_id
+                self.next_app_id += 1
+
+        return [self.deep2app_id[d] for d in deep_ids]
 
+    # ------------------------------------------------------------------ #
+    def _update_labels(self, deep_ids, tr_boxes, det_boxes, det_labels):
+        """
+        Etiket iz başına bir kez kilitlenir: ilk görüldüğünde en yüksek
+        IoU'lu algılamanın etiketi, hiç örtüşme yoksa 'Unknown'. Yeni izler
+        × algılamalar tek IoU matrisiyle eşleştirilir. Dönüş: etiket kodları (n,).
+        """
+        new = [i for i, d in enumerate(deep_ids)
+               if self.track_meta.setdefault(d, {'label': None})['label'] is None]
+
+        if new and len(det_boxes):
+            iou  = box_iou(tr_boxes[new], np.asarray(det_boxes, dtype=np.float64))
+            best = iou.argmax(axis=1)
+            for k, i in enumerate(new):
+                lbl = det_labels[best[k]] if iou[k, best[k]] > 0 else None
+                self.track_meta[deep_ids[i]]['label'] = lbl or "Unknown"
+        else:
+            for i in new:
+                self.track_meta[deep_ids[i]]['label'] = "Unknown"
+
+        return np.array([self._label_code(self.track_meta[d]['label']) for d in deep_ids],
+                        dtype=np.int16)
@@ -0,0 +1,141 @@
+# object_tracking/track_table.py
+import numpy as np
+
+# Durum kodları (status sütunu, NPZ çıktısı ve önbellekle aynı sıra)
+STATUS_NAMES = ("unknown", "friend", "foe")
+UNKNOWN, FRIEND, FOE = range(3)
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+class TrackTable:
+    """
+    Bir karenin izleri – sütunlu (struct‑of‑arrays). İzleyici kare başına bir
+    kez yazar; bölge sınıflandırıcı, tehdit skorlayıcı, nesne tablosu ve
+    çizim aynı dizileri okur – sözlük / dataclass dönüşümü yok.
+
+    track_id (n,)   int   APP‑ID
+    bbox     (n,4)  int   x1, y1, x2, y2 (piksel)
+    conf     (n,)   float bu karedeki algılama güveni (0 → algılama yok)
+    label    (n,)   int   → labels listesine indeks (izleyicinin paylaşılan etiket tablosu)
+    status   (n,)   int8  STATUS_NAMES indeksi (bölge / operatör ataması)
+    threat   (n,)   float tehdit skoru (NaN → hesaplanmadı)
+
+    Sütunlar salt okunur kabul edilir (önbellekten gelen mmap görünümleri
+    olabilir); status / threat sütunları üreticileri tarafından yeniden atanır.
+    """
+    __slots__ = ("track_id", "bbox", "conf", "label", "labels", "status", "threat")
+
+    def __init__(self, track_id, bbox, conf, label, labels, status=None, threat=None):
+        n = len(track_id)
+        self.track_id = track_id
+        self.bbox = bbox
+        self.conf = conf
+        self.label = label
+        self.labels = labels
+        self.status = np.zeros(n, dtype=np.int8) if status is None else status
+        self.threat = np.full(n, np.nan) if threat is None else threat
+
+    @classmethod
+    def empty(cls, labels=()):
+        return cls(np.zeros(0, dtype=np.int64), np.zeros((0, 4), dtype=np.int32),
+                   np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int16), list(labels))
+
+    def __len__(self):
+        return len(self.track_id)
+
+    def __iter__(self):
+        for i in range(len(self.track_id)):
+            yield TrackRow(self, i)
+
+    def select(self, index):
+        """Maske ya da indeks dizisiyle alt tablo (aynı etiket tablosu)."""
+        return TrackTable(self.track_id[index], self.bbox[index], self.conf[index],
+                          self.label[index], self.labels, self.status[index], self.threat[index])
+
+    # ------------------------------------------------------------------ #
+    @property
+    def cls(self):
+        """Satır başına sınıf adı listesi."""
+        labels = self.labels
+        return [labels[i] for i in self.label.tolist()]
+
+    def label_values(self, table, default=0.0):
+        """Sınıf adı → değer sözlüğünü satırlara yay (ör. tehdit katsayısı) → (n,)."""
+        per_label = np.array([table.get(name, default) for name in self.labels], dtype=np.float64)
+        return per_label[self.label] if len(per_label) else np.zeros(len(self), dtype=np.float64)
+
+    def centers(self):
+        """Kutu merkezleri (n,2) float, piksel."""
+        bbox = self.bbox
+        return (bbox[:, :2] + bbox[:, 2:]) * 0.5
+
+    def zone_status(self, friendly_zones=(), enemy_zones=()):
+        """
+        Bölge sınıflandırıcı: tamsayı merkez dost bölgesindeyse FRIEND,
+        değilse düşman bölgesindeyse FOE, aksi hâlde UNKNOWN → (n,) int8.
+        """
+        bbox = self.bbox
+        cx = (bbox[:, 0] + bbox[:, 2]) // 2
+        cy = (bbox[:, 1] + bbox[:, 3]) // 2
+        codes = np.full(len(self), UNKNOWN, dtype=np.int8)
+        codes[_in_any(cx, cy, enemy_zones)] = FOE
+        codes[_in_any(cx, cy, friendly_zones)] = FRIEND      # dost bölgesi önceliklidir
+        return codes
+
+    def hit(self, x, y):
+        """Noktayı içeren ilk satırın indeksi, yoksa None."""
+        bbox = self.bbox
+        rows = np.flatnonzero((bbox[:, 0] <= x) & (x <= bbox[:, 2]) &
+                              (bbox[:, 1] <= y) & (y <= bbox[:, 3]))
+        return int(rows[0]) if len(rows) else None
+
+    def overlapping(self, x1, y1, x2, y2):
+        """Dikdörtgenle kesişen satırların indeksleri."""
+        bbox = self.bbox
+        return np.flatnonzero(~((x2 < bbox[:, 0]) | (x1 > bbox[:, 2]) |
+                                (y2 < bbox[:, 1]) | (y1 > bbox[:, 3])))
+
+
+def _in_any(cx, cy, zones):
+    inside = np.zeros(len(cx), dtype=bool)
+    for zx1, zy1, zx2, zy2 in zones:
+        inside |= (zx1 <= cx) & (cx <= zx2) & (zy1 <= cy) & (cy <= zy2)
+    return inside
+
+
+class TrackRow:
+    """Tablonun tek satırına kopyasız görünüm (UI / hata ayıklama için)."""
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def track_id(self):
+        return int(self.table.track_id[self.index])
+
+    @property
+    def bbox(self):
+        return tuple(int(v) for v in self.table.bbox[self.index])
+
+    @property
+    def cls(self):
+        return self.table.labels[self.table.label[self.index]]
+
+    @property
+    def conf(self):
+        return float(self.table.conf[self.index])
+
+    @property
+    def status(self):
+        return STATUS_NAMES[self.table.status[self.index]]
+
+    @property
+    def threat(self):
+        threat = float(self.table.threat[self.index])
+        return None if np.isnan(threat) else threat
+
+    def __repr__(self):
+        return (f"TrackRow(track_id={self.track_id}, cls={self.cls!r}, bbox={self.bbox}, "
+                f"conf={self.conf:.2f}, status={self.status!r}, threat={self.threat})")
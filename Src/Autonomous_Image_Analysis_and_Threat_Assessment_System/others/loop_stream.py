@@ -0,0 +1,80 @@
+# others/loop_stream.py
+"""
+Canlı kaynak modunu denemek için yerel yayın taklidi: bir video dosyasını
+gerçek zamanlı hızda, sonsuz döngüyle bir FIFO'ya ya da UDP adresine basar.
+
+    python others/loop_stream.py video.mp4 /tmp/live.fifo
+    python others/loop_stream.py video.mp4 udp://127.0.0.1:5000
+
+Uygulamada Ctrl+L → /tmp/live.fifo (ya da udp://127.0.0.1:5000) girilir.
+ffmpeg kuruluysa o kullanılır; değilse FIFO için OpenCV ile multipart
+MJPEG akışı yazılır.
+"""
+import argparse
+import os
+import shutil
+import stat
+import subprocess
+import time
+import cv2
+
+
+def run_ffmpeg(video_path, target):
+    fmt = "mpegts"
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "warning",
+        "-re", "-stream_loop", "-1", "-i", video_path,
+        "-an", "-c:v", "mjpeg", "-q:v", "5", "-f", fmt, "-y", target,
+    ]
+    return subprocess.call(cmd)
+
+
+def run_opencv_mjpeg(video_path, fifo_path, quality=85):
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    period = 1.0 / fps
+
+    with open(fifo_path, "wb") as out:          # okuyucu bağlanana kadar bekler
+        next_t = time.monotonic()
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)   # başa sar
+                continue
+            ok, jpg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if ok:
+                # multipart MJPEG (ffmpeg "mpjpeg" biçimi) – kare sınırları açık
+                out.write(b"--ffmpeg\r\nContent-Type: image/jpeg\r\n"
+                          b"Content-Length: %d\r\n\r\n" % len(jpg))
+                out.write(jpg.tobytes())
+                out.write(b"\r\n")
+                out.flush()
+
+            next_t += period
+            time.sleep(max(0.0, next_t - time.monotonic()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loop a video file into a FIFO or UDP stream.")
+    parser.add_argument("video", help="source video file")
+    parser.add_argument("target", help="FIFO path or udp://host:port")
+    args = parser.parse_args()
+
+    is_url = "://" in args.target
+    if not is_url and not os.path.exists(args.target):
+        os.mkfifo(args.target)
+    if not is_url and not stat.S_ISFIFO(os.stat(args.target).st_mode):
+        parser.error(f"{args.target} exists and is not a named pipe")
+
+    try:
+        if shutil.which("ffmpeg"):
+            return run_ffmpeg(args.video, args.target)
+        if is_url:
+            parser.error("UDP output needs ffmpeg on PATH")
+        run_opencv_mjpeg(args.video, args.target)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass                                     # okuyucu kapandı / Ctrl+C
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+# process_operations/batch_analysis.py
+import hashlib
+import json
+import os
+import time
+import cv2
+import numpy as np
+from custom_models.backend import get_backend
+from object_tracking.object_tracker import ObjectTracker
+from object_tracking.initial_filter import InitialObjectFilter
+from object_tracking.lifecycle import TrackLifecycleManager
+from object_tracking.track_table import STATUS_CODES, STATUS_NAMES
+from process_operations.keyframe_scheduler import KeyframeScheduler
+from process_operations.stages import DetectionStage, TrackingStage
+from process_operations.result_cache import ResultCache, cache_key
+from process_operations.overlay import draw_overlay
+from process_operations.video_export import VideoExporter
+from threat_assessment.manager import ThreatAssessment
+from project_utils.config import (
+    BATCH_SIZE, VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT, KEYFRAME_SCHEDULING, RESULT_CACHE,
+    CPU_THREADS,
+)
+
+
+class VideoAnalyzer:
+    """
+    GUI'siz detect → track → threat hattı (gece toplu işleme için).
+
+    VideoProcessor ile aynı bileşenler: BatchStager, KeyframeScheduler,
+    ObjectTracker, InitialObjectFilter, ThreatAssessment. Qt, zamanlayıcı
+    ya da `app` nesnesi gerekmez. Operatör olmadığından friend / foe
+    durumu yalnızca bölgelerden (merkez bölge içinde mi) belirlenir.
+    """
+    def __init__(self, detector, width=VIDEO_FRAME_WIDTH, height=VIDEO_FRAME_HEIGHT,
+                 batch_size=BATCH_SIZE, threshold=0.1, init_frames=10, use_cache=RESULT_CACHE):
+        self.detector = detector
+        self.width = width
+        self.height = height
+        self.batch_size = batch_size
+        self.threshold = threshold
+        self.init_frames = init_frames
+
+        self.backend = get_backend()
+        self.result_cache = ResultCache() if use_cache else None
+
+    def analyze(self, video_path, friendly_zones=(), enemy_zones=(), statuses=None,
+                with_frames=False):
+        """
+        (frame_number, pts, tracks, frame) üreteci; tracks TrackTable'dır,
+        status ve threat sütunları doldurulmuş olarak.
+
+        statuses    : track_id → "friend" / "foe" ön atamaları (GUI'de elle işaretlenenler)
+        with_frames : True → model boyutundaki kare de döner (dışa aktarım); aksi hâlde None
+        """
+        tracker = ObjectTracker()
+        initial_filter = InitialObjectFilter(self.init_frames)
+        scheduler = KeyframeScheduler() if KEYFRAME_SCHEDULING else None
+        threat = ThreatAssessment()
+        # Operatörün friend / foe ön atamaları kalıcı; diğer izler her karede
+        # bölgelerden yeniden sınıflandırılır (GUI'deki gibi)
+        presets = {tid: STATUS_CODES[name] for tid, name in (statuses or {}).items()
+                   if name in ("friend", "foe")}
+
+        # Saatlerce süren kayıtlarda ölü izlerin durumu birikmesin
+        lifecycle = TrackLifecycleManager()
+        lifecycle.register(tracker.retire_tracks)
+        lifecycle.register(threat.retire_tracks)
+
+        def retire_presets(dead):
+            for tid in dead:
+                presets.pop(tid, None)
+        lifecycle.register(retire_presets)
+
+        detection = DetectionStage(self.backend, scheduler, initial_filter, self.threshold,
+                                   self.batch_size, self.height, self.width)
+        tracking = TrackingStage(tracker, lifecycle, initial_filter)
+
+        cached, writer = self._open_cache(video_path)
+
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        if not cap.isOpened():
+            raise IOError(f"Could not open video: {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+        def assess(fnum, tracks, frame=None):
+            status = tracks.zone_status(friendly_zones, enemy_zones)
+            if presets:
+                for row, tid in enumerate(tracks.track_id.tolist()):
+                    if tid in presets:
+                        status[row] = presets[tid]
+            tracks.status = status
+            threat.update(tracks, friendly_zones=list(friendly_zones),
+                          enemy_zones=list(enemy_zones))
+            return fnum, fnum / fps if fps else 0.0, tracks, frame
+
+        try:
+            # Önbellek isabeti: çıkarım yok; kare yalnızca dışa aktarımda çözülür
+            if cached is not None:
+                for frame_number in range(cached.total_frames):
+                    frame = None
+                    if with_frames:
+                        ret, frame = cap.read()
+                        if not ret:
+                            break
+                        frame = cv2.resize(frame, (self.width, self.height))
+                    tracks = cached.tracks(frame_number)
+                    lifecycle.observe(tracks.track_id.tolist())
+                    yield assess(frame_number, tracks, frame)
+                return
+
+            frame_number, batch = 0, []
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                batch.append((frame_number, cv2.resize(frame, (self.width, self.height))))
+                if len(batch) == self.batch_size:
+                    for fnum, objs, frm in self._run_batch(batch, detection, tracking, writer):
+                        yield assess(fnum, objs, frm if with_frames else None)
+                    batch = []
+                frame_number += 1
+
+            if batch:
+                for fnum, objs, frm in self._run_batch(batch, detection, tracking, writer):
+                    yield assess(fnum, objs, frm if with_frames else None)
+            if writer is not None:
+                writer.finish()
+        finally:
+            cap.release()
+
+    # ------------------------------------------------------------------ #
+    def _open_cache(self, video_path):
+        if self.result_cache is None:
+            return None, None
+        try:
+            key = cache_key(video_path, self.threshold, self.init_frames, "headless", self.batch_size)
+        except OSError:
+            return None, None
+        cached = self.result_cache.load(key)
+        return cached, (None if cached is not None else self.result_cache.writer(key))
+
+    def _run_batch(self, batch, detection, tracking, writer):
+        fnums = [fnum for fnum, _ in batch]
+        frames = [frame for _, frame in batch]
+        detections = detection.run(self.detector, frames, fnums, *tracking.hints())
+        for fnum, frame, frame_detections in zip(fnums, frames, detections):
+            tracked_objects = tracking.step(fnum, frame, frame_detections)
+            if writer is not None:
+                writer.add(fnum, tracked_objects, frame_detections)
+            yield fnum, tracked_objects, frame
+
+
+# ---------------------------------------------------------------------- #
+# Çıktı biçimleri
+# ---------------------------------------------------------------------- #
+class JsonlWriter:
+    """Kare başına bir satır: {"frame", "time", "objects": [...]}"""
+    extension = ".jsonl"
+
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, frame_number, pts, tracks):
+        rows = zip(tracks.track_id.tolist(), tracks.cls, tracks.bbox.tolist(),
+                   tracks.conf.tolist(), tracks.status.tolist(), tracks.threat.tolist())
+        record = {
+            "frame": frame_number,
+            "time": round(pts, 3),
+            "objects": [
+                {
+                    "track_id": tid,
+                    "cls": cls,
+                    "bbox": bbox,
+                    "conf": round(conf, 2),
+                    "status": STATUS_NAMES[status],
+                    "threat": round(threat, 2),
+                }
+                for tid, cls, bbox, conf, status, threat in rows
+            ],
+        }
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class NpzWriter:
+    """
+    Sütunlu çıktı (.npz): iz başına bir satır.
+    frame int32, time float32, track_id int32, bbox (N,4) int32, conf float32,
+    threat float32, cls int16 → labels, status int8 → statuses
+
+    TrackTable sütunları kare başına parça olarak eklenir, close()'da birleştirilir.
+    """
+    extension = ".npz"
+    COLUMNS = {                       # sütun → (satır biçimi, dtype)
+        "frame": ((), np.int32), "time": ((), np.float32), "track_id": ((), np.int32),
+        "bbox": ((4,), np.int32), "conf": ((), np.float32), "threat": ((), np.float32),
+        "cls": ((), np.int16), "status": ((), np.int8),
+    }
+
+    def __init__(self, path):
+        self.path = path
+        # Boş parça → hiç satır yazılmasa da sütun biçimi / dtype korunur
+        self.chunks = {name: [np.zeros((0, *shape), dtype=dtype)]
+                       for name, (shape, dtype) in self.COLUMNS.items()}
+        self.labels = {}
+
+    def write(self, frame_number, pts, tracks):
+        n = len(tracks)
+        # Tablonun etiket kodları → dosyanın etiket tablosu (yalnızca kullanılanlar)
+        remap = np.zeros(len(tracks.labels), dtype=np.int16)
+        for code in np.unique(tracks.label).tolist():
+            remap[code] = self.labels.setdefault(tracks.labels[code], len(self.labels))
+        chunks = self.chunks
+        chunks["frame"].append(np.full(n, frame_number, dtype=np.int32))
+        chunks["time"].append(np.full(n, pts, dtype=np.float32))
+        chunks["track_id"].append(np.asarray(tracks.track_id, dtype=np.int32))
+        chunks["bbox"].append(np.asarray(tracks.bbox, dtype=np.int32).reshape(-1, 4))
+        chunks["conf"].append(np.asarray(tracks.conf, dtype=np.float32))
+        chunks["threat"].append(np.asarray(tracks.threat, dtype=np.float32))
+        chunks["cls"].append(remap[tracks.label])
+        chunks["status"].append(np.asarray(tracks.status, dtype=np.int8))
+
+    def close(self):
+        np.savez_compressed(
+            self.path,
+            **{name: np.concatenate(parts) for name, parts in self.chunks.items()},
+            labels=np.array(sorted(self.labels, key=self.labels.get)),
+            statuses=np.array(STATUS_NAMES),
+        )
+
+
+WRITERS = {"jsonl": JsonlWriter, "npz": NpzWriter}
+
+
+def output_names(video_paths):
+    """
+    Video → çıktı adı (uzantısız): dosya adının kökü. Aynı kök aynı
+    çalıştırmada birden çok kez geçiyorsa (a/cam1.mp4, b/cam1.mp4) tam yolun
+    kısa özeti eklenir → paralel işçiler aynı dosyanın üzerine yazmaz.
+    """
+    by_stem = {}
+    for path in video_paths:
+        by_stem.setdefault(_stem(path), []).append(path)
+
+    names = {}
+    for stem, paths in by_stem.items():
+        for path in paths:
+            if len(paths) == 1:
+                names[path] = stem
+            else:
+                digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+                names[path] = f"{stem}-{digest}"
+    return names
+
+
+def output_path(name, output_dir, fmt):
+    return os.path.join(output_dir, name + WRITERS[fmt].extension)
+
+
+def _stem(video_path):
+    return os.path.splitext(os.path.basename(video_path))[0]
+
+
+# ---------------------------------------------------------------------- #
+# Süreç havuzu işçisi
+# ---------------------------------------------------------------------- #
+_analyzer = None
+
+
+def init_worker(workers):
+    """Her işçi süreç modelleri bir kez yükler; CPU çekirdekleri paylaştırılır."""
+    global _analyzer
+    from object_detection.object_detector import ObjectDetector
+
+    # Sürecin CPU bütçesi: çekirdekler işçi süreçler arasında bölünür
+    # (modeller yüklenmeden, backend ilk kez kurulurken)
+    get_backend(cpu_threads=max(1, (CPU_THREADS or os.cpu_count() or 1) // max(1, workers)))
+    detector = ObjectDetector(input_size=(VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT), exit_on_error=False)
+    _analyzer = VideoAnalyzer(detector)
+
+
+def analyze_file(video_path, output_dir, fmt, friendly_zones=(), enemy_zones=(), export=False,
+                 name=None):
+    """
+    Tek dosyayı işler; export → açıklamalı <ad>.mp4 de yazılır.
+    name : çıktı adı (output_names); None → dosya adının kökü.
+    Dönüş: (video_path, çıktı yolu, kare sayısı, süre s).
+    """
+    t0 = time.perf_counter()
+    out_path = output_path(name or _stem(video_path), output_dir, fmt)
+    writer = WRITERS[fmt](out_path)
+    exporter = None
+    if export:
+        exporter = VideoExporter(
+            os.path.splitext(out_path)[0] + ".mp4", _source_fps(video_path),
+            (_analyzer.width, _analyzer.height),
+        )
+
+    frames = 0
+    try:
+        for frame_number, pts, objects, frame in _analyzer.analyze(
+            video_path, friendly_zones, enemy_zones, with_frames=export
+        ):
+            writer.write(frame_number, pts, objects)
+            if exporter is not None:
+                exporter.write(draw_overlay(frame, objects, None, friendly_zones, enemy_zones))
+            frames += 1
+    finally:
+        writer.close()
+        if exporter is not None:
+            exporter.close()
+    return video_path, out_path, frames, time.perf_counter() - t0
+
+
+def _source_fps(video_path):
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    cap.release()
+    return fps
@@ -0,0 +1,102 @@
+# process_operations/batcher.py
+from project_utils.config import (
+    BATCH_MODE, TARGET_LATENCY_MS, DISPLAY_LOW_WATERMARK, IDLE_FLUSH_S
+)
+
+
+class AdaptiveBatcher:
+    """
+    Inference batch boyutunu ölçülen çıkarım süresine göre seçer.
+
+    • "throughput" : her zaman en büyük batch (çevrim dışı dosyalar)
+    • "latency"    : bekleme + çıkarım süresi hedef gecikmeyi aşmayacak
+                     en büyük batch; gösterim kuyruğu boşalmak üzereyse
+                     eldeki kareler hemen gönderilir (canlı yayın)
+
+    Batch süresi t(b) ≈ sabit + kare_başı · b modeliyle, üstel unutmalı
+    çevrimiçi en küçük kareler ile tahmin edilir.
+    """
+    def __init__(self, max_batch, mode=BATCH_MODE, target_latency_ms=TARGET_LATENCY_MS,
+                 low_watermark=DISPLAY_LOW_WATERMARK, idle_flush_s=IDLE_FLUSH_S, decay=0.9):
+        if mode not in ("throughput", "latency"):
+            raise ValueError(f"Unknown batch mode: {mode}")
+
+        self.max_batch = max(1, max_batch)
+        self.mode = mode
+        self.target_latency = target_latency_ms / 1000.0
+        self.low_watermark = low_watermark
+        self.idle_flush_s = idle_flush_s
+        self.decay = decay
+
+        self.source_fps = 30.0
+        self.batch_size = self.max_batch if mode == "throughput" else 1
+
+        # Ağırlıklı toplamlar: Σw, Σb, Σt, Σb², Σbt
+        self._w = self._b = self._t = self._bb = self._bt = 0.0
+
+    # ------------------------------------------------------------------ #
+    def set_source_fps(self, fps):
+        if fps and fps > 0:
+            self.source_fps = float(fps)
+
+    def record(self, batch_len, seconds):
+        """Bir batch'in uçtan uca çıkarım süresini modele ekle."""
+        d = self.decay
+        self._w  = self._w  * d + 1.0
+        self._b  = self._b  * d + batch_len
+        self._t  = self._t  * d + seconds
+        self._bb = self._bb * d + batch_len * batch_len
+        self._bt = self._bt * d + batch_len * seconds
+
+        if self.mode == "latency":
+            self.batch_size = self._best_batch_size()
+
+    def predict(self, batch_len):
+        """b karelik bir batch için tahmini çıkarım süresi (s)."""
+        if self._w == 0:
+            return 0.0
+        mean_b = self._b / self._w
+        mean_t = self._t / self._w
+        var_b = self._bb / self._w - mean_b * mean_b
+
+        if var_b > 1e-6:
+            per_frame = (self._bt / self._w - mean_b * mean_t) / var_b
+            fixed = mean_t - per_frame * mean_b
+            if per_frame > 0 and fixed >= 0:
+                return fixed + per_frame * batch_len
+
+        # Tek batch boyutu gözlendiyse: süre ∝ batch
+        return mean_t / max(mean_b, 1.0) * batch_len
+
+    def _best_batch_size(self):
+        frame_interval = 1.0 / self.source_fps
+        best = 1
+        for b in range(1, self.max_batch + 1):
+            # İlk karenin gördüğü gecikme: (b‑1) kare birikmesi + çıkarım
+            if (b - 1) * frame_interval + self.predict(b) <= self.target_latency:
+                best = b
+            else:
+                break
+        return best
+
+    # ------------------------------------------------------------------ #
+    def should_flush(self, pending, oldest_wait, idle_time, display_backlog):
+        """
+        pending         : biriken kare sayısı
+        oldest_wait     : en eski bekleyen karenin kuyrukta geçirdiği süre (s)
+        idle_time       : son kare gelişinden bu yana geçen süre (s)
+        display_backlog : gösterim kuyruğundaki işlenmiş kare sayısı
+        """
+        if pending == 0:
+            return False
+        if pending >= self.batch_size:
+            return True
+        if idle_time > self.idle_flush_s:
+            return True
+
+        if self.mode == "latency":
+            if display_backlog <= self.low_watermark:
+                return True
+            if oldest_wait + self.predict(pending) >= self.target_latency:
+                return True
+        return False
@@ -0,0 +1,140 @@
+# process_operations/decode_pool.py
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
+from process_operations.frame_index import seek_capture
+from project_utils.config import DECODE_WORKERS, DECODE_SEGMENT_FRAMES, BATCH_SIZE
+
+_SEGMENT_END = None
+
+
+def segment_end(start, total_frames, segment_frames, keyframes=None):
+    """
+    `start`'tan başlayan yaklaşık `segment_frames` uzunluğundaki parçanın
+    bitişi. keyframes verilirse sınır bir sonraki anahtar kareye (GOP
+    başına) hizalanır; böylece sonraki işçi kendi GOP'undan başlar, boşa
+    kod çözme yapılmaz. Sonrasında anahtar kare yoksa parça dosya sonuna
+    kadar uzar.
+    """
+    end = start + segment_frames
+    if keyframes is not None and len(keyframes):
+        later = keyframes[np.searchsorted(keyframes, end):]
+        end = int(later[0]) if len(later) else total_frames
+    return min(end, total_frames)
+
+
+class ParallelDecoder:
+    """
+    Videoyu parçalara bölüp her parçayı ayrı bir işçide çözer + yeniden
+    boyutlandırır; kareler tüketiciye KARE SIRASIYLA verilir.
+
+    Aynı anda en fazla `workers` parça çözülür. Tüketici k. parçayı
+    bitirince k+workers. parça kuyruğa alınır.
+
+    Kareler doğrudan FramePool yuvalarına yeniden boyutlandırılır. Sıradaki
+    (baş) parça dışındaki işçiler havuzda `reserve` yuva bırakır; böylece
+    öndeki parçalar havuzu doldurup baş parçayı kilitleyemez.
+
+    Parça sınırları kuyruğa alınırken belirlenir: `keyframes` anahtar kare
+    dizisini (yoksa None) döndüren bir çağrılabilirdir. Zaman çizelgesinin
+    arka plan dizini hazır olana dek kare sayısıyla bölünür, hazır olunca
+    sonraki parçalar GOP başlarına hizalanır – ilk kare dizini beklemez.
+    Dizinsiz konumlama OpenCV'ye kalır (GOP ortasında kare-doğru olmayabilir).
+
+    Üreteç durdurulunca / kapatılınca (stop, seek) işçiler beklenir ve
+    terk edilen parça kuyruklarındaki kareler havuza geri bırakılır.
+    """
+    def __init__(self, video_path, size, total_frames, pool, reserve=BATCH_SIZE + 2,
+                 workers=DECODE_WORKERS, segment_frames=DECODE_SEGMENT_FRAMES,
+                 keyframes=lambda: None, start_frame=0, should_stop=lambda: False):
+        self.video_path = video_path
+        self.size = size                      # (width, height)
+        self.pool = pool
+        self.reserve = reserve
+        self.workers = max(1, workers)
+        self.keyframes = keyframes
+        self.total_frames = total_frames
+        self.segment_frames = segment_frames
+        self.start_frame = start_frame
+        self.should_stop = should_stop
+        self.closed = False                   # üreteç bitti → işçiler çıksın
+        self.head = 0                         # tüketicinin beklediği parça
+
+    # ------------------------------------------------------------------ #
+    def __iter__(self):
+        queues = {}
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="DecodeWorker")
+        next_start = self.start_frame
+
+        def submit(idx):
+            nonlocal next_start
+            if next_start >= self.total_frames:
+                return
+            start = next_start
+            next_start = segment_end(start, self.total_frames, self.segment_frames, self.keyframes())
+            queues[idx] = Queue()
+            pool.submit(self._decode_segment, idx, start, next_start, queues[idx])
+
+        try:
+            for idx in range(self.workers):
+                submit(idx)
+
+            idx = 0
+            while idx in queues:
+                self.head = idx
+                queue = queues[idx]
+                while True:
+                    try:
+                        item = queue.get(timeout=0.05)
+                    except Empty:
+                        if self.should_stop():
+                            return
+                        continue
+                    if item is _SEGMENT_END:
+                        break
+                    yield item
+
+                del queues[idx]
+                submit(idx + self.workers)
+                idx += 1
+        finally:
+            self.closed = True
+            pool.shutdown(wait=True, cancel_futures=True)
+            # Terk edilen parçaların çözülmüş kareleri → yuvalar havuza
+            for queue in queues.values():
+                while True:
+                    try:
+                        item = queue.get_nowait()
+                    except Empty:
+                        break
+                    if item is not _SEGMENT_END:
+                        item[1].release()
+
+    def _stopped(self):
+        return self.closed or self.should_stop()
+
+    def _decode_segment(self, idx, start, end, queue):
+        cap = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG)
+        try:
+            # İşçi başladığında dizin gelmişse hizasız parça da kare-doğru konumlanır
+            seek_capture(cap, start, self.keyframes())
+            for frame_number in range(start, end):
+                if self._stopped():
+                    break
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                handle = None
+                while handle is None:
+                    if self._stopped():
+                        return
+                    reserve = 0 if self.head == idx else self.reserve
+                    handle = self.pool.acquire(timeout=0.05, reserve=reserve)
+
+                cv2.resize(frame, self.size, dst=handle.array)
+                queue.put((frame_number, handle))
+        finally:
+            cap.release()
+            queue.put(_SEGMENT_END)
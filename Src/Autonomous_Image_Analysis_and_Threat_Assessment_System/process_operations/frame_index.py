@@ -0,0 +1,111 @@
+# process_operations/frame_index.py
+import cv2
+import numpy as np
+
+try:                      # isteğe bağlı: paket başlıklarından gerçek anahtar kare / PTS
+    import av
+except ImportError:
+    av = None
+
+
+class FrameIndex:
+    """
+    Bir video dosyasının kare dizini.
+
+    pts        : (N,) float64 – kare i'nin sunum zamanı (s), kare sırasıyla
+    keyframes  : (K,) int64   – anahtar karelerin (GOP başları) kare numaraları;
+                 bilinmiyorsa None (OpenCV yedeği)
+    fps        : ortalama kare hızı
+
+    PyAV varsa yalnızca paketler okunur (kod çözme yok) → uzun kayıtlarda
+    bile hızlıdır. Yoksa OpenCV'nin kare sayısı / FPS bilgisinden düzgün
+    aralıklı bir dizin üretilir.
+    """
+    def __init__(self, pts, keyframes, fps):
+        self.pts = pts
+        self.keyframes = keyframes
+        self.fps = fps
+
+    @property
+    def total_frames(self):
+        return len(self.pts)
+
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def build(cls, video_path, should_stop=lambda: False):
+        if av is not None:
+            try:
+                return cls._build_pyav(video_path, should_stop)
+            except (av.error.FFmpegError, IndexError) as e:
+                print(f"PyAV index failed ({e}); falling back to OpenCV.")
+        return cls._build_opencv(video_path)
+
+    @classmethod
+    def _build_pyav(cls, video_path, should_stop):
+        with av.open(video_path) as container:
+            stream = container.streams.video[0]
+            time_base = float(stream.time_base)
+
+            packet_pts, key_pts = [], []
+            for packet in container.demux(stream):
+                if should_stop():
+                    return None
+                if packet.pts is None:
+                    continue
+                packet_pts.append(packet.pts)
+                if packet.is_keyframe:
+                    key_pts.append(packet.pts)
+
+        # Paketler kod çözme sırasında gelir; kare sırası = PTS sırası
+        pts = np.sort(np.asarray(packet_pts, dtype=np.int64))
+        keyframes = np.searchsorted(pts, np.asarray(key_pts, dtype=np.int64))
+
+        seconds = (pts - pts[0]) * time_base
+        fps = (len(pts) - 1) / seconds[-1] if len(pts) > 1 and seconds[-1] > 0 else 0.0
+        return cls(seconds, np.unique(keyframes), fps)
+
+    @classmethod
+    def _build_opencv(cls, video_path):
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        total = max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        cap.release()
+        pts = np.arange(total, dtype=np.float64) / (fps or 1.0)
+        return cls(pts, None, fps)
+
+    # ------------------------------------------------------------------ #
+    def gop_start(self, frame_number):
+        """frame_number'ı içeren GOP'un anahtar karesi."""
+        return gop_start(frame_number, self.keyframes)
+
+    def frame_at(self, seconds):
+        """Verilen zamana karşılık gelen kare numarası."""
+        idx = int(np.searchsorted(self.pts, seconds, side="right")) - 1
+        return int(np.clip(idx, 0, max(0, self.total_frames - 1)))
+
+
+def gop_start(frame_number, keyframes):
+    if keyframes is None or len(keyframes) == 0:
+        return frame_number
+    idx = int(np.searchsorted(keyframes, frame_number, side="right")) - 1
+    return int(keyframes[idx]) if idx >= 0 else 0
+
+
+def seek_capture(cap, frame_number, keyframes=None):
+    """
+    VideoCapture'ı kare-doğru konumla: GOP başına atla, hedefe kadar
+    kareleri çözmeden (grab) ilerle. Anahtar kareler bilinmiyorsa
+    OpenCV'nin kendi konumlandırmasına güvenilir.
+    """
+    if frame_number <= 0:
+        return
+    if keyframes is None or len(keyframes) == 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        return
+
+    start = gop_start(frame_number, keyframes)
+    if start > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    for _ in range(frame_number - start):
+        if not cap.grab():
+            break
@@ -0,0 +1,79 @@
+# process_operations/frame_pool.py
+import threading
+from collections import deque
+import numpy as np
+import torch
+from project_utils.config import FRAME_POOL_MEMORY_MB, BATCH_SIZE
+
+
+class FrameHandle:
+    """Havuzdaki bir kare yuvasına referans; `array` doğrudan yuvanın görünümüdür."""
+    __slots__ = ("pool", "slot", "array")
+
+    def __init__(self, pool, slot):
+        self.pool = pool
+        self.slot = slot
+        self.array = pool.storage[slot]
+
+    def retain(self):
+        self.pool._retain(self.slot)
+        return self
+
+    def release(self):
+        self.pool._release(self.slot)
+
+
+class FramePool:
+    """
+    Önceden ayrılmış, sabit boyutlu kare havuzu.
+
+    • Yuvalar referans sayımlıdır; sayaç 0'a düşünce yuva boşa çıkar.
+    • Boş yuva yoksa acquire() bekler → okuyucu doğal olarak yavaşlar
+      (backpressure); video ne kadar uzun olursa olsun bellek sabittir.
+    • Kapasite bellek bütçesinden hesaplanır, ancak iki batch + gösterim
+      için gereken en az yuvanın altına inmez.
+    • pin_memory=True (CUDA) → yuvalar pinned; kod çözücü kareyi doğrudan
+      yuvaya yazar, BatchStager oradan cihaza kopyalar (ara host kopyası yok)
+    """
+    def __init__(self, height, width, memory_budget_mb=FRAME_POOL_MEMORY_MB,
+                 min_slots=2 * BATCH_SIZE + 4, pin_memory=False):
+        frame_bytes = height * width * 3
+        self.capacity = max(min_slots, int(memory_budget_mb * 1024 * 1024) // frame_bytes)
+
+        shape = (self.capacity, height, width, 3)
+        self.pinned = pin_memory
+        if pin_memory:
+            self.storage = torch.empty(shape, dtype=torch.uint8, pin_memory=True).numpy()
+        else:
+            self.storage = np.empty(shape, dtype=np.uint8)
+        self.refcounts = [0] * self.capacity
+        self.free = deque(range(self.capacity))
+        self.cond = threading.Condition()
+
+    # ------------------------------------------------------------------ #
+    def acquire(self, timeout=None, reserve=0):
+        """
+        Boş bir yuva al (refcount=1). `reserve` kadar yuva başkaları için
+        bırakılır. Zaman aşımında None döner.
+        """
+        with self.cond:
+            if not self.cond.wait_for(lambda: len(self.free) > reserve, timeout=timeout):
+                return None
+            slot = self.free.popleft()
+            self.refcounts[slot] = 1
+        return FrameHandle(self, slot)
+
+    def _retain(self, slot):
+        with self.cond:
+            self.refcounts[slot] += 1
+
+    def _release(self, slot):
+        with self.cond:
+            self.refcounts[slot] -= 1
+            if self.refcounts[slot] == 0:
+                self.free.append(slot)
+                self.cond.notify_all()
+
+    @property
+    def free_slots(self):
+        return len(self.free)
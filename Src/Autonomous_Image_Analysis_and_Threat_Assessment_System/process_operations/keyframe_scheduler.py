@@ -0,0 +1,71 @@
+# process_operations/keyframe_scheduler.py
+import cv2
+import numpy as np
+from project_utils.config import (
+    KEYFRAME_MAX_INTERVAL, KEYFRAME_SPIKE_THRESHOLD, KEYFRAME_DRIFT_THRESHOLD,
+    KEYFRAME_MOTION_REF, KEYFRAME_TRACK_REF,
+)
+
+THUMB_SIZE = (64, 36)   # hareket istatistiği için küçük gri önizleme
+
+
+class KeyframeScheduler:
+    """
+    Hangi karelerde dedektörlerin çalışacağına karar verir.
+
+    • Anahtar kare aralığı hareket ve canlı iz sayısı arttıkça kısalır
+      (1 … max_interval).
+    • Ardışık kareler arasındaki ani fark (spike) ya da son anahtar
+      kareden bu yana biriken değişim (drift) eşiği aşarsa hemen
+      anahtar kare eklenir.
+    • Aradaki karelerde izleyici Kalman tahminiyle ilerler.
+    """
+    def __init__(self, max_interval=KEYFRAME_MAX_INTERVAL,
+                 spike_threshold=KEYFRAME_SPIKE_THRESHOLD,
+                 drift_threshold=KEYFRAME_DRIFT_THRESHOLD,
+                 motion_ref=KEYFRAME_MOTION_REF, track_ref=KEYFRAME_TRACK_REF):
+        self.max_interval = max(1, max_interval)
+        self.spike_threshold = spike_threshold
+        self.drift_threshold = drift_threshold
+        self.motion_ref = motion_ref
+        self.track_ref = track_ref
+        self.reset()
+
+    def reset(self):
+        self.prev_thumb = None
+        self.key_thumb = None
+        self.since_key = 0
+        self.motion_ema = 0.0
+
+    # ------------------------------------------------------------------ #
+    def interval(self, num_tracks):
+        """Hareket ve iz sayısına göre uyarlanan anahtar kare aralığı."""
+        load = 1.0 + self.motion_ema / self.motion_ref + num_tracks / self.track_ref
+        return int(np.clip(round(self.max_interval / load), 1, self.max_interval))
+
+    def is_keyframe(self, frame, num_tracks):
+        thumb = cv2.cvtColor(
+            cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA),
+            cv2.COLOR_BGR2GRAY,
+        ).astype(np.int16)
+
+        if self.prev_thumb is None:
+            self._mark_key(thumb)
+            return True
+
+        spike = float(np.abs(thumb - self.prev_thumb).mean())
+        drift = float(np.abs(thumb - self.key_thumb).mean())
+        self.motion_ema = 0.8 * self.motion_ema + 0.2 * spike
+        self.prev_thumb = thumb
+        self.since_key += 1
+
+        if (spike > self.spike_threshold or drift > self.drift_threshold
+                or self.since_key >= self.interval(num_tracks)):
+            self._mark_key(thumb)
+            return True
+        return False
+
+    def _mark_key(self, thumb):
+        self.prev_thumb = thumb
+        self.key_thumb = thumb
+        self.since_key = 0
@@ -0,0 +1,161 @@
+# process_operations/live_source.py
+import os
+import stat
+import threading
+import time
+from collections import deque
+import cv2
+from project_utils.config import LIVE_BUFFER_FRAMES, LIVE_RECONNECT_MIN_S, LIVE_RECONNECT_MAX_S
+
+LIVE_SCHEMES = ("rtsp://", "rtsps://", "rtmp://", "udp://", "tcp://", "srt://", "http://", "https://")
+
+
+def is_live_source(path):
+    """URL (rtsp/udp…), V4L2 aygıtı, kamera indeksi ya da adlandırılmış boru mu?"""
+    path = str(path).strip()
+    if path.isdigit() or path.lower().startswith(LIVE_SCHEMES) or path.startswith("/dev/video"):
+        return True
+    try:
+        return stat.S_ISFIFO(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def open_capture(path):
+    path = str(path).strip()
+    if path.isdigit():
+        return cv2.VideoCapture(int(path))
+    if path.startswith("/dev/video"):
+        return cv2.VideoCapture(path, cv2.CAP_V4L2)
+    return cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+
+
+class LatestFrameBuffer:
+    """
+    En yeni `capacity` kareyi tutan tampon. Tüketici yetişemezse en eski
+    kare atılır (drop-oldest); kuyruk birikmez, gecikme sınırlı kalır.
+    """
+    def __init__(self, capacity=LIVE_BUFFER_FRAMES):
+        self.items = deque(maxlen=max(1, capacity))
+        self.cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        """Bekleyen en eski kareyi döndürür; zaman aşımında None."""
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.items, timeout=timeout):
+                return None
+            return self.items.popleft()
+
+    def clear(self):
+        with self.cond:
+            self.items.clear()
+
+
+class LiveSource:
+    """
+    Canlı kaynak okuyucusu (RTSP/UDP, V4L2, FIFO).
+
+    • Ayrı bir iş parçacığı kaynağı kendi hızında okur ve her kareye yakalama
+      zamanı (time.monotonic) ekleyip LatestFrameBuffer'a yazar.
+    • Okuma başarısız olursa bağlantı kapatılır ve artan bekleme süresiyle
+      (LIVE_RECONNECT_MIN_S … LIVE_RECONNECT_MAX_S) yeniden bağlanılır.
+    • VideoCapture ile aynı `release()` arayüzü → app.cap yerine kullanılabilir.
+    """
+    def __init__(self, path, buffer_size=LIVE_BUFFER_FRAMES,
+                 reconnect_min_s=LIVE_RECONNECT_MIN_S, reconnect_max_s=LIVE_RECONNECT_MAX_S):
+        self.path = path
+        self.buffer = LatestFrameBuffer(buffer_size)
+        self.reconnect_min_s = reconnect_min_s
+        self.reconnect_max_s = reconnect_max_s
+
+        self.cap = None
+        self.fps = 0.0
+        self.reconnects = 0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    # ------------------------------------------------------------------ #
+    def open(self):
+        """İlk bağlantı (eşzamanlı) – kaynak hiç açılamazsa False."""
+        cap = open_capture(self.path)
+        if not cap.isOpened():
+            cap.release()
+            return False
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap = cap
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        return True
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True, name="LiveCaptureThread")
+        self.thread.start()
+
+    def release(self):
+        self.stopped.set()
+        thread, self.thread = self.thread, None
+        if thread is not None:
+            thread.join(timeout=2)
+            if thread.is_alive():
+                return                        # okuma hâlâ bloklu; iş parçacığı çıkarken kapatır
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.buffer.clear()
+
+    # ------------------------------------------------------------------ #
+    def frames(self, should_stop=lambda: False):
+        """(capture_ts, BGR kare) üreteci – tampondaki en güncel kareler."""
+        while not should_stop() and not self.stopped.is_set():
+            item = self.buffer.get(timeout=0.05)
+            if item is not None:
+                yield item
+
+    @property
+    def dropped(self):
+        return self.buffer.dropped
+
+    def _capture_loop(self):
+        delay = self.reconnect_min_s
+        cap = self.cap
+
+        while not self.stopped.is_set():
+            if cap is None:
+                cap = open_capture(self.path)
+                if not cap.isOpened():
+                    cap.release()
+                    cap = None
+                    print(f"Live source unavailable, retrying in {delay:.1f}s: {self.path}")
+                    self.stopped.wait(delay)
+                    delay = min(delay * 2, self.reconnect_max_s)
+                    continue
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                self.cap = cap
+                self.reconnects += 1
+
+            ret, frame = cap.read()
+            capture_ts = time.monotonic()
+            if not ret:
+                cap.release()                 # bağlantı koptu / yazıcı kapandı
+                cap = self.cap = None
+                print(f"Live source lost, reconnecting in {delay:.1f}s: {self.path}")
+                self.stopped.wait(delay)
+                delay = min(delay * 2, self.reconnect_max_s)
+                continue
+
+            delay = self.reconnect_min_s
+            self.buffer.put((capture_ts, frame))
+
+        if cap is not None:
+            cap.release()
+            self.cap = None
@@ -0,0 +1,301 @@
+# process_operations/mp_pipeline.py
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from queue import Empty
+import cv2
+import numpy as np
+from process_operations.frame_index import seek_capture
+from project_utils.config import BATCH_SIZE, KEYFRAME_SCHEDULING, FRAME_POOL_MEMORY_MB
+
+_STOP = None          # kuyruk sonu işareti
+
+
+class SharedFrameRing:
+    """
+    multiprocessing.shared_memory üzerinde (slots, H, W, 3) uint8 kare halkası.
+    Süreçler arasında yalnızca yuva numarası taşınır, piksel verisi kopyalanmaz.
+    """
+    def __init__(self, slots, height, width, name=None):
+        self.shape = (slots, height, width, 3)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=int(np.prod(self.shape))
+        )
+        self.frames = np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @classmethod
+    def for_budget(cls, height, width, memory_budget_mb=FRAME_POOL_MEMORY_MB,
+                   min_slots=2 * BATCH_SIZE + 4):
+        slots = max(min_slots, int(memory_budget_mb * 1024 * 1024) // (height * width * 3))
+        return cls(slots, height, width)
+
+    @property
+    def spec(self):
+        """Alt süreçte aynı halkaya bağlanmak için gereken bilgi."""
+        slots, height, width, _ = self.shape
+        return slots, height, width, self.shm.name
+
+    @classmethod
+    def attach(cls, spec):
+        slots, height, width, name = spec
+        return cls(slots, height, width, name=name)
+
+    def close(self):
+        self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass              # ekranda hâlâ bir görünüm var; eşleme GC ile kapanır
+        if self.owner:
+            self.shm.unlink()
+
+
+class SlotHandle:
+    """Ana süreçte halka yuvasına referans – FrameHandle ile aynı arayüz."""
+    __slots__ = ("slot", "array", "free_queue")
+
+    def __init__(self, ring, slot, free_queue):
+        self.slot = slot
+        self.array = ring.frames[slot]
+        self.free_queue = free_queue
+
+    def release(self):
+        self.free_queue.put(self.slot)
+
+
+# ---------------------------------------------------------------------- #
+# Alt süreçler (spawn ile başlatılır → modül düzeyinde olmalı)
+# ---------------------------------------------------------------------- #
+def _get(queue, stop_event, timeout=0.05):
+    """stop_event gelene kadar bekleyen get; durdurulursa _STOP döner."""
+    while not stop_event.is_set():
+        try:
+            return queue.get(timeout=timeout)
+        except Empty:
+            continue
+    return _STOP
+
+
+def _finish(queue, stop_event):
+    """
+    Normal bitişte kuyruğun tamponu boşaltılır (son kareler + _STOP kaybolmasın);
+    durdurulduysa okuyan kalmamış olabilir → süreç çıkışta beklemesin.
+    """
+    if stop_event.is_set():
+        queue.cancel_join_thread()
+
+
+def decode_worker(video_path, size, ring_spec, free_queue, decoded_queue, stop_event,
+                  start_frame=0, keyframes=None):
+    """Kareleri çözer, doğrudan boş halka yuvasına yeniden boyutlandırır."""
+    ring = SharedFrameRing.attach(ring_spec)
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    seek_capture(cap, start_frame, keyframes)
+    frame_number = start_frame
+
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            slot = _get(free_queue, stop_event)       # boş yuva yoksa bekle
+            if slot is _STOP:
+                break
+
+            cv2.resize(frame, size, dst=ring.frames[slot])
+            decoded_queue.put((frame_number, slot))
+            frame_number += 1
+    finally:
+        cap.release()
+        decoded_queue.put(_STOP)
+        _finish(decoded_queue, stop_event)
+        ring.close()
+
+
+def inference_worker(ring_spec, decoded_queue, detection_queue, feedback_queue,
+                     stop_event, source_fps, batch_size, init_frames, start_frame=0):
+    """Anahtar kare seçimi + ön işleme + iki model; sonuç: FrameDetections ya da None."""
+    from custom_models.backend import get_backend
+    from object_detection.object_detector import ObjectDetector
+    from process_operations.batcher import AdaptiveBatcher
+    from process_operations.keyframe_scheduler import KeyframeScheduler
+    from process_operations.stages import DetectionStage
+    from object_tracking.initial_filter import InitialObjectFilter
+
+    ring = SharedFrameRing.attach(ring_spec)
+    _, height, width, _ = ring.shape
+
+    backend = get_backend()
+    batcher = AdaptiveBatcher(max_batch=batch_size)
+    batcher.set_source_fps(source_fps)
+    # Başlangıç penceresi izleme süreciyle aynı filtreden okunur
+    initial_filter = InitialObjectFilter(frame_count=init_frames)
+    initial_filter.reset(start_frame)
+    stage = DetectionStage(
+        backend, KeyframeScheduler() if KEYFRAME_SCHEDULING else None, initial_filter, 0.1,
+        batch_size, height, width,
+    )
+    detector = None
+
+    # İzleme sürecinden gelen son durum (iz sayısı, aktif kutular)
+    num_tracks, track_boxes = 0, np.zeros((0, 4), dtype=np.float32)
+
+    def run_batch(batch):
+        nonlocal num_tracks, track_boxes
+        while True:
+            try:
+                num_tracks, track_boxes = feedback_queue.get_nowait()
+            except Empty:
+                break
+
+        t0 = time.perf_counter()
+        detections = stage.run(detector, [ring.frames[slot] for _, slot in batch],
+                               [fnum for fnum, _ in batch], num_tracks, track_boxes)
+        for (fnum, slot), frame_detections in zip(batch, detections):
+            detection_queue.put((fnum, slot, frame_detections))
+        batcher.record(len(batch), time.perf_counter() - t0)
+
+    batch, finished = [], False
+    try:
+        # Modeller bu süreçte yüklenir (CUDA bağlamı süreçler arası paylaşılamaz)
+        detector = ObjectDetector(input_size=(width, height), exit_on_error=False)
+        first_arrival = last_arrival = time.time()
+        while not stop_event.is_set() and not finished:
+            try:
+                item = decoded_queue.get(timeout=0.01)
+                if item is _STOP:
+                    finished = True
+                else:
+                    last_arrival = time.time()
+                    if not batch:
+                        first_arrival = last_arrival
+                    batch.append(item)
+            except Empty:
+                pass
+
+            now = time.time()
+            if batch and (finished or batcher.should_flush(
+                pending=len(batch),
+                oldest_wait=now - first_arrival,
+                idle_time=now - last_arrival,
+                display_backlog=detection_queue.qsize(),
+            )):
+                run_batch(batch)
+                batch = []
+    finally:
+        detection_queue.put(_STOP)
+        _finish(detection_queue, stop_event)
+        if detector is not None:
+            detector.runner.shutdown()
+        ring.close()
+
+
+def tracking_worker(ring_spec, detection_queue, result_queue, feedback_queue,
+                    stop_event, init_frames, start_frame=0):
+    """Deep SORT + başlangıç filtresi; yalnızca iz listeleri gönderilir."""
+    from object_tracking.object_tracker import ObjectTracker
+    from object_tracking.initial_filter import InitialObjectFilter
+    from object_tracking.lifecycle import TrackLifecycleManager
+    from process_operations.stages import TrackingStage
+
+    ring = SharedFrameRing.attach(ring_spec)
+    tracker = ObjectTracker()
+    lifecycle = TrackLifecycleManager()
+    lifecycle.register(tracker.retire_tracks)
+    initial_filter = InitialObjectFilter(frame_count=init_frames)
+    initial_filter.reset(start_frame)
+    tracking = TrackingStage(tracker, lifecycle, initial_filter)
+
+    try:
+        while True:
+            item = _get(detection_queue, stop_event)
+            if item is _STOP:
+                break
+
+            fnum, slot, detections = item
+            tracked_objects = tracking.step(fnum, ring.frames[slot], detections)
+            feedback_queue.put(tracking.hints())
+            result_queue.put((fnum, slot, tracked_objects))
+    finally:
+        result_queue.put(_STOP)
+        _finish(result_queue, stop_event)
+        feedback_queue.cancel_join_thread()         # yalnızca ipucu; kaybı önemsiz
+        ring.close()
+
+
+# ---------------------------------------------------------------------- #
+class ProcessPipeline:
+    """
+    Kod çözme, çıkarım ve izleme ayrı süreçlerde çalışır (GIL paylaşılmaz).
+
+        decode ──(fnum, yuva)──▶ inference ──(fnum, yuva, algılamalar)──▶
+        tracking ──(fnum, yuva, izler)──▶ ana süreç (GUI)
+
+    Kareler paylaşımlı bellek halkasında kalır; kuyruklarda yalnızca küçük
+    üst veri taşınır. Ana süreç gösterdiği yuvayı bırakınca yuva boş
+    listesine döner → halka dolunca kod çözme bekler (backpressure).
+    """
+    def __init__(self, video_path, width, height, source_fps=0.0,
+                 batch_size=BATCH_SIZE, init_frames=10, start_frame=0, keyframes=None):
+        self.ctx = mp.get_context("spawn")     # CUDA ve Qt fork'u sevmez
+        self.ring = SharedFrameRing.for_budget(height, width)
+
+        self.free_queue = self.ctx.Queue()
+        for slot in range(self.ring.shape[0]):
+            self.free_queue.put(slot)
+        self.decoded_queue = self.ctx.Queue()
+        self.detection_queue = self.ctx.Queue()
+        self.feedback_queue = self.ctx.Queue()
+        self.result_queue = self.ctx.Queue()
+        self.stop_event = self.ctx.Event()
+
+        spec = self.ring.spec
+        self.processes = [
+            self.ctx.Process(
+                target=decode_worker, name="DecodeProcess", daemon=True,
+                args=(video_path, (width, height), spec, self.free_queue,
+                      self.decoded_queue, self.stop_event, start_frame, keyframes),
+            ),
+            self.ctx.Process(
+                target=inference_worker, name="InferenceProcess", daemon=True,
+                args=(spec, self.decoded_queue, self.detection_queue, self.feedback_queue,
+                      self.stop_event, source_fps, batch_size, init_frames, start_frame),
+            ),
+            self.ctx.Process(
+                target=tracking_worker, name="TrackingProcess", daemon=True,
+                args=(spec, self.detection_queue, self.result_queue, self.feedback_queue,
+                      self.stop_event, init_frames, start_frame),
+            ),
+        ]
+
+    @property
+    def capacity(self):
+        return self.ring.shape[0]
+
+    def start(self):
+        for process in self.processes:
+            process.start()
+
+    def results(self, should_stop=lambda: False):
+        """(frame_number, SlotHandle, tracked_objects) üreteci – kare sırasıyla."""
+        while not should_stop():
+            try:
+                item = self.result_queue.get(timeout=0.05)
+            except Empty:
+                if not any(p.is_alive() for p in self.processes):
+                    return                                  # alt süreç çöktü
+                continue
+            if item is _STOP:
+                return
+            fnum, slot, tracked_objects = item
+            yield fnum, SlotHandle(self.ring, slot, self.free_queue), tracked_objects
+
+    def stop(self):
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.ring.close()
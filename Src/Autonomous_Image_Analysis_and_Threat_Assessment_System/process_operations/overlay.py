@@ -0,0 +1,67 @@
+# process_operations/overlay.py
+import math
+import cv2
+
+from object_tracking.track_table import STATUS_NAMES
+
+_UNKNOWN = {"status": "Unknown", "selected": False, "threat_level": None}
+
+
+def draw_overlay(frame, tracks, object_statuses=None,
+                 friendly_zones=(), enemy_zones=(), allows=None):
+    """
+    Kutular, tehdit / sınıf / ID etiketleri ve bölgeler – ekran ve dışa
+    aktarım aynı çizimi kullanır. Kare yerinde değiştirilir ve döndürülür.
+
+    tracks          : TrackTable
+    object_statuses : GUI'deki track_id → {status, selected, threat_level};
+                      None → durum ve tehdit tablonun status / threat
+                      sütunlarından okunur (headless analiz çıktısı)
+    allows          : isteğe bağlı track_id süzgeci (başlangıç filtresi)
+    """
+    rows = zip(tracks.track_id.tolist(), tracks.bbox.tolist(), tracks.cls,
+               tracks.status.tolist(), tracks.threat.tolist())
+    for tid, (x1, y1, x2, y2), cls, status_code, threat_value in rows:
+        if allows is not None and not allows(tid):
+            continue
+
+        if object_statuses is not None:
+            status_info = object_statuses.get(tid, _UNKNOWN)
+        else:
+            status_info = {"status": STATUS_NAMES[status_code], "selected": False,
+                           "threat_level": None if math.isnan(threat_value) else threat_value}
+        status = status_info["status"]
+        selected = status_info["selected"]
+        threat = status_info["threat_level"]
+
+        if selected:
+            color = (0, 165, 255)
+        elif status == "friend":
+            color = (0, 255, 0)
+        elif status == "foe":
+            color = (0, 0, 255)
+        else:
+            color = (175, 175, 0)
+
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 1)
+
+        threat_txt = f"Threat:{int(threat)}" if threat is not None else "Threat:N/A"
+        lines = [threat_txt, f"{cls}", f"ID:{tid}"]
+        box_w = x2 - x1
+        line_h = 20
+
+        for i, txt in enumerate(lines):
+            size = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+            tx = x1 + (box_w - size[0]) // 2
+            ty = y1 - 10 - i * line_h
+            if ty < 10:
+                ty = y1 + 10 + i * line_h
+            cv2.putText(frame, txt, (tx, ty),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+    for x1, y1, x2, y2 in friendly_zones:
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    for x1, y1, x2, y2 in enemy_zones:
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
+
+    return frame
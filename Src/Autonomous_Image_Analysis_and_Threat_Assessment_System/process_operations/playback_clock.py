@@ -0,0 +1,41 @@
+# process_operations/playback_clock.py
+import time
+
+
+class PlaybackClock:
+    """
+    Sunum zamanı (PTS) tabanlı oynatma saati.
+
+    • İlk gösterilen karede (ve her devam ettirmede) duvar saatine bağlanır
+    • due(pts) → karenin ekranda olması gereken an (time.monotonic)
+    • position() → şu an gösterilmesi gereken medya zamanı; duraklatılınca None
+    • drift / dropped → arayüzde gösterilen gecikme ve atılan kare sayısı
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.anchor_wall = None
+        self.anchor_pts = 0.0
+        self.drift = 0.0            # son gösterilen karenin planlanan zamana göre gecikmesi (s)
+        self.dropped = 0            # gösterilmeden atılan kareler
+
+    def pause(self):
+        self.anchor_wall = None
+
+    @property
+    def running(self):
+        return self.anchor_wall is not None
+
+    def anchor(self, pts):
+        self.anchor_wall = time.monotonic()
+        self.anchor_pts = pts
+
+    def due(self, pts):
+        return self.anchor_wall + (pts - self.anchor_pts)
+
+    def position(self):
+        anchor_wall = self.anchor_wall          # GUI iş parçacığı aynı anda sıfırlayabilir
+        if anchor_wall is None:
+            return None
+        return self.anchor_pts + (time.monotonic() - anchor_wall)
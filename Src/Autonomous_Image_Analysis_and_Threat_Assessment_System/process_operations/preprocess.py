@@ -0,0 +1,94 @@
+# process_operations/preprocess.py
+import numpy as np
+import torch
+
+
+class BatchStager:
+    """
+    Kare batch'ini model girişine tek adımda hazırlar.
+
+    1) uint8 kareler hedef cihaza asenkron kopyalanır:
+       • pinned bellekteki kareler (kod çözücü FramePool yuvasına
+         cv2.resize(dst=...) ile yazdı) doğrudan cihaza gider, ara host
+         kopyası yok
+       • pageable kareler önce önceden ayrılmış pinned host halkasına
+         yazılır (asenkron H2D pinned kaynak ister)
+       CPU'da kopya yok – dönüşüm doğrudan çözülmüş karelerden okur.
+    2) BGR→RGB, /255, NHWC→NCHW ve dtype dönüşümü tek bir birleşik
+       çekirdekle doğrudan kalıcı `input_tensor` içine yazılır.
+
+    Karar kare başınadır: SharedDetector'ın ortak batch'i pinned GUI
+    karelerini ve pageable dışa aktarım karelerini bir arada taşıyabilir.
+    """
+    def __init__(self, backend, batch_size, height, width, slots=2):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.height = height
+        self.width = width
+        self.slots = slots
+
+        self.host_ring = None
+        self.device_u8 = None
+        if backend.is_cuda:
+            self.host_ring = torch.empty(
+                (slots, batch_size, height, width, 3),
+                dtype=torch.uint8,
+                pin_memory=True,
+            )
+            self.host_views = self.host_ring.numpy()  # numpy/cv2 yazımı için
+            self.device_u8 = torch.empty((batch_size, height, width, 3), dtype=torch.uint8,
+                                         device=backend.device)
+        self.slot_ready = [None] * slots              # slot'un H2D kopyası bitti mi?
+        self.slot = 0
+
+        self.input_tensor = backend.empty_input(batch_size, height, width)
+        self.stream = backend.new_stream()
+
+    # ------------------------------------------------------------------ #
+    def stage(self, frames):
+        """
+        frames : BGR uint8 (H,W,3) ndarray listesi (en fazla batch_size)
+        Dönüş  : input_tensor[:len(frames)] – (n,3,H,W), 0‑1, backend dtype
+        """
+        n = len(frames)
+        if n > self.batch_size:
+            raise ValueError(f"Batch of {n} exceeds stager capacity {self.batch_size}.")
+
+        out = self.input_tensor[:n]
+
+        if self.device_u8 is None:
+            # CPU: birleşik adım doğrudan kod çözücünün yazdığı karelerden okur
+            for i, frame in enumerate(frames):
+                _convert(torch.from_numpy(frame), out[i])
+            return out
+
+        slot = self.slot
+        self.slot = (slot + 1) % self.slots
+
+        # Bu slot'tan önceki asenkron kopya bitmeden üzerine yazma
+        if self.slot_ready[slot] is not None:
+            self.slot_ready[slot].synchronize()
+
+        with self.backend.stream(self.stream):
+            dev = self.device_u8[:n]
+            for i, frame in enumerate(frames):
+                src = torch.from_numpy(frame)
+                if not src.is_pinned():
+                    np.copyto(self.host_views[slot, i], frame)
+                    src = self.host_ring[slot, i]
+                dev[i].copy_(src, non_blocking=True)
+            ready = torch.cuda.Event()
+            ready.record(self.stream)
+            self.slot_ready[slot] = ready
+
+            # Birleşik adım: kanal takası + normalizasyon + düzen + dtype
+            _convert(dev, out)
+
+        self.backend.wait_stream(self.stream)
+        return out
+
+
+def _convert(src, out):
+    """uint8 BGR (..., H, W, 3) → out (..., 3, H, W): kanal takası + /255 + dtype."""
+    for c in range(3):
+        torch.mul(src[..., 2 - c], 1.0 / 255.0, out=out.select(-3, c))
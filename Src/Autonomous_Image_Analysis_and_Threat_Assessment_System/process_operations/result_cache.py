@@ -0,0 +1,251 @@
+# process_operations/result_cache.py
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from custom_models.backend import get_backend
+from custom_models.engine_cache import file_sha256
+from object_tracking.track_table import TrackTable
+from project_utils import config
+from project_utils.config import RESULT_CACHE_DIR, MODEL_PATH_HUMAN, MODEL_PATH_MILITARY_VEHICLE
+
+CACHE_VERSION = 2
+
+# Sonuçları etkileyen ayarlar – biri değişirse önbellek anahtarı da değişir
+SETTINGS_KEYS = (
+    "VIDEO_FRAME_WIDTH", "VIDEO_FRAME_HEIGHT", "INFERENCE_ENGINE",
+    "KEYFRAME_SCHEDULING", "KEYFRAME_MAX_INTERVAL", "KEYFRAME_SPIKE_THRESHOLD",
+    "KEYFRAME_DRIFT_THRESHOLD", "KEYFRAME_MOTION_REF", "KEYFRAME_TRACK_REF",
+    "TILED_INFERENCE", "TILE_SIZE", "TILE_OVERLAP", "TILE_UPSCALE", "TILE_MODE",
+    "TILE_KEYFRAME_INTERVAL", "TILE_NMS_IOU",
+    "CROSS_MODEL_SUPPRESSION", "CROSS_MODEL_IOU", "CROSS_MODEL_CONF_MARGIN",
+    "CROSS_MODEL_PRIORITY", "CROSS_MODEL_DEFAULT_PRIORITY",
+    "MAX_AGE", "N_INIT", "NMS_MAX_OVERLAP",
+    "TRACKER_BACKEND", "MOTION_HIGH_THRESH", "MOTION_NEW_TRACK_THRESH",
+    "MOTION_MATCH_IOU", "MOTION_LOW_MATCH_IOU",
+)
+
+# Giriş noktasına özgü ayarlar: GUI'de batch sınırları (anahtar kare / karo
+# planlaması) ve izleyici ipuçlarının gecikmesi bunlara bağlı. Headless analiz
+# sabit batch'le tek döngüde çalışır; anahtarlar giriş noktasıyla ayrılır,
+# biri diğerinin sonucunu oynatmaz.
+PIPELINE_SETTINGS_KEYS = {
+    "gui": ("BATCH_MODE", "TARGET_LATENCY_MS", "EXECUTION_MODE", "TRACKING_WORKER"),
+    "headless": (),
+}
+
+SAMPLE_BYTES = 4 << 20       # parmak izi için baş / orta / sondan okunan bayt
+
+
+def video_fingerprint(path, sample_bytes=SAMPLE_BYTES):
+    """
+    Video içeriğinin parmak izi: boyut + baş, orta ve son bölümlerin SHA‑256'sı.
+    Saatlik kayıtları baştan sona okumadan, dosya adından bağımsız tanır.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f:
+        for offset in sorted({0, max(0, size // 2 - sample_bytes // 2), max(0, size - sample_bytes)}):
+            f.seek(offset)
+            digest.update(f.read(sample_bytes))
+    return digest.hexdigest()
+
+
+_weights_digests = {}
+
+
+def _weights_digest(path):
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime)
+    if key not in _weights_digests:
+        _weights_digests[key] = file_sha256(path)
+    return _weights_digests[key]
+
+
+def cache_key(video_path, threshold, init_frames, pipeline, batch_size):
+    """
+    pipeline   : "gui" | "headless" – sonuçları üreten giriş noktası
+    batch_size : etkin (en büyük) batch boyutu
+    """
+    backend = get_backend()
+    names = SETTINGS_KEYS + PIPELINE_SETTINGS_KEYS[pipeline]
+    settings = {name: getattr(config, name) for name in names}
+    settings.update(
+        threshold=threshold, init_frames=init_frames, version=CACHE_VERSION,
+        pipeline=pipeline, batch_size=batch_size,
+        # DEVICE="auto" makineye göre çözülür → fp16 (CUDA) / fp32 (CPU)
+        device=backend.device, dtype=str(backend.dtype),
+    )
+
+    digest = hashlib.sha256()
+    digest.update(video_fingerprint(video_path).encode())
+    for weights in (MODEL_PATH_HUMAN, MODEL_PATH_MILITARY_VEHICLE):
+        digest.update(_weights_digest(weights).encode())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+# ---------------------------------------------------------------------- #
+class CachedResults:
+    """
+    Önbellekten okunan sonuçlar (sütunlu, mmap):
+
+    track_offsets (F+1,)  – kare i'nin iz satırları track_offsets[i]:track_offsets[i+1]
+    track_ids (N,) int32, track_boxes (N,4) int32, track_conf (N,) float32,
+    track_labels (N,) int16 → meta["labels"] tablosuna indeks
+    det_offsets / det_boxes / det_conf / det_class_ids – aynı düzende algılamalar
+    det_keyframes (F,) bool – dedektörün çalıştığı kareler (kayıtlı algılama akışı;
+                              benchmark_trackers.py izleyicileri bununla yeniden oynatır)
+    """
+    COLUMNS = ("track_offsets", "track_ids", "track_boxes", "track_conf", "track_labels",
+               "det_offsets", "det_boxes", "det_conf", "det_class_ids", "det_keyframes")
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        for name in self.COLUMNS:
+            setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+        self.labels = self.meta["labels"]
+
+    @property
+    def total_frames(self):
+        return len(self.track_offsets) - 1
+
+    def tracks(self, frame_number):
+        """Kare için TrackTable – sütunlar mmap dilimleri, kopya yok."""
+        if not 0 <= frame_number < self.total_frames:
+            return TrackTable.empty(self.labels)
+        a, b = int(self.track_offsets[frame_number]), int(self.track_offsets[frame_number + 1])
+        return TrackTable(self.track_ids[a:b], self.track_boxes[a:b], self.track_conf[a:b],
+                          self.track_labels[a:b], self.labels)
+
+
+class ResultCacheWriter:
+    """
+    Kare sonuçlarını sırayla biriktirir; video baştan sona işlendiyse
+    finish() ile önbelleğe atomik olarak yazar.
+
+    Gerçek zamanlı oynatmanın atladığı kareler (bkz. VideoProcessor._drop_stale)
+    boş, anahtar kare olmayan kayıtlarla doldurulur; sayıları meta["skipped"]
+    içinde tutulur. Yalnızca geriye / tekrar eden kare (sıra bozulması)
+    önbelleği geçersiz kılar.
+    """
+    def __init__(self, directory, class_names=()):
+        self.directory = directory
+        self.class_names = list(class_names)
+        self.label_index = {}
+        self.next_frame = 0
+        self.skipped = 0
+        self.broken = False
+
+        self.tracks = []             # kare başına (ids, boxes, conf, labels)
+        self.dets = []               # kare başına (boxes, conf, class_ids)
+        self.keyframes = []          # kare başına: dedektör çalıştı mı
+
+    def add(self, frame_number, tracks, detections=None):
+        """tracks: TrackTable; detections: anahtar karenin FrameDetections'ı, ara karelerde None."""
+        if self.broken:
+            return
+        if frame_number < self.next_frame:           # sıra bozuldu → yazma
+            self.broken = True
+            return
+        while self.next_frame < frame_number:        # atlanan kareler → boş kayıt
+            self._append_empty()
+            self.skipped += 1
+        self.next_frame += 1
+
+        # İzleyicinin etiket kodları → önbelleğin etiket tablosu
+        remap = np.array(
+            [self.label_index.setdefault(name, len(self.label_index)) for name in tracks.labels],
+            dtype=np.int16,
+        )
+        labels = remap[tracks.label] if len(tracks) else np.zeros(0, dtype=np.int16)
+        self.tracks.append((
+            tracks.track_id.astype(np.int32), tracks.bbox.astype(np.int32),
+            tracks.conf.astype(np.float32), labels,
+        ))
+
+        self.keyframes.append(detections is not None)
+        if detections is not None:
+            if not self.class_names:
+                self.class_names = list(detections.class_names)
+            self.dets.append((detections.boxes, detections.conf, detections.class_ids))
+        else:
+            self.dets.append(_NO_DETECTIONS)
+
+    def _append_empty(self):
+        self.next_frame += 1
+        self.tracks.append((np.zeros(0, np.int32), np.zeros((0, 4), np.int32),
+                            np.zeros(0, np.float32), np.zeros(0, np.int16)))
+        self.keyframes.append(False)
+        self.dets.append(_NO_DETECTIONS)
+
+    def finish(self):
+        if self.broken or self.next_frame == 0:
+            return False
+
+        columns = {}
+        columns["track_offsets"] = _offsets([t[0] for t in self.tracks])
+        for i, name in enumerate(("track_ids", "track_boxes", "track_conf", "track_labels")):
+            columns[name] = np.concatenate([t[i] for t in self.tracks])
+        columns["det_offsets"] = _offsets([d[1] for d in self.dets])
+        for i, name in enumerate(("det_boxes", "det_conf", "det_class_ids")):
+            columns[name] = np.concatenate([d[i] for d in self.dets])
+        columns["det_keyframes"] = np.array(self.keyframes, dtype=bool)
+
+        meta = {
+            "version": CACHE_VERSION,
+            "frames": self.next_frame,
+            "skipped": self.skipped,
+            "labels": sorted(self.label_index, key=self.label_index.get),
+            "class_names": self.class_names,
+        }
+
+        # Geçici klasöre yaz, sonra tek adımda yerine taşı
+        tmp = self.directory + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name, array in columns.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), array)
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.replace(tmp, self.directory)
+        skipped = f", {self.skipped} skipped" if self.skipped else ""
+        print(f"Results cached: {self.directory} ({self.next_frame} frames{skipped})")
+        return True
+
+
+_NO_DETECTIONS = (np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int32))
+
+
+def _offsets(parts):
+    offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in parts], out=offsets[1:])
+    return offsets
+
+
+# ---------------------------------------------------------------------- #
+class ResultCache:
+    """Video + ağırlık + ayar anahtarlı, diskte kalıcı sonuç önbelleği."""
+    def __init__(self, cache_dir=RESULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        directory = self.path(key)
+        if not os.path.isfile(os.path.join(directory, "meta.json")):
+            return None
+        try:
+            return CachedResults(directory)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Result cache entry unreadable ({e}); ignoring.")
+            return None
+
+    def writer(self, key, class_names=()):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return ResultCacheWriter(self.path(key), class_names)
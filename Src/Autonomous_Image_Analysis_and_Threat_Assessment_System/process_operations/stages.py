@@ -0,0 +1,86 @@
+# process_operations/stages.py
+"""
+Algılama ve izleme aşamaları – GUI (VideoProcessor), headless analiz
+(VideoAnalyzer) ve süreç hattı (mp_pipeline) aynı kodu çağırır; hatlar
+yalnızca aşamaları nasıl bağladıklarıyla (iş parçacığı, süreç, üreteç)
+ve izleyici ipuçlarını nereden aldıklarıyla ayrılır.
+"""
+from object_detection.shared_detector import StreamDetector
+from process_operations.preprocess import BatchStager
+
+
+class DetectionStage:
+    """
+    Batch → kare başına FrameDetections | None.
+
+    • Anahtar kare seçimi: KeyframeScheduler; başlangıç filtresi
+      penceresindeki her kare algılanır (izler onaylansın)
+    • Yalnızca anahtar kareler dedektöre gider: SharedDetector istemcisi
+      kareleri ortak BatchStager'a bırakır; yerel dedektör için stager ilk
+      çıkarımda (batch_size, height, width) boyutunda ayrılır
+    • İzleyici durumu (iz sayısı, aktif kutular) çağırandan gelir – her hat
+      kendi kaynağını kullanır (TrackHints, geri besleme kuyruğu, izleyicinin
+      kendisi)
+    """
+    def __init__(self, backend, scheduler, initial_filter, threshold, batch_size, height, width):
+        self.backend = backend
+        self.scheduler = scheduler
+        self.initial_filter = initial_filter
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.height = height
+        self.width = width
+        self.stager = None
+
+    def run(self, detector, frames, frame_numbers, num_tracks, track_boxes):
+        if self.scheduler is not None:
+            is_key = [
+                self.scheduler.is_keyframe(frame, num_tracks)
+                or self.initial_filter.in_window(fnum)
+                for frame, fnum in zip(frames, frame_numbers)
+            ]
+        else:
+            is_key = [True] * len(frames)
+
+        key_frames = [frame for frame, key in zip(frames, is_key) if key]
+        detections_iter = iter(())
+        if key_frames:
+            detections_iter = iter(self._detect(detector, key_frames, track_boxes))
+            self.backend.synchronize()
+
+        return [next(detections_iter) if key else None for key in is_key]
+
+    def _detect(self, detector, frames, track_boxes):
+        if isinstance(detector, StreamDetector):
+            return detector.detect_frames(frames, self.threshold, track_boxes)
+
+        # Ön işleme (uint8 → birleşik dönüşüm) + iki model, sütunlu sonuç
+        if self.stager is None:
+            self.stager = BatchStager(self.backend, self.batch_size, self.height, self.width)
+        return detector.detect_batch(
+            self.stager.stage(frames), self.threshold, track_boxes=track_boxes
+        )
+
+
+class TrackingStage:
+    """
+    Kare kare: update_tracks (anahtar kare) | coast → yaşam döngüsü gözlemi
+    (başlangıç filtresinden önce – gizlenen izler de izleyicide yer tutar)
+    → başlangıç filtresi.
+    """
+    def __init__(self, tracker, lifecycle, initial_filter):
+        self.tracker = tracker
+        self.lifecycle = lifecycle
+        self.initial_filter = initial_filter
+
+    def step(self, frame_number, frame, detections):
+        if detections is not None:
+            tracks = self.tracker.update_tracks(detections, frame)
+        else:
+            tracks = self.tracker.coast()
+        self.lifecycle.observe(tracks.track_id.tolist())
+        return self.initial_filter.apply(frame_number, tracks)
+
+    def hints(self):
+        """DetectionStage için izleyici durumu: (iz sayısı, aktif kutular)."""
+        return len(self.tracker.memory), self.tracker.active_boxes()
@@ -0,0 +1,42 @@
+# process_operations/track_hints.py
+import threading
+import numpy as np
+
+
+class TrackHints:
+    """
+    İzleme iş parçacığından çıkarım iş parçacığına izleyici ipuçları:
+    (iz sayısı, aktif kutular) – anahtar kare seçimi ve karo bölgeleri için.
+
+    • İzleme her batch'ten sonra publish() ile o anki durumu yayınlar
+    • Çıkarım wait(n) ile tam olarak n batch izlendikten sonraki durumu alır
+      (gerekirse bekler). "Son yayınlanan" değil belirli bir batch sonrası
+      istendiğinden ipuçları iş parçacığı zamanlamasından bağımsızdır →
+      aynı girdi, aynı anahtar kareler, aynı izler
+    • Eski durumlar ilk istenende atılır; en fazla birkaç batch tutulur
+    """
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.reset()
+
+    def reset(self):
+        with self.cond:
+            self.published = 0
+            self.states = {0: (0, np.zeros((0, 4), dtype=np.float32))}   # batch sayısı → durum
+
+    def publish(self, num_tracks, active_boxes):
+        with self.cond:
+            self.published += 1
+            self.states[self.published] = (num_tracks, active_boxes)
+            self.cond.notify_all()
+
+    def wait(self, batches, should_stop=lambda: False, poll=0.05):
+        """`batches` batch izlendikten sonraki (iz sayısı, kutular); durdurulursa None."""
+        with self.cond:
+            while batches not in self.states:
+                if should_stop():
+                    return None
+                self.cond.wait(poll)
+            for old in [k for k in self.states if k < batches]:
+                del self.states[old]
+            return self.states[batches]
@@ -0,0 +1,56 @@
+# process_operations/video_export.py
+import threading
+from queue import Queue
+import cv2
+from project_utils.config import EXPORT_QUEUE_FRAMES, EXPORT_FOURCC
+
+_STOP = None
+
+
+class VideoExporter:
+    """
+    Açıklamalı kareleri ayrı bir kodlayıcı iş parçacığında MP4'e yazar.
+
+    • write() kareyi sınırlı kuyruğa koyar; kodlayıcı yetişemezse bekler
+      (backpressure) – bellek kuyruk boyuyla sınırlı kalır
+    • Kodlama, çizim / analiz ile örtüşür; önbellekten ya da headless
+      moddan gelen izlerle dışa aktarım gerçek zamandan hızlı çalışır
+    • Kodlayıcı hatası bir sonraki write() / close() çağrısında yükseltilir
+    """
+    def __init__(self, path, fps, size, queue_size=EXPORT_QUEUE_FRAMES, fourcc=EXPORT_FOURCC):
+        self.path = path
+        self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps or 25.0, size)
+        if not self.writer.isOpened():
+            raise IOError(f"Could not open video writer: {path}")
+
+        self.queue = Queue(maxsize=queue_size)
+        self.error = None
+        self.frames = 0
+        self.thread = threading.Thread(target=self._encode, daemon=True, name="VideoEncoderThread")
+        self.thread.start()
+
+    def write(self, frame):
+        """frame: BGR uint8; çağıran kareyi sonradan değiştirmemeli (kuyrukta bekler)."""
+        if self.error is not None:
+            raise self.error
+        self.queue.put(frame)
+
+    def close(self):
+        self.queue.put(_STOP)
+        self.thread.join()
+        self.writer.release()
+        if self.error is not None:
+            raise self.error
+
+    def _encode(self):
+        while True:
+            frame = self.queue.get()
+            if frame is _STOP:
+                return
+            if self.error is not None:
+                continue                     # hata sonrası kuyruğu boşalt, çağıranı bekletme
+            try:
+                self.writer.write(frame)
+                self.frames += 1
+            except cv2.error as e:
+                self.error = e
@@ -3,14 +3,31 @@ import cv2
 import threading
 import time
 import numpy as np
-import torch
 import logging
 from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtCore import QTimer
+from custom_models.backend import get_backend
 from object_tracking.object_tracker import ObjectTracker
+from object_tracking.initial_filter import InitialObjectFilter
+from object_tracking.lifecycle import TrackLifecycleManager
+from object_tracking.track_table import TrackTable
+from process_operations.batcher import AdaptiveBatcher
+from process_operations.keyframe_scheduler import KeyframeScheduler
+from process_operations.decode_pool import ParallelDecoder
+from process_operations.frame_pool import FramePool
+from process_operations.mp_pipeline import ProcessPipeline
+from process_operations.frame_index import seek_capture
+from process_operations.result_cache import ResultCache, cache_key
+from process_operations.playback_clock import PlaybackClock
+from process_operations.overlay import draw_overlay
+from process_operations.track_hints import TrackHints
+from process_operations.stages import DetectionStage, TrackingStage
 from queue import Queue, Full, Empty
 
-from project_utils.config import BATCH_SIZE
+from project_utils.config import (
+    BATCH_SIZE, KEYFRAME_SCHEDULING, DECODE_WORKERS, DECODE_SEGMENT_FRAMES, EXECUTION_MODE,
+    TRACKING_WORKER, FRAME_POOL_MEMORY_MB, RESULT_CACHE, PLAYBACK_MODE, REALTIME_LATE_TOLERANCE_S, REALTIME_SKIP_INFERENCE
+)
 
 
 class FPSCounter:
@@ -25,66 +42,191 @@ class FPSCounter:
 
 
 class VideoProcessor:
-    def __init__(self, app, display_width, display_height):
+    def __init__(self, app, display_width, display_height, pool_memory_mb=FRAME_POOL_MEMORY_MB):
         self.app = app
-        self.object_detector = app.object_detector
         self.object_tracker = ObjectTracker()
 
+        # Ölü izlerin durumu: izleyici eşlemeleri hemen (izleme iş parçacığı),
+        # tehdit geçmişi ve object_statuses GUI iş parçacığında (play_video → drain)
+        self.track_lifecycle = TrackLifecycleManager()
+        self.track_lifecycle.register(self.object_tracker.retire_tracks)
+        self.track_lifecycle.register(self._retire_display_state, deferred=True)
+
         self.frames_queue = None
         self.processed_frames_queue = None
+        self.total_frames = 0
+        self.video_path = None
+        self.start_frame = 0
+        self.frame_index = None        # arka planda kurulan kare dizini (FrameIndex)
 
-        self.current_tracked_objects = []
+        self.current_tracked_objects = TrackTable.empty()
         self.frame = None
+        self.frame_handle = None       # ekrandaki karenin havuz yuvası
+        self.frame_pool = None
+        self.pool_memory_mb = pool_memory_mb
         self.stop_processing = False
         self.batch_size = BATCH_SIZE
+        self.batcher = AdaptiveBatcher(max_batch=self.batch_size)
+        self.detection_threshold = 0.1
 
         self.fps_counter = FPSCounter()
 
-        # CUDA stream’ler
-        self.stream_a = torch.cuda.Stream()
-        self.stream_b = torch.cuda.Stream()
-        self.stream_c = torch.cuda.Stream()
+        # Cihaza göre precision / bellek düzeni / stream'ler
+        self.backend = get_backend()
 
         self.input_h = display_height
         self.input_w = display_width
-        self.input_tensor = torch.empty(
-            (self.batch_size, 3, self.input_h, self.input_w),
-            device=self.object_detector.human_detector.device,
-            dtype=torch.half
-        )
+
+
+        # Dedektörü yalnızca anahtar karelerde çalıştır, arada izleyici tahmin etsin
+        self.keyframe_scheduler = KeyframeScheduler() if KEYFRAME_SCHEDULING else None
 
         self.frame_reading_thread = None
         self.inference_thread = None
+        self.tracking_thread = None
+
+        # İzleme ayrı iş parçacığında: batch N izlenirken batch N+1 çıkarımda.
+        # Çıkarım izleyici durumunu TrackHints'ten bir batch geriden okur.
+        self.tracking_worker = TRACKING_WORKER
+        self.detections_queue = None   # (kareler, algılamalar) batch'leri, FIFO
+        self.track_hints = TrackHints()
+        self.inference_batches = 0     # çıkarımdan geçen batch sayısı
+
+        # EXECUTION_MODE == "processes" → aşamalar ayrı süreçlerde
+        self.execution_mode = EXECUTION_MODE
+        self.pipeline = None
+        self.result_thread = None
+
+        # Canlı kaynak (RTSP/UDP, V4L2, FIFO) – None → dosya
+        self.live_source = None
+        self.live_latency = 0.0        # son gösterilen karenin yakalama→ekran gecikmesi (s)
+
+        # Kalıcı sonuç önbelleği: isabet → çıkarım yerine kayıttan oynat,
+        # ıskalama → baştan sona işlenen video kaydedilir
+        self.result_cache = ResultCache() if RESULT_CACHE else None
+        self.cached_results = None
+        self.cache_writer = None
+
+        # Gerçek zamanlı oynatma: PTS saatine göre göster, geride kalanı at
+        self.realtime = PLAYBACK_MODE == "realtime"
+        self.clock = PlaybackClock()
+        self.pending_frame = None      # erken gelen, zamanı bekleyen kare
+        self.skipped_frames = 0        # algılamaya girmeden atlanan kareler
 
         # ---<EKLENDİ>---  Başlangıç nesne filtresi
-        self.initial_object_ids = set()
-        self.initialization_done = False
-        self.initialization_frame_count = 10          # ilk N kare
+        self.initial_filter = InitialObjectFilter(frame_count=10)
         # ---<EKLENDİ>---
 
+        # Headless analiz ve süreç hattıyla ortak algılama / izleme aşamaları
+        # Kareler pinned FramePool yuvalarından doğrudan cihaza; paylaşılan
+        # dedektörde ön işleme SharedDetector'ın ortak stager'ında yapılır
+        self.detection_stage = DetectionStage(
+            self.backend, self.keyframe_scheduler, self.initial_filter,
+            self.detection_threshold, self.batch_size, self.input_h, self.input_w,
+        )
+        self.tracking_stage = TrackingStage(self.object_tracker, self.track_lifecycle,
+                                            self.initial_filter)
+
         self.timer = QTimer()
         self.timer.timeout.connect(self.play_video)
 
+    @property
+    def object_detector(self):
+        # Dedektör arka planda yüklenip uygulamaya sonradan bağlanabilir
+        return self.app.object_detector
+
     # ------------------------------------------------------------------ #
     # 1 – Başlat / durdur
     # ------------------------------------------------------------------ #
-    def start_processing_on_selection(self, video_path, display_width, display_height):
+    def start_processing_on_selection(self, video_path, display_width, display_height,
+                                      live_source=None, start_frame=0):
         self.stop_processing_frames()
         self.stop_processing = False
+        self.live_source = live_source
+        self.video_path = video_path
+        self.start_frame = start_frame
+        self.object_tracker.reset()
+        self.clock.reset()
+        self.skipped_frames = 0
 
         # ---<EKLENDİ>---  filtreyi sıfırla
-        self.initial_object_ids.clear()
-        self.initialization_done = False
+        self.initial_filter.reset(start_frame)
         # ---<EKLENDİ>---
 
+        if self.keyframe_scheduler is not None:
+            self.keyframe_scheduler.reset()
+
+        if live_source is not None:
+            self._start_live(display_width, display_height)
+            return
+
         cap_info = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
         total_frames = int(cap_info.get(cv2.CAP_PROP_FRAME_COUNT))
+        source_fps = cap_info.get(cv2.CAP_PROP_FPS)
         cap_info.release()
+        self.total_frames = total_frames
+        if total_frames > 0:
+            self.batch_size = min(self.batch_size, total_frames)
+
+        self._open_result_cache(video_path, start_frame)
+
+        if self.execution_mode == "processes" and self.cached_results is None:
+            self._start_process_pipeline(video_path, display_width, display_height, source_fps)
+            return
+
+        # Sabit boyutlu kare havuzu: kuyruklar havuzdan büyük olamaz,
+        # havuz dolunca okuyucu bekler (backpressure)
+        self.frame_pool = FramePool(display_height, display_width, self.pool_memory_mb,
+                                    pin_memory=self.backend.is_cuda)
+        self.frames_queue = Queue(maxsize=self.frame_pool.capacity)
+        self.processed_frames_queue = Queue(maxsize=self.frame_pool.capacity)
 
-        self.frames_queue = Queue(maxsize=total_frames)
-        self.processed_frames_queue = Queue(maxsize=total_frames)
-        self.batch_size = min(self.batch_size, total_frames)
+        # Gecikme/işlem hacmi dengesine göre uyarlanan batch boyutu
+        self.batcher = AdaptiveBatcher(max_batch=self.batch_size)
+        self.batcher.set_source_fps(source_fps)
 
+        self._start_threads(video_path, display_width, display_height)
+
+    def _open_result_cache(self, video_path, start_frame):
+        self.cached_results = None
+        self.cache_writer = None
+        if self.result_cache is None:
+            return
+
+        try:
+            key = cache_key(video_path, self.detection_threshold, self.initial_filter.frame_count,
+                            "gui", self.batch_size)
+        except OSError as e:
+            print(f"Result cache disabled for this video ({e}).")
+            return
+
+        self.cached_results = self.result_cache.load(key)
+        if self.cached_results is not None:
+            print(f"Result cache hit: {self.cached_results.total_frames} frames, skipping inference.")
+        elif start_frame == 0:
+            # Yalnızca baştan kesintisiz işlenen videolar kaydedilir
+            self.cache_writer = self.result_cache.writer(key)
+
+    def _start_live(self, display_width, display_height):
+        """
+        Canlı kaynak: kare sayısı bilinmez, kaynak beklemez. Kuyruklar kısa
+        tutulur; işlem yetişemezse LatestFrameBuffer en eski kareyi atar,
+        böylece gecikme birikmez. Süreç modu dosyalar içindir → iş parçacığı.
+        """
+        self.total_frames = 0
+        self.live_source.start()
+
+        self.frame_pool = FramePool(display_height, display_width, self.pool_memory_mb,
+                                    pin_memory=self.backend.is_cuda)
+        self.frames_queue = Queue(maxsize=self.batch_size)
+        self.processed_frames_queue = Queue(maxsize=self.batch_size)
+
+        self.batcher = AdaptiveBatcher(max_batch=self.batch_size, mode="latency")
+        self.batcher.set_source_fps(self.live_source.fps)
+
+        self._start_threads(self.live_source.path, display_width, display_height)
+
+    def _start_threads(self, video_path, display_width, display_height):
         self.frame_reading_thread = threading.Thread(
             target=self.read_frames,
             args=(video_path, display_width, display_height),
@@ -93,155 +235,403 @@ class VideoProcessor:
         )
 
         self.inference_thread = threading.Thread(
-            target=self.process_frames,
+            target=self.replay_frames if self.cached_results is not None else self.process_frames,
             daemon=True,
             name="InferenceThread"
         )
 
+        self.detections_queue = None
+        self.track_hints.reset()
+        self.inference_batches = 0
+        if self.tracking_worker and self.cached_results is None:
+            # Derinlik 2: biri izlenirken bir sonraki kuyrukta bekleyebilir
+            self.detections_queue = Queue(maxsize=2)
+            self.tracking_thread = threading.Thread(
+                target=self.track_batches,
+                daemon=True,
+                name="TrackingThread"
+            )
+            self.tracking_thread.start()
+
         self.frame_reading_thread.start()
         self.inference_thread.start()
 
+    def _start_process_pipeline(self, video_path, display_width, display_height, source_fps):
+        self.pipeline = ProcessPipeline(
+            video_path, display_width, display_height, source_fps,
+            batch_size=self.batch_size,
+            init_frames=self.initial_filter.frame_count,
+            start_frame=self.start_frame,
+            keyframes=self._keyframes(),
+        )
+        self.processed_frames_queue = Queue(maxsize=self.pipeline.capacity)
+        self.pipeline.start()
+
+        self.result_thread = threading.Thread(
+            target=self.receive_results,
+            daemon=True,
+            name="ResultThread"
+        )
+        self.result_thread.start()
+
     def stop_processing_frames(self):
         self.stop_processing = True
 
-        for thread in [self.frame_reading_thread, self.inference_thread]:
+        for thread in [self.frame_reading_thread, self.inference_thread, self.tracking_thread,
+                       self.result_thread]:
             if thread is not None and thread.is_alive():
                 thread.join(timeout=5)
 
-        if self.frames_queue:
-            with self.frames_queue.mutex:
-                self.frames_queue.queue.clear()
-        if self.processed_frames_queue:
-            with self.processed_frames_queue.mutex:
-                self.processed_frames_queue.queue.clear()
+        # İzlenmeyi bekleyen batch'lerin yuvaları
+        if self.detections_queue is not None:
+            with self.detections_queue.mutex:
+                pending = list(self.detections_queue.queue)
+                self.detections_queue.queue.clear()
+            for job in pending:
+                if job is not None:
+                    for data in job[0]:
+                        data["handle"].release()
+            self.detections_queue = None
+
+        for queue in (self.frames_queue, self.processed_frames_queue):
+            if queue:
+                with queue.mutex:
+                    pending = list(queue.queue)
+                    queue.queue.clear()
+                for data in pending:
+                    if data is not None:
+                        data["handle"].release()
+
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+
+        # Yarıda kalan kayıt önbelleğe yazılmaz
+        self.cache_writer = None
+
+        if self.pending_frame is not None:
+            self.pending_frame["handle"].release()
+            self.pending_frame = None
+        self.clock.pause()
+
+    def seek(self, frame_number):
+        """
+        Dosyada kare-doğru atlama: işlem hattı hedef karenin GOP'undan yeniden
+        başlatılır, izleyici ve başlangıç filtresi sıfırlanır.
+        """
+        if self.live_source is not None or not self.video_path:
+            return False
+
+        last = (self.frame_index.total_frames if self.frame_index is not None
+                else self.total_frames) - 1
+        frame_number = int(np.clip(frame_number, 0, max(0, last)))
+
+        self.start_processing_on_selection(
+            self.video_path, self.input_w, self.input_h, start_frame=frame_number
+        )
+        return True
 
     # ------------------------------------------------------------------ #
     # 2 – Frame okuma
     # ------------------------------------------------------------------ #
     def read_frames(self, video_path, display_width, display_height):
-        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 2)
-        frame_number = 0
+        for frame_number, handle, capture_ts in self._decoded_frames(video_path, display_width, display_height):
+            data = {"frame_number": frame_number, "frame": handle.array, "handle": handle,
+                    "capture_ts": capture_ts}
 
-        while not self.stop_processing:
-            ret, frame = cap.read()
-            if not ret:
+            if not self._put(self.frames_queue, data):
+                handle.release()
                 break
 
-            frame = cv2.resize(frame, (display_width, display_height))
-            data = {"frame_number": frame_number, "frame": frame}
+        # Dosya sonu → None (bekleyen batch'i işle, sonuçları önbelleğe yaz)
+        if self.live_source is None:
+            self._put(self.frames_queue, None)
+
+    def _put(self, queue, item):
+        """Durdurulana kadar kuyruğa koymayı dener; başarılıysa True."""
+        while not self.stop_processing:
+            try:
+                queue.put(item, timeout=0.05)
+                return True
+            except Full:
+                time.sleep(0.005)
+        return False
+
+    def _decoded_frames(self, video_path, display_width, display_height):
+        """
+        (frame_number, FrameHandle, capture_ts) üreteci – kare sırasıyla.
+        Kareler doğrudan havuz yuvalarına yeniden boyutlandırılır;
+        capture_ts yalnızca canlı kaynaklarda dolu (time.monotonic).
+        """
+        size = (display_width, display_height)
+
+        # Canlı kaynak: yakalama iş parçacığının tamponundaki en güncel kareler
+        if self.live_source is not None:
+            frame_number = 0
+            for capture_ts, frame in self.live_source.frames(lambda: self.stop_processing):
+                handle = self._acquire_slot()
+                if handle is None:
+                    break
+                cv2.resize(frame, size, dst=handle.array)
+                yield frame_number, handle, capture_ts
+                frame_number += 1
+            return
+
+        # Uzun dosyalar: GOP parçalarını paralel çöz, sırayla birleştir
+        remaining = self.total_frames - self.start_frame
+        if DECODE_WORKERS > 1 and remaining >= 2 * DECODE_SEGMENT_FRAMES:
+            # Anahtar kareler zaman çizelgesinin arka plan dizininden okunur;
+            # dizin gelene dek parçalar kare sayısıyla bölünür (bkz. ParallelDecoder)
+            for frame_number, handle in ParallelDecoder(
+                video_path, size, self.total_frames, self.frame_pool,
+                keyframes=self._keyframes, start_frame=self.start_frame,
+                should_stop=lambda: self.stop_processing,
+            ):
+                yield frame_number, handle, None
+            return
+
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 2)
+        seek_capture(cap, self.start_frame, self._keyframes())
+        frame_number = self.start_frame
 
+        try:
             while not self.stop_processing:
-                try:
-                    self.frames_queue.put(data, timeout=0.05)
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                handle = self._acquire_slot()
+                if handle is None:
                     break
-                except Full:
-                    time.sleep(0.005)
 
-            frame_number += 1
+                cv2.resize(frame, size, dst=handle.array)
+                yield frame_number, handle, None
+                frame_number += 1
+        finally:
+            cap.release()
 
-        cap.release()
+    def _keyframes(self):
+        return self.frame_index.keyframes if self.frame_index is not None else None
 
+    def _acquire_slot(self):
+        """Havuzdan boş yuva al; durdurulursa None."""
+        handle = None
+        while handle is None and not self.stop_processing:
+            handle = self.frame_pool.acquire(timeout=0.05)
+        return handle
+
+
+    def receive_results(self):
+        """Süreç modu: izleme sürecinin sonuçlarını gösterim kuyruğuna aktarır."""
+        for fnum, handle, tracked_objects in self.pipeline.results(lambda: self.stop_processing):
+            self.track_lifecycle.observe(tracked_objects.track_id.tolist())
+            processed = {
+                "frame_number": fnum,
+                "frame": handle.array,
+                "handle": handle,
+                "tracked_objects": tracked_objects
+            }
+            if self.cache_writer is not None:
+                self.cache_writer.add(fnum, tracked_objects)
+
+            if not self._put(self.processed_frames_queue, processed):
+                handle.release()
+
+        if not self.stop_processing:
+            self._finish_cache()
+
+    def replay_frames(self):
+        """Önbellek isabeti: çözülen karelere kayıtlı izleri ekler, çıkarım yok."""
+        cached = self.cached_results
+        while not self.stop_processing:
+            try:
+                data = self.frames_queue.get(timeout=0.05)
+            except Empty:
+                continue
+            if data is None:
+                continue
+
+            fnum = data["frame_number"]
+            tracked_objects = cached.tracks(fnum)
+            self.track_lifecycle.observe(tracked_objects.track_id.tolist())
+            processed = {
+                "frame_number": fnum,
+                "frame": data["frame"],
+                "handle": data["handle"],
+                "capture_ts": None,
+                "tracked_objects": tracked_objects
+            }
+            if not self._put(self.processed_frames_queue, processed):
+                data["handle"].release()
+
+    def _finish_cache(self):
+        writer, self.cache_writer = self.cache_writer, None
+        if writer is not None:
+            try:
+                writer.finish()
+            except OSError as e:
+                print(f"Result cache write failed: {e}")
 
     # ------------------------------------------------------------------ #
     # 3 – Inference + tracking
     # ------------------------------------------------------------------ #
     def process_frames(self):
         batch = []
-        last_time = time.time()
+        first_arrival = last_arrival = time.time()
 
         while not self.stop_processing:
             try:
-                data = self.frames_queue.get(timeout=0.05)
+                data = self.frames_queue.get(timeout=0.01)
+                if data is None:                 # dosya sonu
+                    if batch:
+                        self._run_batch(batch)
+                        batch = []
+                    self._end_of_stream()
+                    continue
+                last_arrival = time.time()
+                if not batch:
+                    first_arrival = last_arrival
                 batch.append(data)
-
-                if len(batch) >= self.batch_size:
-                    self.process_batch(batch)
-                    batch = []
-                    last_time = time.time()
-
             except Empty:
-                if batch and (time.time() - last_time > 0.2):
-                    self.process_batch(batch)
-                    batch = []
-                    last_time = time.time()
+                pass
+
+            now = time.time()
+            if self.batcher.should_flush(
+                pending=len(batch),
+                oldest_wait=now - first_arrival,
+                idle_time=now - last_arrival,
+                display_backlog=self.processed_frames_queue.qsize(),
+            ):
+                self._run_batch(batch)
+                batch = []
 
         if batch:
-            self.process_batch(batch)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        t0 = time.perf_counter()
+        self.process_batch(batch)
+        self.batcher.record(len(batch), time.perf_counter() - t0)
+
+    def _end_of_stream(self):
+        """Önbellek, son batch izlendikten sonra yazılır (izleme iş parçacığı varsa orada)."""
+        if self.detections_queue is None:
+            self._finish_cache()
+        else:
+            self._put(self.detections_queue, None)
+
+    def _drop_stale(self, frames):
+        """
+        Gerçek zamanlı oynatmada oynatma konumunun gerisinde kalmış kareler
+        hiç gösterilmeyecek → algılamaya sokmadan havuza geri ver. Batch'in
+        en yeni karesi her zaman işlenir; başlangıç penceresi atlanmaz.
+        Önbellek yazıcısı atlanan kareleri boş kayıt olarak doldurur.
+        """
+        if not (self.realtime and REALTIME_SKIP_INFERENCE) or self.live_source is not None:
+            return frames
+        position = self.clock.position()
+        if position is None:
+            return frames
+
+        kept = []
+        for d in frames[:-1]:
+            fnum = d["frame_number"]
+            if self._pts(fnum) < position and not self.initial_filter.in_window(fnum):
+                d["handle"].release()
+                self.skipped_frames += 1
+            else:
+                kept.append(d)
+        kept.append(frames[-1])
+        return kept
+
+    def _pts(self, frame_number):
+        """Kare sunum zamanı (s): dizin varsa gerçek PTS, yoksa fps'den."""
+        index = self.frame_index
+        if index is not None and frame_number < index.total_frames:
+            return float(index.pts[frame_number])
+        return frame_number / max(1.0, self.app.fps or 0.0)
 
     def process_batch(self, frames_batch):
-        valid = [d for d in frames_batch if isinstance(d["frame"], np.ndarray)]
+        valid = []
+        for d in frames_batch:
+            if isinstance(d["frame"], np.ndarray):
+                valid.append(d)
+            else:
+                d["handle"].release()
+        valid = self._drop_stale(valid)
         if not valid:
             return
 
-        batch_len = len(valid)
-
-        # --- STREAM A --- #
-        with torch.cuda.stream(self.stream_a):
-            frames = [
-                cv2.cvtColor(d["frame"], cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
-                for d in valid
-            ]
-            frames_np = np.stack(frames).transpose(0, 3, 1, 2)
-            temp_tensor = torch.from_numpy(frames_np).to(dtype=torch.half, non_blocking=True)
-            self.input_tensor[:batch_len].copy_(temp_tensor.to(self.input_tensor.device))
-
-        # --- STREAM B --- #
-        with torch.cuda.stream(self.stream_b):
-            with torch.inference_mode():
-                input_tensor = self.input_tensor[:batch_len]
-                human_res = self.object_detector.human_detector.model.predict(
-                    input_tensor, stream=False, verbose=False
-                )
-                vehicle_res = self.object_detector.vehicle_detector.model.predict(
-                    input_tensor, stream=False, verbose=False
-                )
-
-        # --- STREAM C --- #
-        with torch.cuda.stream(self.stream_c):
-            detections_batch = []
-            for hr, vr in zip(human_res, vehicle_res):
-                dets = []
-                dets.extend(self.object_detector._parse(hr, self.object_detector.human_names, 0.1))
-                dets.extend(self.object_detector._parse(vr, self.object_detector.vehicle_names, 0.1))
-                detections_batch.append(dets)
-
-        torch.cuda.synchronize()
+        # İzleyici ipuçları (iz sayısı, aktif kutular)
+        hints = self._track_hints()
+        if hints is None:                          # durduruldu
+            for d in valid:
+                d["handle"].release()
+            return
+        num_tracks, track_boxes = hints
+
+        # --- ANAHTAR KARE SEÇİMİ + ÖN İŞLEME + İKİ MODEL --- #
+        detections = self.detection_stage.run(
+            self.object_detector, [d["frame"] for d in valid],
+            [d["frame_number"] for d in valid], num_tracks, track_boxes,
+        )
+
+        # --- Takip: ayrı iş parçacığında (sonraki batch'in çıkarımıyla örtüşür) --- #
+        if self.detections_queue is None:
+            self.track_batch(valid, detections)
+        elif not self._put(self.detections_queue, (valid, detections)):
+            for d in valid:
+                d["handle"].release()
+
+    def _track_hints(self):
+        """
+        Anahtar kare seçimi ve karo bölgeleri için izleyici durumu.
+        İzleme iş parçacığında batch k'nin çıkarımı batch k-1 izlenirken
+        çalışır → ipucu tam olarak k-1 batch izlendikten sonraki durumdur
+        (zamanlamadan bağımsız). İş parçacığı yoksa güncel durum.
+        """
+        batch = self.inference_batches
+        self.inference_batches += 1
+        if self.detections_queue is None:
+            return self.tracking_stage.hints()
+        return self.track_hints.wait(max(0, batch - 1), lambda: self.stop_processing)
+
+    def track_batches(self):
+        """İzleme iş parçacığı: batch'ler çıkarım sırasıyla (FIFO) izlenir."""
+        while not self.stop_processing:
+            try:
+                job = self.detections_queue.get(timeout=0.05)
+            except Empty:
+                continue
+            if job is None:                      # dosya sonu
+                self._finish_cache()
+                continue
+            self.track_batch(*job)
 
+    def track_batch(self, valid, detections):
         # --- Takip & Filtre --- #
-        for data, detections in zip(valid, detections_batch):
+        for data, frame_detections in zip(valid, detections):
             frame = data["frame"]
             fnum = data["frame_number"]
-            tracked_objects = self.object_tracker.update_tracks(detections, frame)
-
-            # ---<EKLENDİ 1>---  İlk N karede görülen ID’leri topla
-            if not self.initialization_done:
-                for obj in tracked_objects:
-                    self.initial_object_ids.add(obj["track_id"])
-                if fnum + 1 >= self.initialization_frame_count:
-                    self.initialization_done = True
-            # ---<EKLENDİ 1>---
-
-            # ---<EKLENDİ 2>---  Yeni nesneleri tamamen yok say
-            if self.initialization_done:
-                tracked_objects = [
-                    obj for obj in tracked_objects
-                    if obj["track_id"] in self.initial_object_ids
-                ]
-            # ---<EKLENDİ 2>---
+            # update / coast → yaşam döngüsü → ilk N karedeki ID’ler dışındakileri yok say
+            tracked_objects = self.tracking_stage.step(fnum, frame, frame_detections)
+
+            if self.cache_writer is not None:
+                self.cache_writer.add(fnum, tracked_objects, frame_detections)
 
             processed = {
                 "frame_number": fnum,
                 "frame": frame,
+                "handle": data["handle"],
+                "capture_ts": data["capture_ts"],
                 "tracked_objects": tracked_objects
             }
+            if not self._put(self.processed_frames_queue, processed):
+                data["handle"].release()
 
-            while not self.stop_processing:
-                try:
-                    self.processed_frames_queue.put(processed, timeout=0.05)
-                    break
-                except Full:
-                    time.sleep(0.005)
+        if self.detections_queue is not None:
+            self.track_hints.publish(*self.tracking_stage.hints())
 
     # ------------------------------------------------------------------ #
     # 4 – GUI (Qt ana thread)
@@ -249,16 +639,35 @@ class VideoProcessor:
     def play_video(self):
         if self.app.cap is None or not self.app.playing:
             return
-        try:
-            processed = self.processed_frames_queue.get_nowait()
-        except Empty:
-            self.timer.start(int(1000 / max(1, self.app.fps)))
+        interval_ms = int(1000 / max(1, self.app.fps))
+
+        processed = self._next_frame()
+        if processed is None:
+            self.timer.start(interval_ms)
             return
 
+        if self.realtime and self.live_source is None:
+            processed, wait = self._pace(processed)
+            if wait > 0:
+                # Erken geldi → zamanı gelene kadar beklet
+                self.pending_frame = processed
+                self.timer.start(max(1, int(wait * 1000)))
+                return
+
+        # Önceki karenin yuvası artık gösterilmiyor → havuza geri ver
+        if self.frame_handle is not None:
+            self.frame_handle.release()
+        self.frame_handle = processed["handle"]
+
         self.app.current_frame = processed["frame_number"]
+        self.app.timeline.set_position(self.app.current_frame)
         self.frame = processed["frame"]
+        if processed.get("capture_ts") is not None:
+            self.live_latency = time.monotonic() - processed["capture_ts"]
         self.current_tracked_objects = processed["tracked_objects"]
+        self._update_playback_stats()
 
+        self.track_lifecycle.drain()
         self.app.threat_assessment.perform_threat_assessment(self.app)
 
         display_frame = self.draw_boxes(self.frame.copy(), self.current_tracked_objects)
@@ -268,61 +677,72 @@ class VideoProcessor:
         q_img = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
         self.app.video_label.setPixmap(QPixmap.fromImage(q_img))
 
-        self.timer.start(int(1000 / max(1, self.app.fps)))
+        # Gerçek zamanlı modda sıradaki kare hemen alınır, zamanı _pace belirler
+        self.timer.start(1 if self.realtime and self.live_source is None else interval_ms)
+
+    def _next_frame(self):
+        processed, self.pending_frame = self.pending_frame, None
+        if processed is not None:
+            return processed
+        try:
+            return self.processed_frames_queue.get_nowait()
+        except Empty:
+            return None
+
+    def _pace(self, processed):
+        """
+        Kareyi PTS saatine göre zamanla. Geç kalmış kare, kuyrukta daha
+        yenisi varsa gösterilmeden atılır (drop). Dönüş: (kare, bekleme s);
+        bekleme ≤ 0 → hemen göster.
+        """
+        pts = self._pts(processed["frame_number"])
+        if not self.clock.running:
+            self.clock.anchor(pts)          # ilk kare / devam → saati buna bağla
+            self.clock.drift = 0.0
+            return processed, 0.0
+
+        now = time.monotonic()
+        while now - self.clock.due(pts) > REALTIME_LATE_TOLERANCE_S:
+            try:
+                newer = self.processed_frames_queue.get_nowait()
+            except Empty:
+                break
+            processed["handle"].release()
+            self.clock.dropped += 1
+            processed = newer
+            pts = self._pts(processed["frame_number"])
+
+        wait = self.clock.due(pts) - now
+        if wait <= 0:
+            self.clock.drift = -wait
+        return processed, wait
+
+    def _update_playback_stats(self):
+        if self.live_source is not None:
+            drift, dropped = self.live_latency, self.live_source.dropped
+        elif self.realtime:
+            drift, dropped = self.clock.drift, self.clock.dropped + self.skipped_frames
+        else:
+            return
+        self.app.timeline.set_stats(drift, dropped)
+
+    def _retire_display_state(self, app_ids):
+        """TrackLifecycleManager (GUI iş parçacığı): ölü izlerin tehdit ve durum kayıtları."""
+        self.app.threat_assessment.retire_tracks(app_ids)
+        statuses = self.app.object_statuses
+        for app_id in app_ids:
+            statuses.pop(app_id, None)
 
     # ------------------------------------------------------------------ #
     # 5 – Box çizimi
     # ------------------------------------------------------------------ #
     def draw_boxes(self, frame, tracked_objects):
-        for obj in tracked_objects:
-            tid_num = obj["track_id"]
-
-            # ---<EKLENDİ 3>---  Güvenlik: çizimden önce de filtrele
-            if self.initialization_done and tid_num not in self.initial_object_ids:
-                continue
-            # ---<EKLENDİ 3>---
-
-            tid = str(tid_num)
-            x1, y1, x2, y2 = map(int, obj["bbox"])
-
-            status_info = self.app.object_statuses.get(
-                tid, {"status": "Unknown", "selected": False, "threat_level": None}
-            )
-            status = status_info["status"]
-            selected = status_info["selected"]
-            threat = status_info["threat_level"]
-
-            if selected:
-                color = (0, 165, 255)
-            elif status == "friend":
-                color = (0, 255, 0)
-            elif status == "foe":
-                color = (0, 0, 255)
-            else:
-                color = (175, 175, 0)
-
-            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 1)
-
-            threat_txt = f"Threat:{int(threat)}" if threat is not None else "Threat:N/A"
-            lines = [threat_txt, f"{obj['cls']}", f"ID:{tid}"]
-            box_w = x2 - x1
-            line_h = 20
-
-            for i, txt in enumerate(lines):
-                size = cv2.getTextSize(txt, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
-                tx = x1 + (box_w - size[0]) // 2
-                ty = y1 - 10 - i * line_h
-                if ty < 10:
-                    ty = y1 + 10 + i * line_h
-                cv2.putText(frame, txt, (tx, ty),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-
-        for x1, y1, x2, y2 in self.app.friendly_zones:
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-        for x1, y1, x2, y2 in self.app.enemy_zones:
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
-
-        return frame
+        # ---<EKLENDİ 3>---  Güvenlik: çizimden önce de filtrele
+        return draw_overlay(
+            frame, tracked_objects, self.app.object_statuses,
+            self.app.friendly_zones, self.app.enemy_zones,
+            allows=self.initial_filter.allows,
+        )
 
     # -------------------------------------------------------------- #
     # 6 – Elle yeniden çizim (GUI tetiklemeli)
@@ -1,14 +1,123 @@
 # utils/config.py
 BATCH_SIZE = 16
 
+# Adaptive batching
+# "throughput" → her zaman BATCH_SIZE (çevrim dışı dosyalar)
+# "latency"    → hedef uçtan uca gecikmeye göre batch (canlı yayın)
+BATCH_MODE = "throughput"
+TARGET_LATENCY_MS = 150
+DISPLAY_LOW_WATERMARK = 2     # gösterim kuyruğu bu kadar kareye düşerse erken gönder
+IDLE_FLUSH_S = 0.2            # yeni kare gelmezse bekleyen batch'i gönder
+
 SCALE = 1
 
-# DeepSort configuration
+# Video çerçeve (ve model girişi) boyutları – 32'nin katı
+VIDEO_FRAME_WIDTH  = (int(1600 * SCALE) // 32) * 32
+VIDEO_FRAME_HEIGHT = (int(896  * SCALE) // 32) * 32
+
+# Execution backend
+# "auto" → CUDA varsa GPU (fp16), yoksa CPU (fp32 + channels_last)
+DEVICE = "auto"
+# CPU intra-op iş parçacığı sayısı (0 → çekirdek sayısı)
+CPU_THREADS = 0
+
+# Parallel decode – uzun dosyalar GOP parçalarına bölünüp paralel çözülür
+DECODE_WORKERS = 4            # 1 → tek iş parçacıklı okuma
+DECODE_SEGMENT_FRAMES = 64    # parça başına yaklaşık kare (GOP sınırına hizalanır)
+
+# Execution mode
+# "threads"   → okuma / çıkarım / izleme aynı süreçte iş parçacıkları
+# "processes" → her aşama ayrı süreçte, kareler paylaşımlı bellek halkasında
+EXECUTION_MODE = "threads"
+# "threads" modunda izleme ayrı iş parçacığında: batch N izlenirken batch N+1
+# çıkarımda. Anahtar kare / karo ipuçları izleyiciden bir batch geriden gelir
+# (belirlenimci). False → her batch algılamanın hemen ardından aynı iş parçacığında izlenir
+TRACKING_WORKER = True
+
+# Kare havuzu – çözülmüş kareler için önceden ayrılan sabit bellek (MB).
+# Havuz dolunca okuyucu bekler; video uzunluğundan bağımsız sabit bellek.
+FRAME_POOL_MEMORY_MB = 768
+
+# Live sources (RTSP/UDP, /dev/video*, FIFO)
+LIVE_BUFFER_FRAMES = 2        # en yeni N kare tutulur, eskiler atılır (drop-oldest)
+LIVE_RECONNECT_MIN_S = 0.5    # bağlantı koparsa ilk bekleme; her denemede 2 katına çıkar
+LIVE_RECONNECT_MAX_S = 10.0
+
+# Multi-stream sessions – birden çok akış tek dedektörü paylaşır
+SHARED_BATCH_WAIT_MS = 5      # batch dolmadıysa diğer akışları bekleme süresi
+MULTI_STREAM_POOL_MB = 256    # akış başına kare havuzu (FRAME_POOL_MEMORY_MB yerine)
+MULTI_STREAM_COLUMNS = 2      # çoklu akış penceresinde sütun sayısı
+
+# Annotated export – açıklamalı MP4, ayrı kodlayıcı iş parçacığı
+EXPORT_QUEUE_FRAMES = 32      # kodlayıcı kuyruğu (dolunca çizim bekler)
+EXPORT_FOURCC = "mp4v"
+
+# Playback pacing
+# "realtime" → kareler sunum zamanına (PTS) göre gösterilir, geride kalanlar atlanır
+# "every"    → her kare sırayla, zamanlayıcı aralığıyla gösterilir (geride kalabilir)
+PLAYBACK_MODE = "realtime"
+REALTIME_LATE_TOLERANCE_S = 0.04   # bu kadar geç kalan kare, daha yenisi hazırsa atlanır
+REALTIME_SKIP_INFERENCE = True     # oynatma konumunun gerisindeki kareler algılamaya girmez
+
+# Timeline – kaydırma çubuğu önizlemeleri (yalnızca anahtar karelerden)
+TIMELINE_THUMBNAILS = 48
+TIMELINE_THUMB_WIDTH = 192
+
+# Keyframe scheduling – dedektörler yalnızca anahtar karelerde çalışır,
+# aradaki karelerde izleyici Kalman tahminiyle ilerler
+KEYFRAME_SCHEDULING = True
+KEYFRAME_MAX_INTERVAL = 4       # durağan sahnede en fazla kaç karede bir algılama
+KEYFRAME_SPIKE_THRESHOLD = 12.0 # ardışık kare gri fark ortalaması (0‑255) → hemen algıla
+KEYFRAME_DRIFT_THRESHOLD = 8.0  # son anahtar kareden biriken fark → hemen algıla
+KEYFRAME_MOTION_REF = 4.0       # bu hareket düzeyinde aralık yarıya iner
+KEYFRAME_TRACK_REF = 20         # bu kadar canlı izde aralık yarıya iner
+
+# Tiled (sliced) inference – küçük / uzak hedefler için
+TILED_INFERENCE = False
+TILE_SIZE = (320, 320)        # (w, h) – kare üzerindeki karo boyutu
+TILE_OVERLAP = 0.2            # komşu karoların örtüşme oranı
+TILE_UPSCALE = 2              # karo modele bu oranla büyütülerek verilir (×32 olmalı)
+TILE_MODE = "tracks"          # "full" → her batch tam ızgara, "tracks" → izlerin çevresi
+TILE_KEYFRAME_INTERVAL = 5    # "tracks" modunda kaç batch'te bir tam ızgara
+TILE_BATCH = 32               # tek ileri geçişteki en fazla karo
+TILE_NMS_IOU = 0.5            # karolar arası birleştirme NMS eşiği
+
+# Cross-model duplicate suppression (insan ↔ araç modeli)
+CROSS_MODEL_SUPPRESSION = True
+CROSS_MODEL_IOU = 0.5               # bu IoU ve üstü aynı nesne sayılır
+CROSS_MODEL_CONF_MARGIN = 0.15      # düşük öncelikli kutu bu kadar daha güvenliyse korunur
+CROSS_MODEL_PRIORITY = {"person": 0}  # sınıf adı → öncelik (büyük olan kazanır)
+CROSS_MODEL_DEFAULT_PRIORITY = (0, 1) # tabloda olmayan sınıflar: (insan modeli, araç modeli)
+
+# DeepSort configuration – kare cinsinden; anahtar kare planlamasında
+# arka uçlar isabet / güncelleme sayacına ölçekler (backends.keyframes_for)
 MAX_AGE = 60
 N_INIT = 5
 NMS_MAX_OVERLAP = 0.5
 
+# İzleyici arka ucu: "deepsort" (deep_sort_realtime) | "motion" (numpy Kalman + Macar,
+# ByteTrack tarzı iki aşamalı eşleştirme – binlerce iz / s, tek çekirdek)
+TRACKER_BACKEND = "deepsort"
+MOTION_HIGH_THRESH = 0.3          # bu güvenin üstü ilk aşamada eşleştirilir (altı: ikinci aşama)
+MOTION_NEW_TRACK_THRESH = 0.3     # eşleşmeyen algılamadan yeni iz için en düşük güven
+MOTION_MATCH_IOU = 0.2            # ilk aşama (yüksek güven) en düşük IoU
+MOTION_LOW_MATCH_IOU = 0.5        # ikinci aşama (düşük güven, yalnızca onaylı izler)
+
+# İz yaşam döngüsü – ölü izlerin durumu (APP‑ID eşlemeleri, tehdit geçmişi,
+# GUI durumları) bellekten atılır; uzun görevlerde bellek ve kare başı maliyet sabit kalır
+TRACK_RETENTION_FRAMES = 300      # bu kadar işlenmiş kare görünmeyen iz emekli edilir
+TRACK_STATE_MAX_IDS = 5000        # bellek tavanı: aşılırsa en uzun süredir görünmeyenler atılır
+TRACK_GC_INTERVAL = 30            # emeklilik taraması kaç karede bir
+
 # Model configuration
+# Çıkarım motoru: "pytorch" (.pt) | "onnx" | "torchscript"
+# ONNX / TorchScript motorları ilk açılışta dışa aktarılır ve önbelleğe alınır
+INFERENCE_ENGINE = "pytorch"
+ENGINE_CACHE_DIR = '../custom_models/engine_cache'
+# Sonuç önbelleği – video içeriği + ağırlıklar + ayarlar anahtarlı algılama / iz kaydı.
+# Aynı video yeniden açılınca çıkarım yapılmaz, sonuçlar diskten okunur.
+RESULT_CACHE = True
+RESULT_CACHE_DIR = '../result_cache'
 # İnsan tespiti için model ağırlık dosyası
 MODEL_PATH_HUMAN = '../custom_models/person_model.pt'
 # Askeri araç tespiti için model ağırlık dosyası
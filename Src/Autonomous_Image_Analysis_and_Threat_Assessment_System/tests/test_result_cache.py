@@ -0,0 +1,32 @@
+# tests/test_result_cache.py
+import numpy as np
+
+from object_tracking.track_table import TrackTable
+from process_operations.result_cache import CachedResults, ResultCacheWriter
+
+
+def _tracks(track_id):
+    return TrackTable(np.array([track_id], np.int32), np.array([[1, 2, 3, 4]], np.int32),
+                      np.array([0.9], np.float32), np.array([0], np.int16), ["person"])
+
+
+def test_skipped_frames_are_cached_as_empty(tmp_path):
+    directory = str(tmp_path / "entry")
+    writer = ResultCacheWriter(directory)
+    for fnum in (0, 1, 4, 5):                 # 2 ve 3 gerçek zamanlı oynatmada atlandı
+        writer.add(fnum, _tracks(fnum + 1))
+    assert writer.finish()
+
+    cached = CachedResults(directory)
+    assert cached.total_frames == 6
+    assert cached.meta["skipped"] == 2
+    assert [len(cached.tracks(f)) for f in range(6)] == [1, 1, 0, 0, 1, 1]
+    assert cached.tracks(4).track_id.tolist() == [5]
+    assert not cached.det_keyframes.any()
+
+
+def test_out_of_order_frame_discards_cache(tmp_path):
+    writer = ResultCacheWriter(str(tmp_path / "entry"))
+    for fnum in (0, 1, 1):
+        writer.add(fnum, _tracks(1))
+    assert not writer.finish()
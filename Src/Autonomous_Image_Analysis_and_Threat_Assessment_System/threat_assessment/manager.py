@@ -2,9 +2,9 @@
 from collections import defaultdict
 import numpy as np
 
-
+from object_tracking.track_table import STATUS_CODES, UNKNOWN, FRIEND, FOE
 from .config import THREAT_COEFF, PIXEL_TO_METER
-from .core   import ObjectState, TrackHistory
+from .core   import TrackHistory
 
 class ThreatAssessment:
     def __init__(self):
@@ -15,181 +15,141 @@ class ThreatAssessment:
         self.prev_threat  = defaultdict(float)
 
     # --------------------------------------------------------------
-    def update(self, tracked_objects, *, friendly_zones=None, enemy_zones=None):
-        states = [self._to_state(o) for o in tracked_objects]
-
-        for st in states:
-            self.histories[st.track_id].add(st.center)
-        zone_centers = [
-            np.array([(x1+x2)*0.5, (y1+y2)*0.5]) * PIXEL_TO_METER
-            for (x1, y1, x2, y2) in (friendly_zones or [])
-        ]
-
-        # --------------- DÖNGÜ: Her nesne ---------------
-        for st in states:
-            base    = self.base_coeff.get(st.cls, 1)
-            history = self.histories[st.track_id]
-
-            # ---------- FRIEND ----------
-            if st.status == "friend":
-                st.threat = 0.0
-                self.prev_threat[st.track_id] = 0.0
-                continue
-
-            # ==========================================================
-            # ---------- UNKNOWN  (dost + düşman bölgeleri) ------------
-            # ==========================================================
-            if st.status == "unknown":
-                dist_extra_sum = 0.0
-                vel_score_sum  = 0.0
-
-                # Dost ve düşman bölge merkezleri
-                friend_centers = zone_centers
-                enemy_centers  = [
-                    np.array([(x1+x2)*0.5, (y1+y2)*0.5]) * PIXEL_TO_METER
-                    for (x1, y1, x2, y2) in (enemy_zones or [])
-                ]
-                all_centers = friend_centers + enemy_centers
-
-                # Mesafeye göre katsayı
-                def factor_by_dist(d: float) -> float:
-                    if d > 100:   return 1.0
-                    elif d > 90:  return 1.3
-                    elif d > 80:  return 1.6
-                    elif d > 70:  return 1.9
-                    elif d > 60:  return 2.2
-                    elif d > 50:  return 2.5
-                    elif d > 40:  return 2.8
-                    elif d > 30:  return 3.1
-                    elif d > 20:  return 3.4
-                    elif d > 10:  return 3.7
-                    else:         return 4.0        # 0–10 m
-
-                # Her merkez için katkı
-                for c in all_centers:
-                    d      = np.linalg.norm(st.center - c)
-                    factor = factor_by_dist(d)
-
-                    if factor > 1.0:                          # ≤100 m
-                        dist_extra_sum += base * (factor - 1.0)
-
-                    # Hız bileşeni
-                    v     = history.velocity()
-                    speed = np.linalg.norm(v)
-                    if speed >= 1e-3:
-                        dir_vec = c - st.center
-                        dist    = np.linalg.norm(dir_vec)
-                        if dist >= 1e-3:
-                            dir_vec /= dist
-                            speed_towards = np.dot(v, dir_vec)
-                            vel_score_sum += max(
-                                0.0,
-                                speed_towards / (10 * PIXEL_TO_METER)
-                            )
-
-                st.threat = round(base + dist_extra_sum + vel_score_sum, 2)
-
-            # ==========================================================
-            # --------------------  FOE  -------------------------------
-            # ==========================================================
-            elif st.status == "foe":
-                dist_score_sum = 0.0
-                vel_score_sum  = 0.0
-
-                if not zone_centers:                 # dost bölgesi tanımsız
-                    dist_score_sum = base * 2
-
-                for c in zone_centers:
-                    d = np.linalg.norm(st.center - c)
-
-                    # 5 m'lik dilimler
-                    if d > 100:      factor = 1.0
-                    elif d > 95:     factor = 1.2
-                    elif d > 90:     factor = 1.4
-                    elif d > 85:     factor = 1.6
-                    elif d > 80:     factor = 1.8
-                    elif d > 75:     factor = 2.0
-                    elif d > 70:     factor = 2.2
-                    elif d > 65:     factor = 2.4
-                    elif d > 60:     factor = 2.6
-                    elif d > 55:     factor = 2.8
-                    elif d > 50:     factor = 3.0
-                    elif d > 45:     factor = 3.2
-                    elif d > 40:     factor = 3.4
-                    elif d > 35:     factor = 3.6
-                    elif d > 30:     factor = 3.8
-                    elif d > 25:     factor = 4.0
-                    elif d > 20:     factor = 4.2
-                    elif d > 15:     factor = 4.4
-                    elif d > 10:     factor = 4.6
-                    elif d > 5:      factor = 4.8
-                    else:            factor = 5.0
-
-                    dist_score_sum += (base * 2) * factor
-
-                    # Hız bileşeni
-                    v     = history.velocity()
-                    speed = np.linalg.norm(v)
-                    if speed >= 1e-3:
-                        dir_vec = c - st.center
-                        dist    = np.linalg.norm(dir_vec)
-                        if dist >= 1e-3:
-                            dir_vec /= dist
-                            speed_towards = np.dot(v, dir_vec)
-                            vel_score_sum += max(
-                                0.0,
-                                speed_towards / (10 * PIXEL_TO_METER)
-                            )
-
-                if dist_score_sum == 0.0:
-                    dist_score_sum = base * 2
-
-                st.threat = round(dist_score_sum + vel_score_sum, 2)
-
-            # ==========================================================
-            # ------------ KARARLILIK (Histerezis) --------------------
-            # ==========================================================
-            THR_HYST = 1.0                 # ±1 puan içindeki salınımları bastır
-            prev = self.prev_threat[st.track_id]
-            new  = st.threat
-
-            if new > prev and (new - prev) < THR_HYST:
-                new = prev
-            elif new < prev and (prev - new) < THR_HYST:
-                new = prev
-
-            self.prev_threat[st.track_id] = new
-            st.threat = new
-
-
-        return [vars(s) for s in states]
+    def update(self, tracks, *, friendly_zones=None, enemy_zones=None, unassigned=None):
+        """
+        tracks: TrackTable (status sütunu dolu) → threat sütunu yazılır, tablo
+        döner. Tüm nesneler × bölge merkezleri tek seferde hesaplanır.
+
+        unassigned: (n,) bool – durumu henüz atanmamış izler (GUI'de seçilmiş,
+        sınıflandırılmamış); skorlanmaz → 0, yalnızca histerezis uygulanır
+        """
+        n   = len(tracks)
+        ids = tracks.track_id.tolist()
+        centers = tracks.centers() * PIXEL_TO_METER          # METRE
+        for tid, c in zip(ids, centers):
+            self.histories[tid].add(c)
+
+        friend_centers = _zone_centers(friendly_zones)
+        enemy_centers  = _zone_centers(enemy_zones)
+        base   = tracks.label_values(self.base_coeff, default=1)
+        status = tracks.status
+        v      = np.array([self.histories[tid].velocity() for tid in ids]).reshape(n, 2)
+        threat = np.zeros(n)
+        scored = np.ones(n, dtype=bool) if unassigned is None else ~unassigned
+
+        # ==========================================================
+        # ---------- UNKNOWN  (dost + düşman bölgeleri) ------------
+        # ==========================================================
+        unknown = scored & (status == UNKNOWN)
+        if unknown.any():
+            all_centers = np.concatenate([friend_centers, enemy_centers])
+            b, c, vel   = base[unknown], centers[unknown], v[unknown]
+
+            # Mesafeye göre katsayı (10 m'lik dilimler, ≤100 m'de artar)
+            d       = _distances(c, all_centers)
+            factor  = UNKNOWN_FACTORS[np.searchsorted(UNKNOWN_BINS, d)]
+            dist_extra_sum = np.where(factor > 1.0, b[:, None] * (factor - 1.0), 0.0).sum(axis=1)
+
+            threat[unknown] = np.round(
+                b + dist_extra_sum + _approach_score(c, vel, all_centers), 2
+            )
+
+        # ==========================================================
+        # --------------------  FOE  -------------------------------
+        # ==========================================================
+        foe = scored & (status == FOE)
+        if foe.any():
+            b, c, vel = base[foe], centers[foe], v[foe]
+
+            if len(friend_centers):
+                d      = _distances(c, friend_centers)          # 5 m'lik dilimler
+                factor = FOE_FACTORS[np.searchsorted(FOE_BINS, d)]
+                dist_score_sum = ((b * 2)[:, None] * factor).sum(axis=1)
+                dist_score_sum = np.where(dist_score_sum == 0.0, b * 2, dist_score_sum)
+            else:                                               # dost bölgesi tanımsız
+                dist_score_sum = b * 2
+
+            threat[foe] = np.round(dist_score_sum + _approach_score(c, vel, friend_centers), 2)
+
+        # ==========================================================
+        # ------------ KARARLILIK (Histerezis) --------------------
+        # ==========================================================
+        # FRIEND → 0, histerezis yok; diğerlerinde ±THR_HYST içindeki
+        # salınımlar bastırılır
+        prev = np.array([self.prev_threat[tid] for tid in ids], dtype=np.float64)
+        friend = status == FRIEND
+        steady = ~friend & (np.abs(threat - prev) < THR_HYST)
+        threat = np.where(steady, prev, threat)
+
+        for tid, value in zip(ids, threat.tolist()):
+            self.prev_threat[tid] = value
+
+        tracks.threat = threat
+        return tracks
 
     # ------------------------------------------------------------------
     def perform_threat_assessment(self, app):
-        tracked = app.video_processor.current_tracked_objects
-        for obj in tracked:
-            tid = str(obj["track_id"])
-            obj["status"] = app.object_statuses.get(tid, {}).get("status", "unknown")
-
-        scored = self.update(
-            tracked,
-            friendly_zones=app.friendly_zones,
-            enemy_zones   =app.enemy_zones
+        tracks   = app.video_processor.current_tracked_objects
+        statuses = app.object_statuses
+        ids      = tracks.track_id.tolist()
+
+        # Kaydı olmayan iz → "unknown"; kaydı olup durumu None olan (seçilmiş,
+        # sınıflandırılmamış) iz skorlanmaz
+        names = [statuses.get(tid, {}).get("status", "unknown") for tid in ids]
+        tracks.status = np.fromiter(
+            (STATUS_CODES.get(name, UNKNOWN) for name in names),
+            dtype=np.int8, count=len(ids),
         )
+        unassigned = np.fromiter((name is None for name in names), dtype=bool, count=len(ids))
+        self.update(tracks, friendly_zones=app.friendly_zones, enemy_zones=app.enemy_zones,
+                    unassigned=unassigned)
 
-
-        for obj in scored:
-            tid = str(obj["track_id"])
-            app.object_statuses.setdefault(tid, {"status":"unknown","selected":False,"threat_level":1.0})
-            app.object_statuses[tid]["threat_level"] = obj["threat"]
+        for tid, threat in zip(ids, tracks.threat.tolist()):
+            statuses.setdefault(tid, {"status":"unknown","selected":False,"threat_level":1.0})
+            statuses[tid]["threat_level"] = threat
 
     # ------------------------------------------------------------------
-    @staticmethod
-    def _to_state(o: dict) -> ObjectState:
-        return ObjectState(
-            track_id=o["track_id"],
-            cls=o["cls"],
-            status=o.get("status", "unknown"),
-            bbox=tuple(o["bbox"]),
-            conf=o.get("conf", 0.0),
-        )
\ No newline at end of file
+    def retire_tracks(self, track_ids):
+        """Ölü izlerin merkez geçmişi ve histerezis durumunu sil (TrackLifecycleManager)."""
+        for tid in track_ids:
+            self.histories.pop(tid, None)
+            self.prev_threat.pop(tid, None)
+            self.first_dist.pop(tid, None)
+
+
+# ----------------------------------------------------------------------
+# Mesafe katsayı tabloları: searchsorted(BINS, d) → d'den küçük eşik sayısı
+UNKNOWN_BINS    = np.arange(10, 101, 10, dtype=np.float64)          # 10, 20 … 100 m
+UNKNOWN_FACTORS = np.array([4.0, 3.7, 3.4, 3.1, 2.8, 2.5, 2.2, 1.9, 1.6, 1.3, 1.0])
+FOE_BINS        = np.arange(5, 101, 5, dtype=np.float64)            # 5, 10 … 100 m
+FOE_FACTORS     = np.array([5.0, 4.8, 4.6, 4.4, 4.2, 4.0, 3.8, 3.6, 3.4, 3.2, 3.0,
+                            2.8, 2.6, 2.4, 2.2, 2.0, 1.8, 1.6, 1.4, 1.2, 1.0])
+THR_HYST        = 1.0                 # ±1 puan içindeki salınımları bastır
+
+
+def _zone_centers(zones):
+    """Bölge dikdörtgenleri → (Z,2) merkez, METRE."""
+    zones = np.asarray(zones or [], dtype=np.float64).reshape(-1, 4)
+    return np.stack([(zones[:, 0] + zones[:, 2]) * 0.5,
+                     (zones[:, 1] + zones[:, 3]) * 0.5], axis=1) * PIXEL_TO_METER
+
+
+def _distances(centers, zone_centers):
+    """(n,2) × (Z,2) → (n,Z) öklid mesafesi."""
+    return np.linalg.norm(zone_centers[None, :, :] - centers[:, None, :], axis=2)
+
+
+def _approach_score(centers, velocity, zone_centers):
+    """
+    Hız bileşeni: her bölge merkezine doğru hız (yalnızca yaklaşma) /
+    (10 px → m), bölgeler üzerinden toplam → (n,).
+    """
+    if len(zone_centers) == 0:
+        return np.zeros(len(centers))
+    dir_vec = zone_centers[None, :, :] - centers[:, None, :]          # (n,Z,2)
+    dist    = np.linalg.norm(dir_vec, axis=2)
+    speed   = np.linalg.norm(velocity, axis=1)
+    towards = np.einsum("nzk,nk->nz", dir_vec, velocity) / np.maximum(dist, 1e-3)
+    score   = np.maximum(0.0, towards / (10 * PIXEL_TO_METER))
+    valid   = (speed >= 1e-3)[:, None] & (dist >= 1e-3)
+    return np.where(valid, score, 0.0).sum(axis=1)
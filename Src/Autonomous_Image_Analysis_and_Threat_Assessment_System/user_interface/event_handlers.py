@@ -1,13 +1,20 @@
 # user_interface/event_handlers.py
+import os
 import cv2
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QInputDialog, QProgressDialog
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QImage, QPixmap
 from threat_assessment.config import PIXEL_TO_METER
+from process_operations.live_source import LiveSource, is_live_source
+from user_interface.timeline import TimelineWorker
+from user_interface.export_worker import ExportWorker
 import numpy as np
 
 class EventHandlers:
     def __init__(self, app):
         self.app = app
+        self.timeline_worker = None
+        self.export_worker = None
 
     # --- Action Button Functions ---
     def select_object(self):
@@ -158,6 +165,10 @@ class EventHandlers:
 
     # --- Video Control Functions ---
     def open_video(self):
+        if self.app.object_detector is None:
+            QMessageBox.information(self.app, "Please wait", "Detection models are still loading.")
+            return
+
         # Stop existing video and reset state before opening a new one
         self.stop_video()
         self.app.reset_app_state()
@@ -173,52 +184,197 @@ class EventHandlers:
         )
 
         if video_path:
-            self.app.video_path = video_path
-            self.app.cap = cv2.VideoCapture(self.app.video_path)
-            if not self.app.cap.isOpened():
-                QMessageBox.critical(self.app, "Error", "An error occurred while opening the video.")
-                self.app.cap = None
-                self.app.video_path = None
-                return
-
-            self.app.fps = self.app.cap.get(cv2.CAP_PROP_FPS)
-            self.app.display_width = self.app.video_frame_width
-            self.app.display_height = self.app.video_frame_height
-            self.app.current_frame = 0
-
-            # 1) İşlemeye başla, ama oynatma başlatma
-            self.app.video_processor.stop_processing_frames()
-            self.app.video_processor.start_processing_on_selection(
-                video_path=self.app.video_path,
-                display_width=self.app.display_width,
-                display_height=self.app.display_height
-            )
-
-            # 2) Kuyruktan ilk işlenmiş frame'i al, önizleme olarak göster
-            try:
-                first = self.app.video_processor.processed_frames_queue.get(timeout=5)
-                frame = first["frame"]
-                objs  = first["tracked_objects"]
-                disp = self.app.video_processor.draw_boxes(frame.copy(), objs)
-
-                rgb = cv2.cvtColor(disp, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb.shape
-                bytes_per_line = ch * w
-                q_img = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(q_img)
-                self.app.video_label.setPixmap(pixmap)
-            except Exception as e:
-                print("Önizleme yüklenirken hata:", e)
-
-            # 3) Play tuşunu aktif, pause tuşunu pasif yap
-            if hasattr(self.app, 'play_button') and hasattr(self.app, 'pause_button'):
-                self.app.play_button.setEnabled(True)
-                self.app.pause_button.setEnabled(False)
+            if self._open_file(video_path):
+                self.start_source()
         else:
             self.app.video_label.clear()
             self.app.video_path = None
             print("No video selected.")
 
+    def open_stream(self):
+        """Canlı kaynak aç: RTSP/UDP URL, /dev/videoN, kamera indeksi ya da FIFO."""
+        if self.app.object_detector is None:
+            QMessageBox.information(self.app, "Please wait", "Detection models are still loading.")
+            return
+
+        path, ok = QInputDialog.getText(
+            self.app, "Open Stream", "Stream URL, device or named pipe:"
+        )
+        path = path.strip()
+        if not ok or not path:
+            return
+
+        self.stop_video()
+        self.app.reset_app_state()
+
+        if not is_live_source(path):
+            # Sıradan dosya yolu girildiyse dosya gibi aç
+            if self._open_file(path):
+                self.start_source()
+            return
+
+        source = LiveSource(path)
+        if not source.open():
+            QMessageBox.critical(self.app, "Error", f"Could not open live source:\n{path}")
+            return
+
+        # LiveSource, VideoCapture gibi release() sunar → app.cap olarak tutulur
+        self.app.video_path = path
+        self.app.cap = source
+        self.app.fps = source.fps or 25
+        self.start_source(live_source=source)
+
+    def _open_file(self, video_path):
+        self.app.video_path = video_path
+        self.app.cap = cv2.VideoCapture(self.app.video_path)
+        if not self.app.cap.isOpened():
+            QMessageBox.critical(self.app, "Error", "An error occurred while opening the video.")
+            self.app.cap = None
+            self.app.video_path = None
+            return False
+
+        self.app.fps = self.app.cap.get(cv2.CAP_PROP_FPS)
+        return True
+
+    def start_source(self, live_source=None):
+        """Açılmış kaynak için işlemeyi başlat ve ilk kareyi önizleme olarak göster."""
+        self.app.display_width = self.app.video_frame_width
+        self.app.display_height = self.app.video_frame_height
+        self.app.current_frame = 0
+
+        # 1) İşlemeye başla, ama oynatma başlatma
+        self.app.video_processor.stop_processing_frames()
+        self.app.video_processor.start_processing_on_selection(
+            video_path=self.app.video_path,
+            display_width=self.app.display_width,
+            display_height=self.app.display_height,
+            live_source=live_source,
+        )
+
+        # 2) Kuyruktan ilk işlenmiş frame'i al, önizleme olarak göster
+        self.show_first_frame()
+
+        # 3) Dosyalar için kare dizini + zaman çizelgesi önizlemeleri
+        if live_source is None:
+            self.start_timeline(self.app.video_path)
+
+        # 4) Play tuşunu aktif, pause tuşunu pasif yap
+        if hasattr(self.app, 'play_button') and hasattr(self.app, 'pause_button'):
+            self.app.play_button.setEnabled(True)
+            self.app.pause_button.setEnabled(False)
+
+    def show_first_frame(self):
+        try:
+            first = self.app.video_processor.processed_frames_queue.get(timeout=5)
+            frame = first["frame"]
+            objs  = first["tracked_objects"]
+            disp = self.app.video_processor.draw_boxes(frame.copy(), objs)
+            first["handle"].release()           # kopyalandı → yuvayı havuza ver
+            self.app.current_frame = first["frame_number"]
+            self.app.timeline.set_position(first["frame_number"])
+
+            rgb = cv2.cvtColor(disp, cv2.COLOR_BGR2RGB)
+            h, w, ch = rgb.shape
+            bytes_per_line = ch * w
+            q_img = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
+            pixmap = QPixmap.fromImage(q_img)
+            self.app.video_label.setPixmap(pixmap)
+        except Exception as e:
+            print("Önizleme yüklenirken hata:", e)
+
+    # --- Timeline / Seek ---
+    def start_timeline(self, video_path):
+        self.stop_timeline()
+        worker = TimelineWorker(video_path, parent=self.app)
+        worker.index_ready.connect(self.on_index_ready)
+        worker.thumbnail_ready.connect(self.app.timeline.add_thumbnail)
+        self.timeline_worker = worker
+        worker.start()
+
+    def stop_timeline(self):
+        worker, self.timeline_worker = self.timeline_worker, None
+        if worker is not None:
+            worker.stop()
+            worker.index_ready.disconnect()
+            worker.thumbnail_ready.disconnect()
+            worker.wait(2000)
+        self.app.timeline.clear()
+
+    def on_index_ready(self, index):
+        # GOP sınırları artık biliniyor → atlama ve paralel çözme bunları kullanır
+        self.app.video_processor.frame_index = index
+        self.app.timeline.set_index(index)
+        self.app.timeline.set_position(self.app.current_frame)
+
+    def seek_to(self, frame_number):
+        if self.app.cap is None or self.app.video_processor.live_source is not None:
+            return
+
+        was_playing = self.app.playing
+        if was_playing:
+            self.app.playing = False
+            self.app.video_processor.timer.stop()
+
+        if self.app.video_processor.seek(frame_number):
+            self.show_first_frame()
+
+        if was_playing:
+            self.app.playing = True
+            self.app.video_processor.play_video()
+
+    # --- Annotated export ---
+    def export_video(self):
+        """Açık dosyayı kutular, tehdit etiketleri ve bölgelerle MP4'e aktar."""
+        if self.app.shared_detector is None:
+            QMessageBox.information(self.app, "Please wait", "Detection models are still loading.")
+            return
+        if not self.app.video_path or self.app.video_processor.live_source is not None:
+            QMessageBox.warning(self.app, "Warning", "Open a video file to export.")
+            return
+        if self.export_worker is not None:
+            QMessageBox.information(self.app, "Export", "An export is already running.")
+            return
+
+        stem = os.path.splitext(os.path.basename(self.app.video_path))[0]
+        out_path, _ = QFileDialog.getSaveFileName(
+            self.app, "Export Annotated Video", f"{stem}_annotated.mp4", "MP4 Video (*.mp4)"
+        )
+        if not out_path:
+            return
+
+        # Elle işaretlenen friend / foe durumları dışa aktarımda da geçerli
+        statuses = {
+            tid: info["status"]
+            for tid, info in self.app.object_statuses.items()
+            if info.get("status") in ("friend", "foe")
+        }
+        detector = self.app.shared_detector.client("export")
+        worker = ExportWorker(
+            self.app.video_path, out_path, detector,
+            self.app.friendly_zones, self.app.enemy_zones, statuses, parent=self.app
+        )
+
+        dialog = QProgressDialog("Exporting annotated video…", "Cancel", 0, 100, self.app)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.canceled.connect(worker.stop)
+        worker.progress.connect(dialog.setValue)
+
+        def done():
+            dialog.close()
+            detector.close()
+            self.export_worker = None
+
+        worker.finished_export.connect(
+            lambda path: QMessageBox.information(self.app, "Export", f"Saved:\n{path}")
+        )
+        worker.failed.connect(
+            lambda message: QMessageBox.critical(self.app, "Export Error", message)
+        )
+        worker.finished.connect(done)
+        self.export_worker = worker
+        worker.start()
+
     def stop_video(self):
         try:
             if self.app.cap is not None:
@@ -226,6 +382,7 @@ class EventHandlers:
                 self.app.cap.release()
                 self.app.cap = None
                 self.app.video_label.clear()
+                self.stop_timeline()
                 print("Video stopped.")
 
                 self.app.video_processor.stop_processing_frames()
@@ -241,6 +398,7 @@ class EventHandlers:
         if self.app.playing:
             self.app.playing = False
             self.app.video_processor.timer.stop()
+            self.app.video_processor.clock.pause()
             print("Video paused.")
             if hasattr(self.app, 'play_button') and hasattr(self.app, 'pause_button'):
                 self.app.play_button.setEnabled(True)
@@ -282,6 +440,8 @@ class EventHandlers:
     def quit_app(self):
         try:
             self.stop_video()
+            if self.app.multi_stream_window is not None:
+                self.app.multi_stream_window.close()
             if hasattr(self.app, 'video_processor'):
                 self.app.video_processor.stop_processing_frames()
 
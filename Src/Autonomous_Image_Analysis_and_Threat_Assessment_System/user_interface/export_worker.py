@@ -0,0 +1,74 @@
+# user_interface/export_worker.py
+import traceback
+import cv2
+from PyQt5.QtCore import QThread, pyqtSignal
+from process_operations.batch_analysis import VideoAnalyzer
+from process_operations.overlay import draw_overlay
+from process_operations.video_export import VideoExporter
+
+
+class ExportWorker(QThread):
+    """
+    Açılmış dosyayı baştan sona açıklamalı MP4 olarak dışa aktarır.
+
+    İzler sonuç önbelleğinden gelir (varsa çıkarım yok, gerçek zamandan
+    hızlı); yoksa paylaşılan dedektörle yeniden hesaplanır. Operatörün elle
+    işaretlediği friend / foe durumları ve bölgeler korunur. Kodlama
+    VideoExporter'ın kendi iş parçacığında yapılır.
+    """
+    progress = pyqtSignal(int)          # yüzde
+    finished_export = pyqtSignal(str)   # çıktı yolu
+    failed = pyqtSignal(str)
+
+    def __init__(self, video_path, out_path, detector, friendly_zones, enemy_zones,
+                 statuses=None, parent=None):
+        super().__init__(parent)
+        self.video_path = video_path
+        self.out_path = out_path
+        self.detector = detector
+        self.friendly_zones = list(friendly_zones)
+        self.enemy_zones = list(enemy_zones)
+        self.statuses = statuses or {}
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self):
+        cap = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG)
+        total = max(1, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        cap.release()
+
+        exporter = None
+        try:
+            analyzer = VideoAnalyzer(self.detector)
+            exporter = VideoExporter(self.out_path, fps, (analyzer.width, analyzer.height))
+            last = -1
+            for fnum, _, objects, frame in analyzer.analyze(
+                self.video_path, self.friendly_zones, self.enemy_zones,
+                statuses=self.statuses, with_frames=True,
+            ):
+                if self.stopped:
+                    break
+                exporter.write(draw_overlay(frame, objects, None,
+                                            self.friendly_zones, self.enemy_zones))
+                percent = min(100, (fnum + 1) * 100 // total)
+                if percent != last:
+                    self.progress.emit(percent)
+                    last = percent
+            # Önce bırak: close() kodlayıcı hatasını yükseltirse aşağıda ikinci kez kapatılmaz
+            exporter, closing = None, exporter
+            closing.close()
+        except Exception as e:
+            traceback.print_exc()
+            if exporter is not None:
+                try:
+                    exporter.close()
+                except Exception:
+                    traceback.print_exc()        # asıl hata bildirilir
+            self.failed.emit(str(e))
+            return
+
+        if not self.stopped:
+            self.finished_export.emit(self.out_path)
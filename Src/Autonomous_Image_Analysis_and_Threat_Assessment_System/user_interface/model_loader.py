@@ -0,0 +1,37 @@
+# user_interface/model_loader.py
+import traceback
+from PyQt5.QtCore import QThread, pyqtSignal
+from object_detection.object_detector import ObjectDetector
+from project_utils.config import VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT
+
+
+class ModelLoaderThread(QThread):
+    """
+    YOLO modellerini ve ısınma çıkarımını Qt ana iş parçacığının dışında
+    yürütür; ilerleme ve sonuç sinyallerle ana iş parçacığına iletilir.
+    """
+    progress = pyqtSignal(int, str)     # yüzde, mesaj
+    loaded = pyqtSignal(object)         # ObjectDetector
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.detector = None
+
+    def run(self):
+        try:
+            detector = ObjectDetector(
+                input_size=(VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT),
+                progress=self.progress.emit,
+                exit_on_error=False,
+            )
+            self.progress.emit(90, "Warming up…")
+            detector.warmup(VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT)
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+            return
+
+        self.detector = detector
+        self.progress.emit(100, "Ready")
+        self.loaded.emit(detector)
@@ -0,0 +1,281 @@
+# user_interface/multi_stream.py
+import os
+import cv2
+from PyQt5.QtWidgets import (
+    QWidget, QFrame, QLabel, QPushButton, QGridLayout, QHBoxLayout, QVBoxLayout,
+    QInputDialog, QFileDialog, QMessageBox, QMenu
+)
+from PyQt5.QtGui import QFont, QPainter, QPen
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from process_operations.video_processor import VideoProcessor
+from process_operations.live_source import LiveSource, is_live_source
+from threat_assessment.manager import ThreatAssessment
+from project_utils.config import (
+    VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT, MULTI_STREAM_POOL_MB, MULTI_STREAM_COLUMNS
+)
+
+
+class StreamStatusLabel(QLabel):
+    """Karo altındaki durum satırı – VideoProcessor'ın beklediği timeline arayüzü."""
+    def __init__(self, font=None):
+        super().__init__("")
+        self.setStyleSheet("color: #A0A0A0;")
+        self.setFont(font or QFont("Helvetica", 9))
+        self.frame_number = 0
+        self.stats = ""
+
+    def clear(self):
+        self.frame_number = 0
+        self.stats = ""
+        self.setText("")
+
+    def set_position(self, frame_number):
+        self.frame_number = frame_number
+        self._refresh()
+
+    def set_stats(self, drift, dropped):
+        self.stats = f"drift {drift * 1000:.0f} ms · dropped {dropped}"
+        self._refresh()
+
+    def _refresh(self):
+        self.setText(f"frame {self.frame_number}   {self.stats}")
+
+
+class ZoneLabel(QLabel):
+    """Ölçekli video etiketi; bölge seçiminde sürüklenen dikdörtgeni kare koordinatına çevirir."""
+    region_selected = pyqtSignal(object)
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+        self.start_point = None
+        self.current_rect = None
+
+    def mousePressEvent(self, event):
+        if self.session.selecting_friendly_zone or self.session.selecting_enemy_zone:
+            self.start_point = event.pos()
+
+    def mouseMoveEvent(self, event):
+        if self.start_point is not None:
+            self.current_rect = (self.start_point, event.pos())
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if self.start_point is None:
+            return
+        p1, p2 = self.start_point, event.pos()
+        self.start_point = self.current_rect = None
+        self.update()
+
+        sx = VIDEO_FRAME_WIDTH / max(1, self.width())
+        sy = VIDEO_FRAME_HEIGHT / max(1, self.height())
+        self.region_selected.emit((
+            int(min(p1.x(), p2.x()) * sx), int(min(p1.y(), p2.y()) * sy),
+            int(max(p1.x(), p2.x()) * sx), int(max(p1.y(), p2.y()) * sy),
+        ))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.current_rect:
+            painter = QPainter(self)
+            painter.setPen(QPen(Qt.red, 2, Qt.DashLine))
+            p1, p2 = self.current_rect
+            painter.drawRect(min(p1.x(), p2.x()), min(p1.y(), p2.y()),
+                             abs(p2.x() - p1.x()), abs(p2.y() - p1.y()))
+
+
+class StreamSession:
+    """
+    Çoklu akış penceresindeki tek kaynak.
+
+    VideoProcessor ve ThreatAssessment'ın Application'dan beklediği
+    öznitelikleri (cap, fps, playing, object_statuses, bölgeler, video_label,
+    timeline …) akış başına taşır; böylece her akışın kendi izleyicisi,
+    tehdit durumu ve bölgeleri olur. Dedektör paylaşılan zamanlayıcının
+    istemcisidir → kareler diğer akışlarla ortak batch'lerde işlenir.
+    """
+    def __init__(self, path, object_detector, video_label, timeline):
+        self.path = path
+        self.object_detector = object_detector
+        self.video_label = video_label
+        self.timeline = timeline
+
+        self.playing = False
+        self.cap = None
+        self.fps = 0
+        self.current_frame = 0
+        self.object_statuses = {}
+        self.friendly_zones = []
+        self.enemy_zones = []
+        self.selecting_friendly_zone = False
+        self.selecting_enemy_zone = False
+
+        self.threat_assessment = ThreatAssessment()
+        self.video_processor = VideoProcessor(
+            self, VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT, pool_memory_mb=MULTI_STREAM_POOL_MB
+        )
+
+    def start(self):
+        live_source = None
+        if is_live_source(self.path):
+            live_source = LiveSource(self.path)
+            if not live_source.open():
+                return False
+            self.cap = live_source
+            self.fps = live_source.fps or 25
+        else:
+            self.cap = cv2.VideoCapture(self.path)
+            if not self.cap.isOpened():
+                self.cap = None
+                return False
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+
+        self.video_processor.start_processing_on_selection(
+            self.path, VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT, live_source=live_source
+        )
+        self.playing = True
+        self.video_processor.play_video()
+        return True
+
+    def stop(self):
+        self.playing = False
+        self.video_processor.timer.stop()
+        self.video_processor.stop_processing_frames()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.object_detector.close()
+
+    def on_region_selected(self, rect):
+        if self.selecting_friendly_zone:
+            self.friendly_zones.append(rect)
+        elif self.selecting_enemy_zone:
+            self.enemy_zones.append(rect)
+        self.selecting_friendly_zone = self.selecting_enemy_zone = False
+        self.video_processor.refresh_video_display()
+
+    def clear_zones(self):
+        self.friendly_zones.clear()
+        self.enemy_zones.clear()
+        self.video_processor.refresh_video_display()
+
+
+class StreamTile(QFrame):
+    """Izgaradaki tek akış: başlık, ölçekli video, durum satırı."""
+    close_requested = pyqtSignal(object)
+
+    def __init__(self, path, object_detector, font=None):
+        super().__init__()
+        self.setStyleSheet("background-color: #2A2F33; border-radius: 6px;")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        layout.setSpacing(4)
+
+        header = QHBoxLayout()
+        title = QLabel(os.path.basename(path.rstrip("/")) or path)
+        title.setStyleSheet("color: white;")
+        title.setFont(font or QFont("Helvetica", 10))
+        header.addWidget(title)
+        header.addStretch()
+
+        zones_button = QPushButton("Zones")
+        zones_button.setStyleSheet("color: white;")
+        header.addWidget(zones_button)
+        close_button = QPushButton("✕")
+        close_button.setFixedWidth(28)
+        close_button.setStyleSheet("color: white;")
+        close_button.clicked.connect(lambda: self.close_requested.emit(self))
+        header.addWidget(close_button)
+        layout.addLayout(header)
+
+        status = StreamStatusLabel(font)
+        self.session = StreamSession(path, object_detector, None, status)
+
+        self.video_label = ZoneLabel(self.session)
+        self.video_label.setStyleSheet("background-color: black;")
+        self.video_label.setScaledContents(True)
+        self.video_label.setMinimumSize(VIDEO_FRAME_WIDTH // 4, VIDEO_FRAME_HEIGHT // 4)
+        self.video_label.region_selected.connect(self.session.on_region_selected)
+        self.session.video_label = self.video_label
+        layout.addWidget(self.video_label, stretch=1)
+        layout.addWidget(status)
+
+        menu = QMenu(self)
+        menu.addAction("Friendly Zone", lambda: setattr(self.session, "selecting_friendly_zone", True))
+        menu.addAction("Enemy Zone", lambda: setattr(self.session, "selecting_enemy_zone", True))
+        menu.addAction("Clear Zones", self.session.clear_zones)
+        zones_button.setMenu(menu)
+
+
+class MultiStreamWindow(QWidget):
+    """
+    Birden çok İHA akışını aynı anda izleme penceresi. Tüm akışlar ana
+    pencerenin SharedDetector'ını kullanır; modeller bir kez yüklenir.
+    """
+    def __init__(self, shared_detector, font=None, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.shared_detector = shared_detector
+        self.tile_font = font
+        self.tiles = []
+
+        self.setWindowTitle("Multi-Stream Session")
+        self.setStyleSheet("background-color: #1F2224;")
+        self.resize(VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT)
+
+        layout = QVBoxLayout(self)
+        toolbar = QHBoxLayout()
+        for text, slot in (("Add File…", self.add_file), ("Add Stream…", self.add_stream)):
+            button = QPushButton(text)
+            button.setStyleSheet("color: white; background-color: #2A2F33; padding: 6px;")
+            button.clicked.connect(slot)
+            toolbar.addWidget(button)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+
+        self.grid = QGridLayout()
+        self.grid.setSpacing(8)
+        layout.addLayout(self.grid, stretch=1)
+
+    # ------------------------------------------------------------------ #
+    def add_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select Video", "", "Video Files (*.mp4 *.avi *.mov)"
+        )
+        if path:
+            self.add_source(path)
+
+    def add_stream(self):
+        path, ok = QInputDialog.getText(self, "Add Stream", "Stream URL, device or named pipe:")
+        if ok and path.strip():
+            self.add_source(path.strip())
+
+    def add_source(self, path):
+        tile = StreamTile(path, self.shared_detector.client(path), self.tile_font)
+        if not tile.session.start():
+            tile.session.stop()
+            tile.deleteLater()
+            QMessageBox.critical(self, "Error", f"Could not open source:\n{path}")
+            return
+
+        tile.close_requested.connect(self.remove_tile)
+        self.tiles.append(tile)
+        self._relayout()
+
+    def remove_tile(self, tile):
+        tile.session.stop()
+        self.tiles.remove(tile)
+        self.grid.removeWidget(tile)
+        tile.deleteLater()
+        self._relayout()
+
+    def _relayout(self):
+        for i, tile in enumerate(self.tiles):
+            self.grid.addWidget(tile, i // MULTI_STREAM_COLUMNS, i % MULTI_STREAM_COLUMNS)
+
+    def closeEvent(self, event):
+        for tile in self.tiles:
+            tile.session.stop()
+        self.tiles.clear()
+        super().closeEvent(event)
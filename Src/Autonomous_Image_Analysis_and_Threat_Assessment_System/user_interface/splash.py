@@ -1,12 +1,14 @@
 # user_interface/splash.py
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QPushButton, QLabel,
-    QApplication, QSpacerItem, QSizePolicy, QHBoxLayout, QFrame
+    QApplication, QSpacerItem, QSizePolicy, QHBoxLayout, QFrame,
+    QProgressBar, QMessageBox
 )
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QPixmap
 from project_utils.config import SCALE
 from user_interface.ui import Application
+from user_interface.model_loader import ModelLoaderThread
 
 
 class SplashScreen(QMainWindow):
@@ -93,6 +95,31 @@ class SplashScreen(QMainWindow):
         self.start_button.clicked.connect(self.start_app)
         self.layout.addWidget(self.start_button, alignment=Qt.AlignHCenter)
 
+        # ───────── Model yükleme ilerlemesi ─────────
+        self.layout.addSpacing(int(20 * s))
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedSize(int(400 * s), int(8 * s) + 2)
+        self.progress_bar.setStyleSheet(f"""
+            QProgressBar {{
+                background-color: #2A2F33;
+                border: none;
+                border-radius: {int(4 * s) + 1}px;
+            }}
+            QProgressBar::chunk {{
+                background-color: #BBD8E5;
+                border-radius: {int(4 * s) + 1}px;
+            }}
+        """)
+        self.layout.addWidget(self.progress_bar, alignment=Qt.AlignHCenter)
+
+        self.progress_label = QLabel("Loading models…")
+        self.progress_label.setStyleSheet("color: #AAAAAA;")
+        self.progress_label.setFont(QFont("Arial", max(int(10 * s), 8)))
+        self.layout.addWidget(self.progress_label, alignment=Qt.AlignHCenter)
+
         # Spacer (alt)
         self.layout.addSpacerItem(
             QSpacerItem(0, 0, QSizePolicy.Minimum, QSizePolicy.Expanding)
@@ -120,6 +147,11 @@ class SplashScreen(QMainWindow):
         self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.launch_main_app)
 
+        # ───────── Arka plan model yükleyici ─────────
+        self.model_loader = ModelLoaderThread()
+        self.model_loader.progress.connect(self.on_model_progress)
+        self.model_loader.failed.connect(self.on_model_failed)
+
     # ------------------------------------------------------------------ #
     #                    Event & yardımcı metotlar                       #
     # ------------------------------------------------------------------ #
@@ -127,6 +159,22 @@ class SplashScreen(QMainWindow):
         super().showEvent(event)
         self.center_window()
 
+        # Splash görünür görünmez modelleri yüklemeye başla
+        if not self.model_loader.isRunning() and self.model_loader.detector is None:
+            self.model_loader.start()
+
+    def on_model_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.progress_label.setText(message)
+
+    def on_model_failed(self, message):
+        QMessageBox.critical(
+            None,
+            "Model Loading Error",
+            f"Failed to load the YOLOv8 model.\nError: {message}",
+        )
+        QApplication.exit(1)
+
     def center_window(self):
         screen = QApplication.primaryScreen().availableGeometry()
         x = (screen.width()  - self.window_width)  // 2
@@ -136,9 +184,19 @@ class SplashScreen(QMainWindow):
     def start_app(self):
         self.start_button.setText("Loading...")
         self.start_button.setEnabled(False)
-        self.timer.start(800)
+        self.timer.start(0)
 
     def launch_main_app(self):
-        self.main_window = Application()
+        # Ana pencere hemen açılır; dedektör hazır değilse sonradan bağlanır
+        loader = self.model_loader
+        self.main_window = Application(object_detector=loader.detector)
+
+        if self.main_window.object_detector is None:
+            loader.progress.connect(self.main_window.on_model_progress)
+            loader.loaded.connect(self.main_window.attach_detector)
+            # Bağlantı kurulurken yükleme bitmiş olabilir
+            if loader.detector is not None:
+                self.main_window.attach_detector(loader.detector)
+
         self.main_window.show()
         self.close()
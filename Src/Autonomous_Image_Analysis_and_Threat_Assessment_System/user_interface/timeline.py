@@ -0,0 +1,212 @@
+# user_interface/timeline.py
+import bisect
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QWidget, QSlider, QLabel, QHBoxLayout, QStyle, QStyleOptionSlider
+from PyQt5.QtGui import QImage, QPixmap, QFont
+from PyQt5.QtCore import Qt, QThread, QPoint, pyqtSignal
+from process_operations.frame_index import FrameIndex
+from project_utils.config import TIMELINE_THUMBNAILS, TIMELINE_THUMB_WIDTH
+
+
+class TimelineWorker(QThread):
+    """
+    Açılan dosya için kare dizinini kurar, ardından zaman çizelgesi boyunca
+    küçük önizlemeler üretir. Önizlemeler yalnızca anahtar karelerden
+    çözülür (GOP'un geri kalanı çözülmez) ve hemen küçültülür.
+    """
+    index_ready = pyqtSignal(object)            # FrameIndex
+    thumbnail_ready = pyqtSignal(int, QImage)   # kare numarası, önizleme
+
+    def __init__(self, video_path, count=TIMELINE_THUMBNAILS, width=TIMELINE_THUMB_WIDTH,
+                 parent=None):
+        super().__init__(parent)
+        self.video_path = video_path
+        self.count = count
+        self.width = width
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self):
+        index = FrameIndex.build(self.video_path, should_stop=lambda: self.stopped)
+        if index is None or self.stopped:
+            return
+        self.index_ready.emit(index)
+        if index.total_frames == 0:
+            return
+
+        targets = np.linspace(0, index.total_frames - 1, self.count).astype(int)
+        starts = sorted({index.gop_start(int(t)) for t in targets})
+
+        cap = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG)
+        try:
+            for frame_number in starts:
+                if self.stopped:
+                    break
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                ret, frame = cap.read()
+                if not ret:
+                    continue
+
+                h = max(1, frame.shape[0] * self.width // frame.shape[1])
+                small = cv2.resize(frame, (self.width, h), interpolation=cv2.INTER_AREA)
+                rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+                image = QImage(rgb.data, self.width, h, 3 * self.width, QImage.Format_RGB888)
+                self.thumbnail_ready.emit(frame_number, image.copy())
+        finally:
+            cap.release()
+
+
+class JumpSlider(QSlider):
+    """Oluğa tıklayınca sayfa sayfa değil, doğrudan tıklanan kareye gider."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jumping = False
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            opt = QStyleOptionSlider()
+            self.initStyleOption(opt)
+            handle = self.style().subControlRect(QStyle.CC_Slider, opt, QStyle.SC_SliderHandle, self)
+            if not handle.contains(event.pos()):
+                value = QStyle.sliderValueFromPosition(
+                    self.minimum(), self.maximum(), event.pos().x(), self.width()
+                )
+                self.jumping = True
+                self.setSliderDown(True)          # oynatma konumu ezmesin
+                self.setValue(value)
+                self.sliderMoved.emit(value)
+                event.accept()
+                return
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self.jumping:
+            self.jumping = False
+            self.setSliderDown(False)             # → sliderReleased
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+
+class TimelineWidget(QWidget):
+    """
+    Video altındaki zaman çizelgesi: sürüklerken en yakın önizleme tutamağın
+    üstünde gösterilir, bırakınca `seek_requested(kare)` yayınlanır.
+    """
+    seek_requested = pyqtSignal(int)
+
+    def __init__(self, parent=None, font=None):
+        super().__init__(parent)
+        self.index = None
+        self.thumb_frames = []      # sıralı kare numaraları
+        self.thumb_pixmaps = []
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        self.slider = JumpSlider(Qt.Horizontal)
+        self.slider.setEnabled(False)
+        self.slider.setStyleSheet("""
+            QSlider::groove:horizontal { height: 6px; background: #2B2E30; border-radius: 3px; }
+            QSlider::sub-page:horizontal { background: #FFA500; border-radius: 3px; }
+            QSlider::handle:horizontal { width: 14px; margin: -5px 0; background: white; border-radius: 7px; }
+        """)
+        self.slider.sliderMoved.connect(self.on_slider_moved)
+        self.slider.sliderReleased.connect(self.on_slider_released)
+        layout.addWidget(self.slider)
+
+        # Gerçek zamanlı oynatma: gecikme (drift) ve atılan kare sayısı
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet("color: #A0A0A0;")
+        self.stats_label.setFont(font or QFont("Helvetica", 10))
+        layout.addWidget(self.stats_label)
+
+        self.time_label = QLabel("--:-- / --:--")
+        self.time_label.setStyleSheet("color: white;")
+        self.time_label.setFont(font or QFont("Helvetica", 10))
+        layout.addWidget(self.time_label)
+
+        # Sürükleme sırasında yüzen önizleme
+        self.preview = QLabel(None, Qt.ToolTip)
+        self.preview.setStyleSheet("border: 1px solid #FFA500; background: black;")
+        self.preview.hide()
+
+    # ------------------------------------------------------------------ #
+    def clear(self):
+        self.index = None
+        self.thumb_frames, self.thumb_pixmaps = [], []
+        self.slider.setEnabled(False)
+        self.slider.setValue(0)
+        self.time_label.setText("--:-- / --:--")
+        self.stats_label.setText("")
+        self.preview.hide()
+
+    def set_index(self, index):
+        self.index = index
+        self.slider.setRange(0, max(0, index.total_frames - 1))
+        self.slider.setEnabled(index.total_frames > 0)
+        self.update_label(self.slider.value())
+
+    def add_thumbnail(self, frame_number, image):
+        pos = bisect.bisect_left(self.thumb_frames, frame_number)
+        self.thumb_frames.insert(pos, frame_number)
+        self.thumb_pixmaps.insert(pos, QPixmap.fromImage(image))
+
+    def set_position(self, frame_number):
+        """Oynatma ilerledikçe çağrılır; kullanıcı sürüklerken dokunulmaz."""
+        if self.index is None or self.slider.isSliderDown():
+            return
+        self.slider.blockSignals(True)
+        self.slider.setValue(frame_number)
+        self.slider.blockSignals(False)
+        self.update_label(frame_number)
+
+    def set_stats(self, drift, dropped):
+        """drift: son karenin planlanan zamana göre gecikmesi (s)."""
+        self.stats_label.setText(f"drift {drift * 1000:.0f} ms · dropped {dropped}")
+
+    # ------------------------------------------------------------------ #
+    def on_slider_moved(self, value):
+        self.update_label(value)
+        self.show_preview(value)
+
+    def on_slider_released(self):
+        self.preview.hide()
+        self.seek_requested.emit(self.slider.value())
+
+    def update_label(self, frame_number):
+        if self.index is None or self.index.total_frames == 0:
+            return
+        current = self.index.pts[min(frame_number, self.index.total_frames - 1)]
+        total = self.index.pts[-1]
+        self.time_label.setText(f"{_fmt(current)} / {_fmt(total)}")
+
+    def show_preview(self, frame_number):
+        pos = bisect.bisect_right(self.thumb_frames, frame_number) - 1
+        if pos < 0:
+            self.preview.hide()
+            return
+
+        pixmap = self.thumb_pixmaps[pos]
+        self.preview.setPixmap(pixmap)
+        self.preview.resize(pixmap.size())
+
+        opt = QStyleOptionSlider()
+        self.slider.initStyleOption(opt)
+        handle = self.slider.style().subControlRect(
+            QStyle.CC_Slider, opt, QStyle.SC_SliderHandle, self.slider
+        )
+        anchor = self.slider.mapToGlobal(QPoint(handle.center().x(), 0))
+        self.preview.move(anchor.x() - pixmap.width() // 2, anchor.y() - pixmap.height() - 8)
+        self.preview.show()
+
+
+def _fmt(seconds):
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
@@ -1,16 +1,19 @@
 # user_interface/ui.py
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QPushButton, QFrame, QVBoxLayout, QHBoxLayout,
-    QApplication, QTableWidget, QTableWidgetItem, QHeaderView
+    QApplication, QTableWidget, QTableWidgetItem, QHeaderView, QShortcut
 )
-from PyQt5.QtGui import QFont, QMouseEvent, QPainter, QPen, QBrush, QColor, QIcon
+from PyQt5.QtGui import QFont, QMouseEvent, QPainter, QPen, QBrush, QColor, QIcon, QKeySequence
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QSize
 
-from project_utils.config import SCALE
+from project_utils.config import SCALE, VIDEO_FRAME_WIDTH, VIDEO_FRAME_HEIGHT
 from threat_assessment.manager import ThreatAssessment
+from object_tracking.track_table import STATUS_NAMES
 from user_interface.event_handlers import EventHandlers
 from process_operations.video_processor import VideoProcessor
-from object_detection.object_detector import ObjectDetector
+from user_interface.timeline import TimelineWidget
+from user_interface.multi_stream import MultiStreamWindow
+from object_detection.shared_detector import SharedDetector
 
 import math
 
@@ -72,7 +75,7 @@ class ClickableLabel(QLabel):
 
 
 class Application(QWidget):
-    def __init__(self):
+    def __init__(self, object_detector=None):
         super().__init__()
 
         # ───────── Ölçek faktörü ─────────
@@ -80,11 +83,17 @@ class Application(QWidget):
         s = self.SCALE
 
         # Video çerçeve boyutları
-        self.video_frame_width  = (int(1600 * s) // 32) * 32
-        self.video_frame_height = (int(896  * s) // 32) * 32
+        self.video_frame_width  = VIDEO_FRAME_WIDTH
+        self.video_frame_height = VIDEO_FRAME_HEIGHT
 
         # Object detection and processing
-        self.object_detector = ObjectDetector()
+        # Dedektör arka planda yükleniyorsa None; hazır olunca attach_detector()
+        # Tüm akışlar (ana pencere + çoklu akış penceresi) tek SharedDetector'dan geçer
+        self.object_detector = None
+        self.shared_detector = None
+        self.multi_stream_window = None
+        if object_detector is not None:
+            self.attach_detector(object_detector)
         self.video_processor = VideoProcessor(
             self,
             display_width=self.video_frame_width,
@@ -242,10 +251,11 @@ class Application(QWidget):
         video_frame_layout.addWidget(self.video_label)
         right_panel_inner_layout.addWidget(self.video_frame, alignment=Qt.AlignCenter)
 
-        # Spacer
-        spacer = QFrame()
-        spacer.setFixedHeight(int(40 * s))
-        right_panel_inner_layout.addWidget(spacer)
+        # Zaman çizelgesi (dizin + önizlemeler arka planda kurulur)
+        self.timeline = TimelineWidget(self, font=self.default_font)
+        self.timeline.setFixedHeight(int(40 * s))
+        self.timeline.seek_requested.connect(self.event_handlers.seek_to)
+        right_panel_inner_layout.addWidget(self.timeline)
 
         # Butonlar (Action + Control)
         action_icons = [
@@ -288,6 +298,18 @@ class Application(QWidget):
 
         main_layout.addLayout(content_layout)
 
+        # Canlı kaynak (RTSP/UDP, /dev/videoN, FIFO) – Ctrl+L
+        self.open_stream_shortcut = QShortcut(QKeySequence("Ctrl+L"), self)
+        self.open_stream_shortcut.activated.connect(self.event_handlers.open_stream)
+
+        # Çoklu akış penceresi (aynı dedektörü paylaşır) – Ctrl+M
+        self.multi_stream_shortcut = QShortcut(QKeySequence("Ctrl+M"), self)
+        self.multi_stream_shortcut.activated.connect(self.open_multi_stream)
+
+        # Açıklamalı MP4 dışa aktarımı – Ctrl+E
+        self.export_shortcut = QShortcut(QKeySequence("Ctrl+E"), self)
+        self.export_shortcut.activated.connect(self.event_handlers.export_video)
+
         # Periyodik tablo güncellemesi
         self.update_objects_timer = QTimer()
         self.update_objects_timer.timeout.connect(self.update_object_table)
@@ -297,6 +319,30 @@ class Application(QWidget):
         super().showEvent(event)
         self.center_window()
 
+    # ------------------------------------------------------------------ #
+    # Arka planda yüklenen dedektör
+    # ------------------------------------------------------------------ #
+    def on_model_progress(self, percent, message):
+        self.setWindowTitle(f"System User Interface – {message} ({percent}%)")
+
+    def attach_detector(self, object_detector):
+        if self.shared_detector is not None:
+            return
+        self.shared_detector = SharedDetector(object_detector)
+        self.object_detector = self.shared_detector.client("main")
+        self.setWindowTitle("System User Interface")
+        print("Object detector attached.")
+
+    def open_multi_stream(self):
+        if self.shared_detector is None:
+            return
+        if self.multi_stream_window is None:
+            self.multi_stream_window = MultiStreamWindow(
+                self.shared_detector, font=self.default_font, parent=self
+            )
+        self.multi_stream_window.show()
+        self.multi_stream_window.raise_()
+
     def center_window(self):
         screen = QApplication.primaryScreen()
         screen_geometry = screen.availableGeometry()
@@ -335,19 +381,15 @@ class Application(QWidget):
 
             self.selected_object_ids = []
 
-            for obj in tracked_objects:
-                x1, y1, x2, y2 = map(int, obj['bbox'])
-                track_id = obj['track_id']
-
-                if x1 <= x_click <= x2 and y1 <= y_click <= y2:
-                    track_id = str(obj['track_id'])
-                    if track_id not in self.object_statuses:
-                        self.object_statuses[track_id] = {'status': None, 'selected': False, 'threat_level': 1.0}
-                    self.object_statuses[track_id]['selected'] = True
-                    self.selected_object_ids.append(track_id)
-                    print(f"Object {track_id} selected.")
-                    object_selected = True
-                    break
+            row = tracked_objects.hit(x_click, y_click)      # tıklanan noktayı içeren ilk kutu
+            if row is not None:
+                track_id = int(tracked_objects.track_id[row])
+                if track_id not in self.object_statuses:
+                    self.object_statuses[track_id] = {'status': None, 'selected': False, 'threat_level': 1.0}
+                self.object_statuses[track_id]['selected'] = True
+                self.selected_object_ids.append(track_id)
+                print(f"Object {track_id} selected.")
+                object_selected = True
 
             if object_selected:
                 if hasattr(self, 'mark_friend_button') and hasattr(self, 'mark_foe_button') and hasattr(self, 'reset_status_button'):
@@ -397,17 +439,15 @@ class Application(QWidget):
             tracked_objects = self.video_processor.current_tracked_objects
             objects_selected = False
 
-            for obj in tracked_objects:
-                track_id = str(obj['track_id'])
-                obj_x1, obj_y1, obj_x2, obj_y2 = obj['bbox']
-                # Dikdörtgen kesişim kontrolü
-                if not (x2 < obj_x1 or x1 > obj_x2 or y2 < obj_y1 or y1 > obj_y2):
-                    if track_id not in self.object_statuses:
-                        self.object_statuses[track_id] = {'status': None, 'selected': False, 'threat_level': 1.0}
-                    self.object_statuses[track_id]['selected'] = True
-                    self.selected_object_ids.append(track_id)
-                    print(f"Object {track_id} selected in region.")
-                    objects_selected = True
+            # Dikdörtgen kesişim kontrolü (tüm kutular tek seferde)
+            for row in tracked_objects.overlapping(x1, y1, x2, y2).tolist():
+                track_id = int(tracked_objects.track_id[row])
+                if track_id not in self.object_statuses:
+                    self.object_statuses[track_id] = {'status': None, 'selected': False, 'threat_level': 1.0}
+                self.object_statuses[track_id]['selected'] = True
+                self.selected_object_ids.append(track_id)
+                print(f"Object {track_id} selected in region.")
+                objects_selected = True
 
             if objects_selected:
                 if hasattr(self, 'mark_friend_button') and hasattr(self, 'mark_foe_button') and hasattr(self, 'reset_status_button'):
@@ -435,9 +475,10 @@ class Application(QWidget):
         tracked_objects = self.video_processor.current_tracked_objects
         self.object_table.setRowCount(len(tracked_objects))
 
-        for row, obj in enumerate(tracked_objects):
-            track_id = str(obj['track_id'])
-            cls      = obj['cls'].strip()          # ‼️ boşluk/küçük farkları at
+        rows = zip(tracked_objects.track_id.tolist(), tracked_objects.cls)
+        for row, (tid, cls) in enumerate(rows):
+            track_id = tid
+            cls      = cls.strip()                 # ‼️ boşluk/küçük farkları at
             base_thr = self.threat_assessment.threat_coefficients.get(cls, 1)
 
             # object_statuses’e ekle / güncelle (ilk girişse)
@@ -453,7 +494,7 @@ class Application(QWidget):
             is_selected = self.object_statuses[track_id]['selected']
 
             # ─────────── tablo hücreleri ───────────
-            self.object_table.setItem(row, 0, QTableWidgetItem(track_id))
+            self.object_table.setItem(row, 0, QTableWidgetItem(str(track_id)))
             self.object_table.setItem(row, 1, QTableWidgetItem(cls))
             self.object_table.setItem(row, 2, QTableWidgetItem(status.capitalize()))
             self.object_table.setItem(row, 3, QTableWidgetItem(str(int(threat_lvl))))
@@ -486,7 +527,6 @@ class Application(QWidget):
             self.select_object_by_id(track_id)
 
     def select_object_by_id(self, track_id):
-        track_id = str(track_id)
         for tid in self.object_statuses.keys():
             self.object_statuses[tid]['selected'] = False
 
@@ -534,6 +574,7 @@ class Application(QWidget):
         self.cap = None
         self.video_path = ""
         self.video_label.clear()
+        self.timeline.clear()
         self.object_table.setRowCount(0)
 
     def assign_status_based_on_zones(self):
@@ -542,14 +583,15 @@ class Application(QWidget):
             • Bölgelere göre friend / foe / unknown statüsü atar.
             • Ardından tehdit değerlerini HEMEN yeniden hesaplar.
             """
-            for obj in self.video_processor.current_tracked_objects:
-                tid = str(obj['track_id'])
+            tracks = self.video_processor.current_tracked_objects
+            zone_codes = tracks.zone_status(self.friendly_zones, self.enemy_zones)
 
+            for tid, cls, code in zip(tracks.track_id.tolist(), tracks.cls, zone_codes.tolist()):
                 # Varsayılan tablo girişi oluştur
                 if tid not in self.object_statuses:
                     # Sınıfa göre taban katsayıyı al (bulunamazsa Unknown)
                     base_threat = self.threat_assessment.threat_coefficients.get(
-                        obj['cls'].strip(), 1
+                        cls.strip(), 1
                     )
                     self.object_statuses[tid] = {
                         'status'      : "unknown",
@@ -561,21 +603,8 @@ class Application(QWidget):
                 if self.object_statuses[tid]['status'] in ("friend", "foe"):
                     continue
 
-                # Bölge testleri
-                x1, y1, x2, y2 = obj['bbox']
-                cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-
-                in_friend = any(fx1 <= cx <= fx2 and fy1 <= cy <= fy2
-                                for fx1, fy1, fx2, fy2 in self.friendly_zones)
-                in_enemy  = any(ex1 <= cx <= ex2 and ey1 <= cy <= ey2
-                                for ex1, ey1, ex2, ey2 in self.enemy_zones)
-
-                if in_friend:
-                    self.object_statuses[tid]['status'] = "friend"
-                elif in_enemy:
-                    self.object_statuses[tid]['status'] = "foe"
-                else:
-                    self.object_statuses[tid]['status'] = "unknown"
+                # Bölge testleri (tüm kutular tek seferde, dost bölgesi öncelikli)
+                self.object_statuses[tid]['status'] = STATUS_NAMES[code]
 
             # ► Statüler güncellendi → hemen tehditleri yeniden hesapla
             self.threat_assessment.perform_threat_assessment(self)